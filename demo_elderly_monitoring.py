@@ -8,13 +8,16 @@
 import cv2
 import mediapipe as mp
 import numpy as np
-import time
 import math
 from collections import deque
 
+from monitoring_metrics import StageTimer
+from monitoring_clock import WallClock
+
 class SimpleElderlyMonitor:
-    def __init__(self):
-        """간단 모니터링 시스템 초기화"""
+    def __init__(self, clock=None):
+        """간단 모니터링 시스템 초기화 (clock: 시각 공급자, None이면 실제 시각)"""
+        self.clock = clock if clock is not None else WallClock()
         self.mp_pose = mp.solutions.pose
         self.mp_draw = mp.solutions.drawing_utils
         
@@ -25,7 +28,11 @@ class SimpleElderlyMonitor:
         # 상태 변수
         self.current_activity = "대기 중"
         self.fall_risk_level = 0
-        self.last_movement_time = time.time()
+        self.last_movement_time = self.clock.now()
+        
+        # 단계별 지연 시간 측정 ('t' 키로 오버레이 전환)
+        self.stage_timer = StageTimer()
+        self.show_stage_latency = False
         
         print("🏥 간단 노인 모니터링 데모가 시작됩니다.")
         print("📺 카메라 화면에서 자세와 활동을 분석합니다.")
@@ -76,7 +83,7 @@ class SimpleElderlyMonitor:
                 movement = np.sqrt(dx*dx + dy*dy)
                 
                 if movement > 0.01:
-                    self.last_movement_time = time.time()
+                    self.last_movement_time = self.clock.now()
             
             self.movement_history.append((center_x, center_y))
             
@@ -167,7 +174,7 @@ class SimpleElderlyMonitor:
                    cv2.FONT_HERSHEY_SIMPLEX, 0.6, activity_color, 2)
         
         # 비활성 시간
-        inactive_time = int(time.time() - self.last_movement_time)
+        inactive_time = int(self.clock.now() - self.last_movement_time)
         inactive_color = (0, 0, 255) if inactive_time > 60 else (255, 255, 255)
         cv2.putText(image, f"비활성: {inactive_time}초", (20, 95), 
                    cv2.FONT_HERSHEY_SIMPLEX, 0.6, inactive_color, 2)
@@ -208,26 +215,31 @@ class SimpleElderlyMonitor:
                 return
             
             print("🎥 카메라 시작!")
-            print("📝 조작법: 'q' 또는 ESC로 종료")
+            print("📝 조작법: 'q' 또는 ESC로 종료, 't'로 단계별 지연 시간 표시")
             
+            timer = self.stage_timer
             while cap.isOpened():
+                t = timer.begin()
                 ret, frame = cap.read()
                 if not ret:
                     break
+                t = timer.lap('capture', t)
                 
                 # 좌우 반전으로 자연스러운 움직임
                 frame = cv2.flip(frame, 1)
                 
-                # 자세 검출
+                # 자세 검출 (frame은 반전된 BGR 원본 그대로 사용)
                 rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
                 rgb_frame.flags.writeable = False
+                t = timer.lap('convert', t)
                 results = pose.process(rgb_frame)
-                
-                # 이미지 복원
-                rgb_frame.flags.writeable = True
-                frame = cv2.cvtColor(rgb_frame, cv2.COLOR_RGB2BGR)
+                t = timer.lap('pose', t)
                 
                 if results.pose_landmarks:
+                    # 움직임 분석
+                    self.analyze_movement(results.pose_landmarks.landmark)
+                    t = timer.lap('analysis', t)
+                    
                     # 스켈레톤 그리기
                     self.mp_draw.draw_landmarks(
                         frame, results.pose_landmarks, self.mp_pose.POSE_CONNECTIONS,
@@ -235,10 +247,7 @@ class SimpleElderlyMonitor:
                         self.mp_draw.DrawingSpec(color=(245,66,230), thickness=2, circle_radius=2)
                     )
                     
-                    # 움직임 분석
-                    self.analyze_movement(results.pose_landmarks.landmark)
-                    
-                    # 정보 표시
+                    # 정보 표시 (낙상 위험 체크 포함)
                     self.draw_simple_info(frame, results.pose_landmarks.landmark)
                 else:
                     # 사람이 감지되지 않은 경우
@@ -247,17 +256,25 @@ class SimpleElderlyMonitor:
                                (frame.shape[1]//2-120, frame.shape[0]//2), 
                                cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
                 
+                timer.draw_overlay(frame, show_stages=self.show_stage_latency)
+                t = timer.lap('draw', t)
+                
                 # 화면 출력
                 cv2.imshow('노인 활동 모니터링 데모', frame)
                 
                 # 키 입력 체크
                 key = cv2.waitKey(1) & 0xFF
+                timer.lap('display', t)
+                timer.end_frame()
                 if key == ord('q') or key == 27:  # 'q' 또는 ESC
                     break
+                elif key == ord('t'):  # 단계별 지연 시간 표시 전환
+                    self.show_stage_latency = not self.show_stage_latency
             
             # 정리
             cap.release()
             cv2.destroyAllWindows()
+            timer.print_summary()
             print("👋 데모를 종료합니다.")
 
 if __name__ == "__main__":
@@ -7,43 +7,119 @@
 - 비정상 자세 감지 (Abnormal Posture Detection)
 - 응급 상황 알림 (Emergency Alert)
 - 일일 활동 리포트 (Daily Activity Report)
+
+시작 시간: 모듈 로드 시에는 프레임 루프에 항상 필요한 것(cv2, numpy, 분석/버퍼/집계/추론 보조 모듈)만 import하고,
+설정이나 실행 모드에 따라 쓰는 모듈(mediapipe, 알림 발송기, 세션 로그, 사고 클립, 저장소, 실시간 보기,
+파이프라인, 명령 소켓, 공유 메모리 캡처, 다인실/사람 검출기)은 처음 쓸 때 import합니다.
+카메라를 열기 전에는 빈 프레임으로 모델을 미리 초기화합니다 (warm_up).
 """
 
+import time
+_IMPORT_START = time.perf_counter()  # 콜드 스타트 측정 기준 (이 모듈 로드 시작)
+
 import cv2
-import mediapipe as mp
 import numpy as np
-import time
 import json
 import math
-from collections import deque
-from datetime import datetime, timedelta
-import threading
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-import winsound  # Windows용 (macOS의 경우 os.system('afplay alert.wav') 사용)
+from dataclasses import dataclass, field
+from typing import Optional
+
+from monitoring_landmarks import X, Y, VISIBILITY, VISIBILITY_THRESHOLD, landmarks_to_array, body_inclination, head_hip_ratio, activity_center
+from monitoring_buffers import RingBuffer, RollingExtrema, RollingStats, ACTIVITY_DTYPE
+from monitoring_rollups import ActivityRollup
+from monitoring_metrics import StageTimer
+from monitoring_clock import WallClock
+from monitoring_inference import MotionGate, InferenceScheduler, RoiTracker, PoseEstimator, InferenceAutoscaler, LandmarkPredictor
+from monitoring_config import SYSTEM_CONFIG, THRESHOLDS, EMAIL_CONFIG, EMERGENCY_CONTACTS, DATA_CONFIG, UI_CONFIG
+
+_IMPORT_SECONDS = time.perf_counter() - _IMPORT_START
+
+@dataclass
+class FrameAnalysis:
+    """프레임 한 장의 분석 결과
+
+    분석 단계에서 프레임당 한 번만 만들어지고, 화면 표시 / 로그 / 알림은 모두 이 객체를 읽기만 합니다.
+    """
+    timestamp: float
+    landmarks: Optional[np.ndarray] = None  # (33, 4) 랜드마크 배열 (사람이 없으면 None)
+    inclination: float = 0.0
+    head_hip_ratio: float = 1.0
+    fall_conditions: list = field(default_factory=list)
+    fall_alert_triggered: bool = False      # 이번 프레임에서 낙상 알림이 발생했는지
+    activity: Optional[dict] = None          # analyze_activity_level 결과
+    alerts: list = field(default_factory=list)  # 건강 알림 목록
+    inferred: bool = True                    # False면 움직임 게이트가 추론을 건너뛰고 직전 랜드마크를 재사용
+
+    @property
+    def has_pose(self):
+        return self.landmarks is not None
+
+    @property
+    def fall_risk(self):
+        """충족된 낙상 조건 수 (0: 안전, 1: 주의, 2 이상: 낙상 위험)"""
+        return len(self.fall_conditions)
+
 
 class ElderlyMonitoringSystem:
-    def __init__(self):
-        """노인 모니터링 시스템 초기화"""
-        # MediaPipe 설정
-        self.mp_pose = mp.solutions.pose
-        self.mp_draw = mp.solutions.drawing_utils
+    def __init__(self, camera_id=None, headless=None, enable_alerts=True, enable_session_log=None, clock=None,
+                 enable_motion_gate=None, enable_adaptive_rate=None, enable_roi=None, enable_autoscale=None,
+                 enable_clips=None, enable_live_view=None, resident_id=None, enable_predictor=None,
+                 enable_store=None):
+        """노인 모니터링 시스템 초기화
+
+        camera_id: 여러 방을 함께 모니터링할 때의 카메라 식별자
+        headless: True면 화면 출력 없이 실행 (None이면 SYSTEM_CONFIG['HEADLESS'] 사용)
+        enable_alerts: False면 알림음/이메일 발송기를 만들지 않음 (녹화 영상 재생 등)
+        enable_session_log: 프레임 단위 세션 로그 기록 여부 (None이면 DATA_CONFIG 사용)
+        clock: 시각 공급자 (None이면 실제 시각, 영상 재생/시뮬레이션에는 SimulatedClock)
+        enable_motion_gate: 변화 없는 프레임의 pose 추론 생략 여부 (None이면 SYSTEM_CONFIG 사용)
+        enable_adaptive_rate: 활동 상태별 추론 속도 조절 여부 (None이면 SYSTEM_CONFIG 사용)
+        enable_roi: 사람 영역만 잘라서 추론할지 여부 (None이면 SYSTEM_CONFIG 사용)
+        enable_autoscale: 추론 지연에 따라 model_complexity/입력 해상도를 조절할지 여부 (None이면 SYSTEM_CONFIG 사용)
+        enable_clips: 낙상 전후 영상 클립 저장 여부 (None이면 DATA_CONFIG 사용)
+        enable_live_view: 로컬 HTTP 실시간 보기 서버 실행 여부 (None이면 SYSTEM_CONFIG 사용)
+        resident_id: 다인실 모드에서 거주자 한 명의 분석 상태만 담당할 때의 추적 ID (알림에 포함)
+        enable_predictor: 추론을 건너뛴 프레임의 랜드마크를 칼만 필터로 예측할지 여부 (None이면 SYSTEM_CONFIG 사용)
+        enable_store: 알림 이벤트/분 단위 활동 집계를 SQLite 저장소에 기록할지 여부 (None이면 DATA_CONFIG 사용)
+        """
+        init_start = time.perf_counter()
+        self.clock = clock if clock is not None else WallClock()
+        self.camera_id = camera_id
+        self.resident_id = resident_id
+        self.multi_resident = None  # 다인실 모드 (run_multi_resident_monitoring에서 생성)
+        self.headless = SYSTEM_CONFIG['HEADLESS'] if headless is None else headless
+        self.running = True
+        
+        # MediaPipe 모듈 (첫 사용 시 import - mp_pose 속성)
+        self._mp_pose = None
         
         # 모니터링 데이터
-        self.pose_history = deque(maxlen=300)  # 10초간 자세 히스토리 (30fps 기준)
-        self.activity_history = deque(maxlen=1800)  # 1분간 활동 히스토리
+        self.inclination_window = RollingExtrema(THRESHOLDS['FALL_DETECTION_FRAMES'])  # 급격한 변화 감지용 이동 최솟값/최댓값
+        self.activity_history = RingBuffer(SYSTEM_CONFIG['ACTIVITY_HISTORY_SIZE'], ACTIVITY_DTYPE)  # 1분간 활동 히스토리 (30fps 기준)
+        
+        # 스트리밍 활동 통계 (프레임당 O(1) 갱신)
+        self.movement_window = RollingStats(THRESHOLDS['POSTURE_ANALYSIS_FRAMES'])     # 활동 상태 분류용 (3초)
+        # 분/시간/일 단위 활동 집계 (리포트용, 세션 길이와 무관하게 메모리 고정)
+        self.activity_rollup = ActivityRollup(
+            minutes=SYSTEM_CONFIG['ROLLUP_MINUTES'],
+            hours=SYSTEM_CONFIG['ROLLUP_HOURS'],
+            days=SYSTEM_CONFIG['ROLLUP_DAYS'],
+            max_gap=SYSTEM_CONFIG['ROLLUP_MAX_GAP'],
+        )
         self.daily_activities = []
+        self.last_landmarks = None  # 마지막 프레임의 (33, 4) 랜드마크 배열
+        self.last_analysis = None   # 마지막 프레임의 FrameAnalysis
         
         # 낙상 감지 변수
         self.fall_detected = False
         self.fall_alert_sent = False
         self.last_fall_time = 0
+        self.fall_alert_reset_at = 0  # 이 시각 이후 낙상 알림 상태 해제
         
         # 활동 상태 추적
         self.current_activity = "알 수 없음"
         self.inactive_duration = 0
-        self.last_movement_time = time.time()
+        self.last_movement_time = self.clock.now()
         
         # 임계값 설정 (조정 가능)
         self.FALL_ANGLE_THRESHOLD = 60  # 낙상 각도 임계값
@@ -51,16 +127,176 @@ class ElderlyMonitoringSystem:
         self.LOW_ACTIVITY_THRESHOLD = 180  # 3분간 저활동 임계값
         
         # 응급 연락처 (실제 사용시 수정 필요)
-        self.emergency_contacts = {
-            'family': 'family@example.com',
-            'caregiver': 'caregiver@example.com'
-        }
+        self.emergency_contacts = EMERGENCY_CONTACTS
+        
+        # 알림 발송기 (알림음/이메일을 백그라운드에서 처리 - 프레임 루프를 막지 않음)
+        self.alert_dispatcher = None
+        if enable_alerts:
+            from monitoring_alerts import AlertDispatcher
+            self.alert_dispatcher = AlertDispatcher(
+                EMAIL_CONFIG, self.emergency_contacts,
+                enable_email=SYSTEM_CONFIG['ENABLE_EMAIL_ALERTS'],
+                enable_audio=SYSTEM_CONFIG['ENABLE_AUDIO_ALERTS'],
+            ).start()
+        
+        # 프레임 단위 세션 로그 (백그라운드에서 SAVE_INTERVAL마다 파일에 추가)
+        self.session_log = None
+        if enable_session_log is None:
+            enable_session_log = DATA_CONFIG['SESSION_LOG_ENABLED']
+        if enable_session_log:
+            from monitoring_session_log import SessionLogWriter
+            self.session_log = SessionLogWriter(
+                DATA_CONFIG['SESSION_LOG_DIR'], camera_id,
+                flush_interval=DATA_CONFIG['SAVE_INTERVAL'],
+            )
+        
+        # 낙상 전후 영상 클립 (최근 프레임을 JPEG로 메모리에 보관, 낙상 시 백그라운드에서 MP4 저장)
+        self.clip_recorder = None
+        if enable_clips is None:
+            enable_clips = DATA_CONFIG['CLIP_ENABLED']
+        if enable_clips:
+            from monitoring_clips import ClipRecorder
+            self.clip_recorder = ClipRecorder(
+                DATA_CONFIG['CLIP_DIR'], camera_id,
+                fps=DATA_CONFIG['CLIP_FPS'],
+                pre_roll=DATA_CONFIG['CLIP_PRE_ROLL'],
+                post_roll=DATA_CONFIG['CLIP_POST_ROLL'],
+                max_bytes=DATA_CONFIG['CLIP_MAX_MEMORY_MB'] * 1024 * 1024,
+                jpeg_quality=DATA_CONFIG['CLIP_JPEG_QUALITY'],
+            )
+        
+        # 실시간 보기 (MJPEG, 시청자가 없으면 프레임 루프 비용 없음)
+        self.live_view = None
+        if enable_live_view is None:
+            enable_live_view = SYSTEM_CONFIG['LIVE_VIEW_ENABLED']
+        if enable_live_view:
+            from monitoring_live_view import LiveViewServer
+            port_offset = camera_id if isinstance(camera_id, int) else 0
+            # 포트가 이미 쓰이고 있으면 None → 실시간 보기 없이 감지는 계속
+            self.live_view = LiveViewServer(
+                SYSTEM_CONFIG['LIVE_VIEW_HOST'], SYSTEM_CONFIG['LIVE_VIEW_PORT'] + port_offset,
+                fps=SYSTEM_CONFIG['LIVE_VIEW_FPS'],
+                jpeg_quality=SYSTEM_CONFIG['LIVE_VIEW_JPEG_QUALITY'],
+                report_provider=self.generate_daily_report,
+            ).start()
+        
+        # SQLite 이벤트/활동 집계 저장소 (완료된 분 버킷과 알림을 백그라운드에서 일괄 기록)
+        self.store = None
+        self.resident_label = DATA_CONFIG['STORE_RESIDENTS'].get(
+            camera_id, f"cam{camera_id if camera_id is not None else 0}")
+        if enable_store is None:
+            enable_store = DATA_CONFIG['STORE_ENABLED']
+        if enable_store:
+            from monitoring_store import MonitoringStore
+            self.store = MonitoringStore(DATA_CONFIG['STORE_PATH'],
+                                         flush_interval=DATA_CONFIG['STORE_FLUSH_INTERVAL']).start()
+            self.activity_rollup.minute_listeners.append(
+                lambda bucket: self.store.add_minute(self.camera_id, self.resident_label, bucket))
+        
+        # 움직임 게이트 (변화가 없는 프레임은 pose.process를 건너뛰고 직전 결과 재사용)
+        self.motion_gate = None
+        self.last_results = None  # 마지막으로 추론한 MediaPipe 결과
+        self.frames_processed = 0
+        self.frames_inferred = 0
+        if enable_motion_gate is None:
+            enable_motion_gate = SYSTEM_CONFIG['MOTION_GATE_ENABLED']
+        if enable_motion_gate:
+            self.motion_gate = MotionGate(
+                width=SYSTEM_CONFIG['MOTION_GATE_WIDTH'],
+                pixel_threshold=SYSTEM_CONFIG['MOTION_GATE_PIXEL_THRESHOLD'],
+                min_changed=SYSTEM_CONFIG['MOTION_GATE_MIN_CHANGED'],
+                force_interval=SYSTEM_CONFIG['MOTION_GATE_FORCE_INTERVAL'],
+            )
+        
+        # 활동 상태별 추론 속도 (휴식 중에는 낮추고 낙상 징후가 보이면 최대 속도)
+        self.inference_scheduler = None
+        if enable_adaptive_rate is None:
+            enable_adaptive_rate = SYSTEM_CONFIG['ADAPTIVE_RATE_ENABLED']
+        if enable_adaptive_rate:
+            self.inference_scheduler = InferenceScheduler(
+                SYSTEM_CONFIG['INFERENCE_RATES'],
+                full_rate=SYSTEM_CONFIG['INFERENCE_FULL_RATE'],
+                boost_hold=SYSTEM_CONFIG['INFERENCE_BOOST_HOLD'],
+            )
+        
+        # 랜드마크 예측 (interval 프레임마다만 추론하고 사이 프레임은 등속 칼만 필터로 예측)
+        self.landmark_predictor = None
+        if enable_predictor is None:
+            enable_predictor = SYSTEM_CONFIG['PREDICTOR_ENABLED']
+        if enable_predictor:
+            self.landmark_predictor = LandmarkPredictor(
+                interval=SYSTEM_CONFIG['PREDICTOR_INTERVAL'],
+                max_error=SYSTEM_CONFIG['PREDICTOR_MAX_ERROR'],
+                process_noise=SYSTEM_CONFIG['PREDICTOR_PROCESS_NOISE'],
+                measurement_noise=SYSTEM_CONFIG['PREDICTOR_MEASUREMENT_NOISE'],
+                max_horizon=SYSTEM_CONFIG['PREDICTOR_MAX_HORIZON'],
+            )
+        
+        # 사람 영역 추적 (직전 랜드마크 주변만 잘라 작은 입력으로 추론)
+        self.roi_tracker = None
+        if enable_roi is None:
+            enable_roi = SYSTEM_CONFIG['ROI_ENABLED']
+        if enable_roi:
+            self.roi_tracker = RoiTracker(
+                padding=SYSTEM_CONFIG['ROI_PADDING'],
+                input_size=SYSTEM_CONFIG['ROI_INPUT_SIZE'],
+                min_visible=SYSTEM_CONFIG['ROI_MIN_VISIBLE'],
+                min_size=SYSTEM_CONFIG['ROI_MIN_SIZE'],
+            )
+        
+        # 추론 품질 자동 조절 (과부하면 model_complexity / 입력 해상도를 낮추고 여유가 생기면 복귀)
+        self.autoscaler = None
+        self.input_scale = 1.0  # 전체 프레임 추론 시 입력 배율
+        if enable_autoscale is None:
+            enable_autoscale = SYSTEM_CONFIG['AUTOSCALE_ENABLED']
+        if enable_autoscale:
+            complexity = SYSTEM_CONFIG['MODEL_COMPLEXITY']
+            levels = [tuple(level) for level in SYSTEM_CONFIG['AUTOSCALE_LEVELS'] if level[0] <= complexity]
+            if not levels or levels[0] != (complexity, 1.0):
+                levels.insert(0, (complexity, 1.0))  # 설정된 품질보다 높이지는 않음
+            self.autoscaler = InferenceAutoscaler(
+                levels,
+                budget_ms=SYSTEM_CONFIG['AUTOSCALE_BUDGET_MS'],
+                window=SYSTEM_CONFIG['AUTOSCALE_WINDOW'],
+                headroom=SYSTEM_CONFIG['AUTOSCALE_HEADROOM'],
+                min_dwell=SYSTEM_CONFIG['AUTOSCALE_MIN_DWELL'],
+            )
+        
+        # 단계별 지연 시간 측정
+        self.stage_timer = StageTimer()
+        self.show_fps = UI_CONFIG['SHOW_FPS']
+        self.show_stage_latency = UI_CONFIG['SHOW_STAGE_LATENCY']
+        
+        # 알림 수신자 (알림 dict를 인자로 받는 함수 목록)
+        self.alert_listeners = [self.alert_dispatcher.submit] if self.alert_dispatcher else []
+        if self.store is not None:
+            self.alert_listeners.append(self.record_event)
+        self._active_alert_types = set()
         
         # 세션 시작 시간
-        self.session_start = datetime.now()
+        self.session_start = self.clock.datetime()
+        
+        # 콜드 스타트 측정 (모듈 로드 → 초기화 → 모델 워밍업 → 카메라 열기 → 첫 분석 프레임, ms)
+        self.startup = {
+            'import_ms': round(_IMPORT_SECONDS * 1000, 1),
+            'init_ms': round((time.perf_counter() - init_start) * 1000, 1),
+            'warm_up_ms': None,
+            'camera_open_ms': None,
+            'first_frame_ms': None,
+        }
+        self._first_frame_pending = resident_id is None
         
-        print("🏥 노인 활동 모니터링 시스템이 시작되었습니다.")
-        print("📊 실시간 모니터링을 시작합니다...")
+        if resident_id is None:
+            print("🏥 노인 활동 모니터링 시스템이 시작되었습니다.")
+            print("📊 실시간 모니터링을 시작합니다...")
+
+    @property
+    def mp_pose(self):
+        """mp.solutions.pose 모듈 (mediapipe는 처음 필요할 때 import - 모델을 쓰지 않는 인스턴스는 비용 없음)"""
+        if self._mp_pose is None:
+            import mediapipe as mp
+            self._mp_pose = mp.solutions.pose
+        return self._mp_pose
 
     def calculate_angle(self, point_a, point_b, point_c):
         """3개 점으로 각도 계산"""
@@ -79,49 +315,32 @@ class ElderlyMonitoringSystem:
     def calculate_body_inclination(self, landmarks):
         """몸의 기울기 계산 (낙상 감지용)"""
         try:
-            # 어깨와 엉덩이 중점 계산
-            left_shoulder = landmarks[self.mp_pose.PoseLandmark.LEFT_SHOULDER.value]
-            right_shoulder = landmarks[self.mp_pose.PoseLandmark.RIGHT_SHOULDER.value]
-            left_hip = landmarks[self.mp_pose.PoseLandmark.LEFT_HIP.value]
-            right_hip = landmarks[self.mp_pose.PoseLandmark.RIGHT_HIP.value]
-            
-            shoulder_center = ((left_shoulder.x + right_shoulder.x) / 2, 
-                             (left_shoulder.y + right_shoulder.y) / 2)
-            hip_center = ((left_hip.x + right_hip.x) / 2, 
-                         (left_hip.y + right_hip.y) / 2)
-            
-            # 몸의 수직 기울기 계산
-            dx = shoulder_center[0] - hip_center[0]
-            dy = shoulder_center[1] - hip_center[1]
-            
-            # 수직선과의 각도 계산
-            angle = math.degrees(math.atan2(abs(dx), abs(dy)))
-            return angle
+            # 어깨 중점과 엉덩이 중점을 잇는 선과 수직선 사이의 각도
+            return body_inclination(landmarks_to_array(landmarks))
             
         except Exception as e:
             print(f"기울기 계산 오류: {e}")
             return 0
 
-    def detect_fall(self, landmarks):
-        """낙상 감지 알고리즘"""
+    def detect_fall(self, landmarks, analysis=None, now=None):
+        """낙상 감지 알고리즘 (landmarks: (33, 4) 랜드마크 배열 또는 MediaPipe 랜드마크)
+
+        analysis(FrameAnalysis)가 주어지면 기울기, 머리/엉덩이 비율, 낙상 조건을 채워 넣습니다.
+        now: 프레임 시각 (None이면 clock.now())
+        """
+        if now is None:
+            now = self.clock.now()
         try:
+            landmarks = landmarks_to_array(landmarks)
+            
             # 1. 몸의 기울기 체크
-            inclination = self.calculate_body_inclination(landmarks)
+            inclination = body_inclination(landmarks)
             
             # 2. 머리와 엉덩이 높이 비교
-            nose = landmarks[self.mp_pose.PoseLandmark.NOSE.value]
-            left_hip = landmarks[self.mp_pose.PoseLandmark.LEFT_HIP.value]
-            right_hip = landmarks[self.mp_pose.PoseLandmark.RIGHT_HIP.value]
-            hip_y = (left_hip.y + right_hip.y) / 2
-            
-            # 3. 급격한 자세 변화 감지
-            current_pose = {
-                'inclination': inclination,
-                'head_hip_ratio': nose.y / hip_y if hip_y > 0 else 1,
-                'timestamp': time.time()
-            }
+            ratio = head_hip_ratio(landmarks)
             
-            self.pose_history.append(current_pose)
+            # 3. 급격한 자세 변화 감지용 이동 최솟값/최댓값 갱신
+            self.inclination_window.push(inclination)
             
             # 낙상 조건 체크
             fall_conditions = []
@@ -131,26 +350,30 @@ class ElderlyMonitoringSystem:
                 fall_conditions.append("과도한_기울기")
             
             # 조건 2: 머리가 엉덩이보다 낮은 경우
-            if current_pose['head_hip_ratio'] > 1.2:
+            if ratio > 1.2:
                 fall_conditions.append("머리_낮음")
             
-            # 조건 3: 급격한 자세 변화
-            if len(self.pose_history) >= 30:  # 1초간 데이터
-                recent_poses = list(self.pose_history)[-30:]
-                inclination_change = max([p['inclination'] for p in recent_poses]) - \
-                                   min([p['inclination'] for p in recent_poses])
+            # 조건 3: 급격한 자세 변화 (최근 FALL_DETECTION_FRAMES 프레임의 기울기 변화폭)
+            if self.inclination_window.full:  # 1초간 데이터
+                inclination_change = self.inclination_window.range()
                 
-                if inclination_change > 40:  # 급격한 변화
+                if inclination_change > THRESHOLDS['FALL_SUDDEN_CHANGE']:  # 급격한 변화
                     fall_conditions.append("급격한_변화")
             
+            if analysis is not None:
+                analysis.inclination = inclination
+                analysis.head_hip_ratio = ratio
+                analysis.fall_conditions = fall_conditions
+            
             # 낙상 판정
             if len(fall_conditions) >= 2:
-                current_time = time.time()
-                # 중복 알림 방지 (10초 쿨다운)
-                if current_time - self.last_fall_time > 10:
+                # 중복 알림 방지 (ALERT_COOLDOWN초, 기본 10초)
+                if now - self.last_fall_time > SYSTEM_CONFIG['ALERT_COOLDOWN']:
                     self.fall_detected = True
-                    self.last_fall_time = current_time
-                    self.trigger_fall_alert(fall_conditions)
+                    self.last_fall_time = now
+                    self.trigger_fall_alert(fall_conditions, now)
+                    if analysis is not None:
+                        analysis.fall_alert_triggered = True
                     
             return len(fall_conditions)
             
@@ -158,45 +381,34 @@ class ElderlyMonitoringSystem:
             print(f"낙상 감지 오류: {e}")
             return 0
 
-    def analyze_activity_level(self, landmarks):
-        """활동 수준 분석"""
+    def analyze_activity_level(self, landmarks, now=None):
+        """활동 수준 분석 (landmarks: (33, 4) 랜드마크 배열 또는 MediaPipe 랜드마크, now: 프레임 시각)"""
+        if now is None:
+            now = self.clock.now()
         try:
-            # 주요 관절들의 움직임 계산
-            key_points = [
-                landmarks[self.mp_pose.PoseLandmark.LEFT_WRIST.value],
-                landmarks[self.mp_pose.PoseLandmark.RIGHT_WRIST.value],
-                landmarks[self.mp_pose.PoseLandmark.LEFT_ANKLE.value],
-                landmarks[self.mp_pose.PoseLandmark.RIGHT_ANKLE.value]
-            ]
-            
-            # 현재 프레임의 활동 중심점 계산
-            center_x = np.mean([p.x for p in key_points if p.visibility > 0.5])
-            center_y = np.mean([p.y for p in key_points if p.visibility > 0.5])
-            
-            current_activity = {
-                'center': (center_x, center_y),
-                'timestamp': time.time(),
-                'movement': 0
-            }
+            # 현재 프레임의 활동 중심점 계산 (보이는 손목/발목 기준)
+            center_x, center_y = activity_center(landmarks_to_array(landmarks))
+            movement = 0.0
+            measured = math.isfinite(center_x) and math.isfinite(center_y)  # 손목/발목이 모두 가려지면 NaN
             
             # 이전 프레임과 비교하여 움직임 계산
-            if len(self.activity_history) > 0:
+            if measured and len(self.activity_history) > 0:
                 prev_activity = self.activity_history[-1]
-                dx = center_x - prev_activity['center'][0]
-                dy = center_y - prev_activity['center'][1]
-                movement = np.sqrt(dx*dx + dy*dy)
-                current_activity['movement'] = movement
+                dx = center_x - float(prev_activity['center_x'])
+                dy = center_y - float(prev_activity['center_y'])
+                movement = math.sqrt(dx*dx + dy*dy)
                 
                 # 움직임이 있는 경우 마지막 움직임 시간 업데이트
                 if movement > 0.01:  # 임계값
-                    self.last_movement_time = time.time()
+                    self.last_movement_time = now
             
-            self.activity_history.append(current_activity)
+            if measured:  # 가려진 프레임은 기록하지 않음 → 다음에 보이면 마지막으로 보인 위치와 비교
+                self.activity_history.append(center_x, center_y, now, movement)
+            self.movement_window.push(movement)
             
             # 활동 상태 분류
-            if len(self.activity_history) >= 90:  # 3초간 데이터
-                recent_movements = [a['movement'] for a in list(self.activity_history)[-90:]]
-                avg_movement = np.mean(recent_movements)
+            if self.movement_window.full:  # 3초간 데이터
+                avg_movement = self.movement_window.mean
                 
                 if avg_movement < 0.005:
                     self.current_activity = "휴식 중"
@@ -208,12 +420,12 @@ class ElderlyMonitoringSystem:
                     self.current_activity = "활발한 활동"
             
             # 비활성 시간 체크
-            self.inactive_duration = time.time() - self.last_movement_time
+            self.inactive_duration = now - self.last_movement_time
             
             return {
                 'activity_level': self.current_activity,
                 'inactive_duration': self.inactive_duration,
-                'movement_score': current_activity['movement']
+                'movement_score': movement
             }
             
         except Exception as e:
@@ -242,39 +454,64 @@ class ElderlyMonitoringSystem:
         
         return alerts
 
-    def trigger_fall_alert(self, conditions):
+    def notify_alert(self, alert, now=None):
+        """등록된 알림 수신자에게 알림 전달"""
+        alert = dict(alert, camera_id=self.camera_id, timestamp=self.clock.now() if now is None else now)
+        if self.resident_id is not None:
+            alert['resident_id'] = self.resident_id
+        for listener in self.alert_listeners:
+            try:
+                listener(alert)
+            except Exception as e:
+                print(f"알림 전달 오류: {e}")
+
+    def update_health_alerts(self, now=None):
+        """건강 알림 체크 후 새로 발생한 알림만 수신자에게 전달"""
+        alerts = self.check_health_alerts()
+        active_types = {alert['type'] for alert in alerts}
+        for alert in alerts:
+            if alert['type'] not in self._active_alert_types:
+                self.notify_alert(alert, now)
+        self._active_alert_types = active_types
+        return alerts
+
+    def trigger_fall_alert(self, conditions, now=None):
         """낙상 알림 발송"""
+        if now is None:
+            now = self.clock.now()
         if not self.fall_alert_sent:
             print("\n🚨🚨🚨 낙상 감지! 🚨🚨🚨")
             print(f"감지 조건: {', '.join(conditions)}")
             print("응급 연락망에 알림을 발송합니다...")
             
-            # 알림음 재생 (시스템에 맞게 수정)
-            try:
-                # Windows
-                winsound.Beep(1000, 2000)  # 1000Hz, 2초
-            except:
-                # macOS/Linux
-                import os
-                os.system('say "낙상이 감지되었습니다"')  # macOS TTS
-            
-            # 이메일 알림 (실제 환경에서는 이메일 설정 필요)
-            self.send_emergency_email("낙상 감지", conditions)
+            # 알림음 + 응급 이메일은 알림 발송기가 백그라운드에서 처리
+            alert = {
+                'type': 'FALL',
+                'message': '🚨 낙상 감지',
+                'severity': 'CRITICAL',
+                'conditions': list(conditions),
+            }
+            if self.clip_recorder is not None:
+                alert['clip'] = self.clip_recorder.trigger(now)  # 사고 전후 영상 (post-roll 후 저장)
+            self.notify_alert(alert, now)
             
             self.fall_alert_sent = True
             
-            # 10초 후 알림 상태 리셋
-            threading.Timer(10.0, self.reset_fall_alert).start()
+            # ALERT_COOLDOWN초 후 알림 상태 리셋 (타이머 스레드 대신 시계 기준으로 analyze_frame에서 처리)
+            self.fall_alert_reset_at = now + SYSTEM_CONFIG['ALERT_COOLDOWN']
 
     def send_emergency_email(self, alert_type, details):
-        """응급 상황 이메일 발송 (실제 환경에서는 SMTP 설정 필요)"""
-        try:
-            # 실제 사용시 이메일 서버 설정 필요
-            print(f"📧 응급 이메일 발송: {alert_type}")
-            print(f"세부사항: {details}")
-            print("가족 및 돌봄 제공자에게 알림이 발송되었습니다.")
-        except Exception as e:
-            print(f"이메일 발송 실패: {e}")
+        """응급 상황 이메일 발송 요청 (EMAIL_CONFIG의 SMTP 서버로 비동기 발송)"""
+        if self.alert_dispatcher is None:
+            return
+        self.alert_dispatcher.submit({
+            'type': 'EMERGENCY',
+            'message': alert_type,
+            'severity': 'CRITICAL',
+            'conditions': list(details),
+            'camera_id': self.camera_id,
+            'timestamp': self.clock.now(),
+        })
 
     def reset_fall_alert(self):
         """낙상 알림 상태 리셋"""
@@ -283,17 +520,14 @@ class ElderlyMonitoringSystem:
 
     def generate_daily_report(self):
         """일일 활동 리포트 생성"""
-        now = datetime.now()
+        now = self.clock.datetime()
         duration = now - self.session_start
         
-        # 활동 통계 계산
-        if len(self.activity_history) > 0:
-            movements = [a['movement'] for a in self.activity_history]
-            total_movement = sum(movements)
-            avg_movement = np.mean(movements)
-            max_movement = max(movements)
-        else:
-            total_movement = avg_movement = max_movement = 0
+        # 오늘 활동 통계 (일/시간/분 버킷만 합침 - 프레임 수와 무관)
+        today = self.activity_rollup.today()
+        total_movement = today.movement_sum
+        avg_movement = today.movement_sum / today.movement_count if today.movement_count else 0
+        max_movement = today.movement_max
         
         report = {
             'date': now.strftime('%Y-%m-%d'),
@@ -304,27 +538,53 @@ class ElderlyMonitoringSystem:
             'current_activity': self.current_activity,
             'inactive_duration': f"{int(self.inactive_duration/60)}분 {int(self.inactive_duration%60)}초",
             'fall_incidents': 1 if self.fall_detected else 0,
+            'inactive_minutes_today': round(today.inactive_sec / 60, 1),
+            'longest_inactive_minutes': round(today.max_inactive / 60, 1),
         }
+        if self.multi_resident is not None:
+            report['residents'] = self.multi_resident.reports()
         
         return report
 
     def save_session_data(self, filename=None):
         """세션 데이터 저장"""
+        now = self.clock.datetime()
         if filename is None:
-            filename = f"elderly_monitoring_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+            camera_tag = f"cam{self.camera_id}_" if self.camera_id is not None else ""
+            filename = f"elderly_monitoring_{camera_tag}{now.strftime('%Y%m%d_%H%M%S')}.json"
         
+        session = self.activity_rollup.session()
         session_data = {
             'session_info': {
+                'camera_id': self.camera_id,
                 'start_time': self.session_start.isoformat(),
-                'end_time': datetime.now().isoformat(),
-                'total_duration': str(datetime.now() - self.session_start).split('.')[0]
+                'end_time': now.isoformat(),
+                'total_duration': str(now - self.session_start).split('.')[0]
             },
             'daily_report': self.generate_daily_report(),
             'activity_summary': {
-                'total_frames': len(self.activity_history),
-                'pose_frames': len(self.pose_history)
-            }
+                'total_frames': session.frames,
+                'pose_frames': session.movement_count
+            },
+            'activity_rollup': {
+                'today': self.activity_rollup.today().to_dict(),
+                'last_hour_by_minute': self.activity_rollup.minutely(60),
+                'hourly': self.activity_rollup.hourly(24),
+                'daily': self.activity_rollup.daily(),
+            },
+            'stage_latency': self.stage_timer.summary(),
+            'startup': self.startup,
         }
+        if self.clip_recorder is not None:
+            session_data['clips'] = self.clip_recorder.summary()
+        if self.live_view is not None:
+            session_data['live_view'] = self.live_view.summary()
+        if self.multi_resident is not None:
+            session_data['multi_resident'] = self.multi_resident.summary()
+        session_data.update(self.inference_summary())
+        
+        if self.session_log is not None:
+            self.session_log.flush()
         
         try:
             with open(filename, 'w', encoding='utf-8') as f:
@@ -333,14 +593,46 @@ class ElderlyMonitoringSystem:
         except Exception as e:
             print(f"데이터 저장 실패: {e}")
 
-    def draw_monitoring_info(self, image, landmarks=None):
-        """모니터링 정보를 화면에 표시"""
+    def analyze_frame(self, landmarks=None):
+        """프레임 한 장의 순수 분석 단계 (활동 → 낙상 → 건강 알림) → FrameAnalysis
+
+        landmarks: (33, 4) 랜드마크 배열 또는 MediaPipe 랜드마크 (사람이 없으면 None)
+        프레임 시각은 clock.now()에서 한 번만 읽어 모든 단계가 같은 시각을 사용합니다.
+        """
+        now = self.clock.now()
+        analysis = FrameAnalysis(timestamp=now)
+        
+        # 낙상 알림 쿨다운 해제
+        if self.fall_alert_sent and now >= self.fall_alert_reset_at:
+            self.reset_fall_alert()
+        
+        if landmarks is not None:
+            landmarks = landmarks_to_array(landmarks)
+            analysis.landmarks = landmarks
+            self.last_landmarks = landmarks
+            
+            analysis.activity = self.analyze_activity_level(landmarks, now)
+            self.detect_fall(landmarks, analysis, now)
+        
+        # 분 버킷에 기록 (사람이 없는 프레임은 '미감지' 시간으로)
+        movement = analysis.activity['movement_score'] if analysis.activity else None
+        self.activity_rollup.record(now, movement, self.current_activity, self.inactive_duration)
+        
+        analysis.alerts = self.update_health_alerts(now)
+        self.last_analysis = analysis
+        
+        if self.session_log is not None:
+            self.session_log.append(analysis, self.current_activity)
+        return analysis
+
+    def draw_monitoring_info(self, image, analysis=None):
+        """모니터링 정보를 화면에 표시 (analysis: 이미 계산된 FrameAnalysis, 분석은 다시 하지 않음)"""
         height, width = image.shape[:2]
         
-        # 배경 오버레이
+        # 배경 오버레이 (반투명 패널을 원본 프레임에 합성)
         overlay = image.copy()
         cv2.rectangle(overlay, (10, 10), (400, 200), (0, 0, 0), -1)
-        image = cv2.addWeighted(image, 0.7, overlay, 0.3, 0)
+        cv2.addWeighted(image, 0.7, overlay, 0.3, 0, dst=image)
         
         # 시스템 정보
         cv2.putText(image, "🏥 노인 활동 모니터링", (20, 35), 
@@ -363,8 +655,8 @@ class ElderlyMonitoringSystem:
                    cv2.FONT_HERSHEY_SIMPLEX, 0.6, inactive_color, 2)
         
         # 낙상 감지 상태
-        if landmarks:
-            fall_risk = self.detect_fall(landmarks)
+        if analysis is not None and analysis.has_pose:
+            fall_risk = analysis.fall_risk
             fall_color = (0, 0, 255) if fall_risk >= 2 else (0, 165, 255) if fall_risk == 1 else (0, 255, 0)
             fall_status = "🚨 낙상 위험" if fall_risk >= 2 else "⚠️ 주의" if fall_risk == 1 else "✅ 안전"
             
@@ -372,116 +664,613 @@ class ElderlyMonitoringSystem:
                        cv2.FONT_HERSHEY_SIMPLEX, 0.6, fall_color, 2)
         
         # 모니터링 시간
-        duration = datetime.now() - self.session_start
+        duration = self.clock.datetime() - self.session_start
         duration_str = str(duration).split('.')[0]
         cv2.putText(image, f"모니터링: {duration_str}", (20, 155), 
                    cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
         
         # 건강 알림 표시
-        alerts = self.check_health_alerts()
-        if alerts:
+        if analysis is not None and analysis.alerts:
             y_pos = 185
-            for alert in alerts:
+            for alert in analysis.alerts:
                 alert_color = (0, 0, 255) if alert['severity'] == 'HIGH' else (0, 165, 255)
                 cv2.putText(image, alert['message'], (20, y_pos), 
                            cv2.FONT_HERSHEY_SIMPLEX, 0.5, alert_color, 1)
                 y_pos += 25
+        
+        return image
+
+    def draw_skeleton(self, image, landmarks):
+        """(33, 4) 전체 프레임 기준 랜드마크 배열로 자세 스켈레톤 그리기 (ROI로 추론한 결과도 그대로 사용)"""
+        height, width = image.shape[:2]
+        points = np.round(landmarks[:, [X, Y]] * (width, height)).astype(np.int32)
+        visible = landmarks[:, VISIBILITY] >= VISIBILITY_THRESHOLD
+        
+        for start, end in self.mp_pose.POSE_CONNECTIONS:
+            if visible[start] and visible[end]:
+                cv2.line(image, tuple(points[start]), tuple(points[end]), (245, 66, 230), 2)
+        for x, y in points[visible]:
+            cv2.circle(image, (int(x), int(y)), 2, (245, 117, 66), 2)
+        return image
+
+    def render_frame(self, frame, analysis):
+        """분석 결과를 프레임에 그림 (스켈레톤 + 정보 패널)"""
+        if analysis.has_pose:
+            # 자세 스켈레톤 그리기
+            self.draw_skeleton(frame, analysis.landmarks)
+        
+        # 모니터링 정보 표시
+        self.draw_monitoring_info(frame, analysis)
+        
+        if not analysis.has_pose:
+            # 사람이 감지되지 않은 경우
+            cv2.putText(frame, "🔍 사용자를 찾고 있습니다...", 
+                       (frame.shape[1]//2-150, frame.shape[0]//2), 
+                       cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
+        
+        # FPS / 단계별 지연 시간 오버레이
+        if self.show_fps:
+            self.stage_timer.draw_overlay(frame, show_stages=self.show_stage_latency,
+                                          origin=(frame.shape[1] - 235, 25))
+        return frame
+
+    def fall_trending(self):
+        """직전 프레임에 낙상 징후가 있는지 (낙상 조건 일부 충족, 크게 기울거나 빠르게 움직임)
+
+        이때는 추론을 건너뛰지 않고 최대 속도로 추론합니다.
+        """
+        analysis = self.last_analysis
+        if analysis is None or not analysis.has_pose:
+            return False
+        if analysis.fall_risk > 0:
+            return True
+        movement = analysis.activity['movement_score'] if analysis.activity else 0.0
+        return (analysis.inclination >= SYSTEM_CONFIG['INFERENCE_BOOST_INCLINATION'] or
+                movement >= SYSTEM_CONFIG['INFERENCE_BOOST_MOVEMENT'] or
+                self.inclination_window.range() >= THRESHOLDS['FALL_SUDDEN_CHANGE'] / 2)
+
+    @property
+    def inference_skip_ratio(self):
+        """pose 추론을 건너뛴 프레임 비율 (움직임 게이트 + 추론 속도 조절)"""
+        if not self.frames_processed:
+            return 0.0
+        return 1.0 - self.frames_inferred / self.frames_processed
+
+    def inference_summary(self):
+        """추론 생략 통계 (움직임 게이트 / 추론 속도 조절) - 절약한 CPU 시간 포함"""
+        pose_stats = self.stage_timer.stage_summary('pose')
+        pose_ms = pose_stats['mean'] if pose_stats else 0.0
+        summary = {}
+        if self.motion_gate is not None:
+            summary['motion_gate'] = self.motion_gate.summary(pose_ms)
+        if self.inference_scheduler is not None:
+            summary['inference_rate'] = self.inference_scheduler.summary(pose_ms)
+        if self.roi_tracker is not None:
+            summary['roi'] = self.roi_tracker.summary()
+        if self.autoscaler is not None:
+            summary['autoscale'] = self.autoscaler.summary()
+        if self.landmark_predictor is not None:
+            summary['predictor'] = self.landmark_predictor.summary()
+        return summary
+
+    def create_resident_monitor(self, resident_id):
+        """다인실 모드: 거주자 한 명의 분석 상태(낙상, 자세/활동 히스토리, 건강 알림)를 담당할 인스턴스
+
+        추론 생략/ROI/클립/알림 발송은 카메라 단위 인스턴스(self)가 맡고, 알림은 self의 수신자에게 전달됩니다.
+        """
+        resident = ElderlyMonitoringSystem(
+            camera_id=self.camera_id, headless=True, enable_alerts=False, enable_session_log=False,
+            clock=self.clock, enable_motion_gate=False, enable_adaptive_rate=False, enable_roi=False,
+            enable_autoscale=False, enable_clips=False, enable_live_view=False, resident_id=resident_id,
+            enable_predictor=False, enable_store=False,
+        )
+        resident.alert_listeners.append(self.forward_resident_alert)
+        if self.store is not None:
+            label = f"{self.resident_label}#{resident_id}"
+            resident.activity_rollup.minute_listeners.append(
+                lambda bucket: self.store.add_minute(self.camera_id, label, bucket))
+        return resident
+
+    def record_event(self, alert):
+        """알림 → SQLite 저장소 (다인실 모드면 거주자별 이름 '<방>#<추적 ID>')"""
+        resident = self.resident_label
+        if 'resident_id' in alert:
+            resident = f"{resident}#{alert['resident_id']}"
+        self.store.add_event(alert, resident)
+
+    def forward_resident_alert(self, alert):
+        """거주자 알림 → 카메라 단위 수신자 (낙상이면 카메라 영상 클립 추가)"""
+        if alert['type'] == 'FALL' and self.clip_recorder is not None:
+            alert['clip'] = self.clip_recorder.trigger(alert['timestamp'], f"fall_resident{alert['resident_id']}")
+        for listener in self.alert_listeners:
+            try:
+                listener(alert)
+            except Exception as e:
+                print(f"알림 전달 오류: {e}")
+
+    def create_pose(self):
+        """SYSTEM_CONFIG 설정으로 PoseEstimator 생성 (with 문으로 사용)"""
+        complexity = self.autoscaler.level[0] if self.autoscaler else SYSTEM_CONFIG['MODEL_COMPLEXITY']
+        return PoseEstimator(
+            self.mp_pose, complexity,
+            min_detection_confidence=SYSTEM_CONFIG['MIN_DETECTION_CONFIDENCE'],
+            min_tracking_confidence=SYSTEM_CONFIG['MIN_TRACKING_CONFIDENCE'],
+        )
+
+    def warm_up(self, pose=None):
+        """카메라를 열기 전에 빈 프레임으로 한 번 추론 (모델 로드/그래프 초기화를 라이브 루프 밖에서 끝냄)
+
+        첫 pose.process 지연이 첫 프레임의 낙상 감지를 늦추거나 자동 조절기를 불필요하게 낮추지 않도록 합니다.
+        """
+        seconds = 0.0
+        if pose is not None:
+            seconds += pose.warm_up((round(SYSTEM_CONFIG['CAMERA_HEIGHT'] * self.input_scale),
+                                     round(SYSTEM_CONFIG['CAMERA_WIDTH'] * self.input_scale)))
+        if self.multi_resident is not None:
+            seconds += self.multi_resident.warm_up((SYSTEM_CONFIG['CAMERA_HEIGHT'], SYSTEM_CONFIG['CAMERA_WIDTH']))
+        self.startup['warm_up_ms'] = round(seconds * 1000, 1)
+        print(f"🔥 모델 준비 완료 ({self.startup['warm_up_ms']:.0f}ms)")
+
+    def open_camera(self, source=0, buffer_size=None):
+        """카메라 열기 (640x480, 걸린 시간은 startup['camera_open_ms'])"""
+        start = time.perf_counter()
+        cap = cv2.VideoCapture(source)
+        cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
+        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
+        if buffer_size is not None:
+            cap.set(cv2.CAP_PROP_BUFFERSIZE, buffer_size)
+        self.startup['camera_open_ms'] = round((time.perf_counter() - start) * 1000, 1)
+        return cap
+
+    def mark_first_frame(self):
+        """첫 분석 프레임 시점 기록 및 콜드 스타트 시간 출력"""
+        self._first_frame_pending = False
+        startup = self.startup
+        startup['first_frame_ms'] = round((time.perf_counter() - _IMPORT_START) * 1000, 1)
+        phases = [f"{name} {startup[key]:.0f}ms" for key, name in (
+            ('import_ms', 'import'), ('init_ms', '초기화'), ('warm_up_ms', '워밍업'), ('camera_open_ms', '카메라'))
+            if startup[key] is not None]
+        print(f"🚀 첫 프레임 분석까지 {startup['first_frame_ms'] / 1000:.2f}초 ({', '.join(phases)})")
+
+    def apply_inference_level(self, pose, level):
+        """자동 조절기가 고른 (model_complexity, 입력 배율) 적용"""
+        complexity, scale = level
+        pose.set_complexity(complexity)
+        self.input_scale = scale
+        if self.roi_tracker is not None:
+            self.roi_tracker.input_size = max(64, round(SYSTEM_CONFIG['ROI_INPUT_SIZE'] * scale))
+
+    def process_frame(self, pose, frame):
+        """프레임 한 장 추론 + 분석 (pose: PoseEstimator, frame: BGR 프레임) → (results, FrameAnalysis)
+
+        results는 MediaPipe 원본 결과(ROI로 추론했다면 ROI 좌표)이므로,
+        화면 표시와 분석에는 전체 프레임 좌표로 변환된 analysis.landmarks를 사용합니다.
+
+        추론 속도 조절기가 차례가 아니라고 하거나, 랜드마크 예측기가 예측으로 충분하다고 하거나,
+        움직임 게이트가 변화 없음으로 판단하면 pose.process를 건너뛰고 직전 결과를 재사용합니다
+        (예측기가 있으면 랜드마크는 예측값 - 분석 단계는 매 프레임 움직이는 랜드마크를 받음).
+        분석 단계는 매 프레임 실행되므로 비활성 시간/건강 알림은 그대로 갱신됩니다.
+        """
+        timer = self.stage_timer
+        t = timer.begin()
+        now = self.clock.now()
+        if self.clip_recorder is not None:
+            self.clip_recorder.add_frame(frame, now)  # 그리기 전 원본 (복사만 하고 인코딩은 워커 스레드)
+        urgent = self.fall_trending()
+        if self.motion_gate is not None:
+            # 변화량은 매 프레임 측정 (큰 움직임이면 속도 조절과 무관하게 즉시 추론)
+            changed = self.motion_gate.measure(frame)
+            urgent = urgent or changed >= SYSTEM_CONFIG['INFERENCE_BOOST_MOTION']
+        infer = True
+        if self.inference_scheduler is not None:
+            infer = self.inference_scheduler.should_infer(now, self.current_activity, urgent)
+        if infer and self.landmark_predictor is not None:
+            infer = self.landmark_predictor.due(urgent)
+        if infer and self.motion_gate is not None:
+            infer = self.motion_gate.decide(now, force=urgent)
+        t = timer.lap('gate', t)
+        
+        self.frames_processed += 1
+        if infer or self.last_results is None:
+            self.frames_inferred += 1
+            infer_start = t
+            # 추적 중이면 사람 영역만 잘라서 작은 입력으로 추론
+            image, box = self.roi_tracker.prepare(frame) if self.roi_tracker else (frame, None)
+            if box is None and self.input_scale != 1.0:
+                image = cv2.resize(frame, None, fx=self.input_scale, fy=self.input_scale,
+                                   interpolation=cv2.INTER_AREA)
+            rgb_frame = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+            rgb_frame.flags.writeable = False
+            t = timer.lap('convert', t)
+            
+            results = pose.process(rgb_frame)
+            t = timer.lap('pose', t)
+            self.last_results = results
+            
+            # 추론 지연이 예산을 넘거나 여유가 있으면 품질 단계 변경
+            if self.autoscaler is not None:
+                level = self.autoscaler.record(t - infer_start, now)
+                if level is not None:
+                    self.apply_inference_level(pose, level)
+            
+            # 프레임당 한 번만 배열로 변환 (ROI 좌표 → 전체 프레임 좌표), 이후 분석은 모두 배열 사용
+            landmarks = None
+            if results.pose_landmarks:
+                landmarks = RoiTracker.to_frame(landmarks_to_array(results.pose_landmarks), box, frame.shape)
+            if self.roi_tracker is not None:
+                self.roi_tracker.update(landmarks, frame.shape)
+            if self.landmark_predictor is not None:
+                if landmarks is None:
+                    self.landmark_predictor.reset()
+                else:
+                    self.landmark_predictor.update(landmarks, now)
+        else:
+            results = self.last_results
+            landmarks = None
+            if results.pose_landmarks:
+                predictor = self.landmark_predictor
+                landmarks = predictor.predict(now) if predictor is not None and predictor.ready else self.last_landmarks
+        
+        analysis = self.analyze_frame(landmarks)
+        analysis.inferred = infer
+        timer.lap('analysis', t)
+        if self._first_frame_pending:
+            self.mark_first_frame()
+        return results, analysis
 
     def run_monitoring(self):
         """메인 모니터링 루프"""
-        with self.mp_pose.Pose(
-            min_detection_confidence=0.5,
-            min_tracking_confidence=0.5,
-            model_complexity=1  # 성능과 정확도의 균형
-        ) as pose:
-            
-            cap = cv2.VideoCapture(0)
-            cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-            cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
+        if self.headless:
+            return self.run_headless()
+        
+        with self.create_pose() as pose:
+            self.warm_up(pose)
+            cap = self.open_camera(0)
             
             print("🎥 카메라 스트림이 시작되었습니다.")
-            print("⌨️  조작법:")
-            print("   'q' 또는 ESC: 종료")
-            print("   'r': 일일 리포트 출력")
-            print("   's': 세션 데이터 저장")
+            self.print_controls()
             
+            timer = self.stage_timer
             while cap.isOpened():
+                t = timer.begin()
                 ret, frame = cap.read()
                 if not ret:
                     break
+                timer.lap('capture', t)
                 
                 # 이미지 전처리
                 frame = cv2.flip(frame, 1)  # 좌우 반전으로 자연스러운 움직임
-                rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                rgb_frame.flags.writeable = False
                 
-                # 자세 검출
-                results = pose.process(rgb_frame)
+                # 게이트 → 자세 검출 → 분석 (프레임당 한 번, frame은 반전된 BGR 원본 그대로)
+                _, analysis = self.process_frame(pose, frame)
+                t = timer.begin()
                 
-                # 이미지 다시 쓰기 가능으로 설정
-                rgb_frame.flags.writeable = True
-                frame = cv2.cvtColor(rgb_frame, cv2.COLOR_RGB2BGR)
-                
-                if results.pose_landmarks:
-                    # 자세 스켈레톤 그리기
-                    self.mp_draw.draw_landmarks(
-                        frame, results.pose_landmarks, self.mp_pose.POSE_CONNECTIONS,
-                        self.mp_draw.DrawingSpec(color=(245,117,66), thickness=2, circle_radius=2),
-                        self.mp_draw.DrawingSpec(color=(245,66,230), thickness=2, circle_radius=2)
-                    )
-                    
-                    # 활동 분석
-                    activity_info = self.analyze_activity_level(results.pose_landmarks.landmark)
-                    
-                    # 모니터링 정보 표시
-                    self.draw_monitoring_info(frame, results.pose_landmarks.landmark)
-                else:
-                    # 사람이 감지되지 않은 경우
-                    self.draw_monitoring_info(frame)
-                    cv2.putText(frame, "🔍 사용자를 찾고 있습니다...", 
-                               (frame.shape[1]//2-150, frame.shape[0]//2), 
-                               cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
+                self.render_frame(frame, analysis)
+                if self.live_view is not None:
+                    self.live_view.publish(frame)
+                t = timer.lap('draw', t)
                 
                 # 화면 출력
                 cv2.imshow('노인 활동 모니터링 시스템', frame)
                 
                 # 키보드 입력 처리
                 key = cv2.waitKey(1) & 0xFF
-                if key == ord('q') or key == 27:  # 'q' 또는 ESC
+                timer.lap('display', t)
+                timer.end_frame()
+                if not self.handle_key(key):
                     break
-                elif key == ord('r'):  # 일일 리포트
-                    report = self.generate_daily_report()
-                    print("\n" + "="*50)
-                    print("📊 일일 활동 리포트")
-                    print("="*50)
-                    for key, value in report.items():
-                        print(f"{key}: {value}")
-                    print("="*50 + "\n")
-                elif key == ord('s'):  # 데이터 저장
-                    self.save_session_data()
             
             # 종료 처리
             cap.release()
             cv2.destroyAllWindows()
             
-            # 최종 리포트 및 데이터 저장
-            print("\n🏁 모니터링이 종료되었습니다.")
-            final_report = self.generate_daily_report()
-            print("\n📊 최종 활동 리포트:")
-            print("="*40)
-            for key, value in final_report.items():
-                print(f"  {key}: {value}")
-            print("="*40)
+            self.finish_session()
+
+    def run_headless(self):
+        """헤드리스 모니터링 루프 (화면 출력 없이 감지와 저장만 수행)
+
+        그리기, 좌우 반전, RGB→BGR 재변환, imshow/waitKey처럼 화면 표시용 단계를 모두 건너뜁니다.
+        (낙상/활동 지표는 좌우 대칭이라 반전 여부와 무관)
+        키 입력 대신 시그널과 로컬 명령 소켓으로 제어합니다.
+        """
+        with self.create_pose() as pose:
+            self.warm_up(pose)
+            cap = self.open_camera(0)
+            
+            from monitoring_control import CommandChannel
+            channel = CommandChannel(SYSTEM_CONFIG['CONTROL_HOST'], SYSTEM_CONFIG['CONTROL_PORT'])
+            channel.install_signal_handlers()
+            channel.start()
+            
+            print("🎥 카메라 스트림이 시작되었습니다. (헤드리스 모드)")
+            print("📡 제어: SIGUSR1=리포트, SIGUSR2=저장, SIGTERM/Ctrl+C=종료")
             
-            # 자동 저장
+            try:
+                timer = self.stage_timer
+                while self.running and cap.isOpened():
+                    t = timer.begin()
+                    ret, frame = cap.read()
+                    if not ret:
+                        break
+                    timer.lap('capture', t)
+                    
+                    _, analysis = self.process_frame(pose, frame)
+                    self.publish_live_view(frame, analysis)
+                    timer.end_frame()
+                    channel.dispatch(self.execute_command)
+            finally:
+                channel.stop()
+                cap.release()
+            
+            self.finish_session()
+
+    def run_pipelined_monitoring(self, use_capture_process=False):
+        """파이프라인 모니터링 루프 (캡처/추론/렌더링 스레드 분리)
+
+        use_capture_process: True면 캡처를 별도 프로세스에서 실행하고 프레임은 공유 메모리 링으로 전달
+        """
+        if self.headless:
+            return self.run_headless()
+        if use_capture_process:
+            return self.run_shared_memory_monitoring()
+        
+        with self.create_pose() as pose:
+            self.warm_up(pose)
+            cap = self.open_camera(0, buffer_size=1)  # 카메라 내부 버퍼 최소화
+            
+            print("🎥 카메라 스트림이 시작되었습니다. (파이프라인 모드)")
+            self.print_controls()
+            
+            from monitoring_pipeline import MonitoringPipeline
+            pipeline = MonitoringPipeline(self, pose, cap)
+            try:
+                pipeline.run()
+            finally:
+                cap.release()
+                cv2.destroyAllWindows()
+            
+            self.finish_session()
+
+    def run_shared_memory_monitoring(self, source=0):
+        """캡처 프로세스 + 파이프라인 모니터링 (프레임은 공유 메모리 링으로 복사/피클링 없이 전달)"""
+        import multiprocessing as mp_proc
+        from monitoring_pipeline import MonitoringPipeline
+        from monitoring_shared_frames import SharedFrameRing, capture_process
+        
+        shape = (SYSTEM_CONFIG['CAMERA_HEIGHT'], SYSTEM_CONFIG['CAMERA_WIDTH'], 3)
+        ring = SharedFrameRing(shape, slots=SYSTEM_CONFIG['FRAME_RING_SLOTS'])
+        ctx = mp_proc.get_context('spawn')
+        stop_event = ctx.Event()
+        capture = ctx.Process(target=capture_process, name='monitoring-capture',
+                              args=(source, ring.name, shape, ring.slots, stop_event), daemon=True)
+        capture.start()
+        
+        with self.create_pose() as pose:
+            self.warm_up(pose)  # 캡처 프로세스가 카메라를 여는 동안 모델 초기화
+            print(f"🎥 카메라 스트림이 시작되었습니다. (캡처 프로세스 + 공유 메모리 {ring.slots}슬롯)")
+            self.print_controls()
+            
+            pipeline = MonitoringPipeline(self, pose, frame_ring=ring)
+            try:
+                pipeline.run()
+            finally:
+                stop_event.set()
+                capture.join(timeout=5.0)
+                cv2.destroyAllWindows()
+                del pipeline
+                ring.close()
+            
+            self.finish_session()
+
+    def run_multi_resident_monitoring(self):
+        """다인실 모니터링 루프 (사람마다 추적 ID, 거주자별 낙상/활동 분석)"""
+        from monitoring_residents import MultiResidentMonitor
+        self.multi_resident = MultiResidentMonitor(
+            self,
+            max_residents=SYSTEM_CONFIG['MULTI_RESIDENT_MAX'],
+            detector_model=SYSTEM_CONFIG['MULTI_RESIDENT_DETECTOR'],
+            detect_width=SYSTEM_CONFIG['MULTI_RESIDENT_DETECT_WIDTH'],
+            detect_interval=SYSTEM_CONFIG['MULTI_RESIDENT_DETECT_INTERVAL'],
+            search_interval=SYSTEM_CONFIG['MULTI_RESIDENT_SEARCH_INTERVAL'],
+            track_timeout=SYSTEM_CONFIG['MULTI_RESIDENT_TRACK_TIMEOUT'],
+            iou_threshold=SYSTEM_CONFIG['MULTI_RESIDENT_IOU'],
+            workers=SYSTEM_CONFIG['MULTI_RESIDENT_WORKERS'],
+        )
+        multi = self.multi_resident
+        self.warm_up()  # 사람 검출기 + 첫 거주자용 Pose
+        cap = self.open_camera(0)
+        
+        channel = None
+        if self.headless:
+            from monitoring_control import CommandChannel
+            channel = CommandChannel(SYSTEM_CONFIG['CONTROL_HOST'], SYSTEM_CONFIG['CONTROL_PORT'])
+            channel.install_signal_handlers()
+            channel.start()
+            print("🎥 카메라 스트림이 시작되었습니다. (다인실, 헤드리스 모드)")
+        else:
+            print("🎥 카메라 스트림이 시작되었습니다. (다인실 모드)")
+            self.print_controls()
+        
+        try:
+            timer = self.stage_timer
+            while self.running and cap.isOpened():
+                t = timer.begin()
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                timer.lap('capture', t)
+                
+                if self.headless:
+                    multi.process_frame(frame)
+                    if self._first_frame_pending:
+                        self.mark_first_frame()
+                    if self.live_view is not None and self.live_view.viewers:
+                        t = timer.begin()
+                        self.live_view.publish(multi.render(frame.copy()))
+                        timer.lap('draw', t)
+                    timer.end_frame()
+                    channel.dispatch(self.execute_command)
+                    continue
+                
+                frame = cv2.flip(frame, 1)
+                multi.process_frame(frame)
+                if self._first_frame_pending:
+                    self.mark_first_frame()
+                t = timer.begin()
+                multi.render(frame)
+                if self.live_view is not None:
+                    self.live_view.publish(frame)
+                t = timer.lap('draw', t)
+                
+                cv2.imshow('노인 활동 모니터링 시스템 (다인실)', frame)
+                key = cv2.waitKey(1) & 0xFF
+                timer.lap('display', t)
+                timer.end_frame()
+                if not self.handle_key(key):
+                    break
+        finally:
+            if channel is not None:
+                channel.stop()
+            cap.release()
+            cv2.destroyAllWindows()
+            multi.close()
+        
+        self.finish_session()
+
+    def close_store(self):
+        """진행 중인 분 집계까지 저장소에 넘기고 기록 스레드 종료"""
+        if self.store is None:
+            return
+        self.activity_rollup.flush()
+        self.store.close()
+        summary = self.store.summary()
+        dropped = f", 버린 행 {summary['rows_dropped']}건" if summary['rows_dropped'] else ""
+        print(f"🗄️ 저장소 기록: 이벤트 {summary['events_written']}건, 분 집계 {summary['minutes_written']}건{dropped} → {summary['path']}")
+
+    def publish_live_view(self, frame, analysis):
+        """헤드리스 루프용: 시청자가 있을 때만 복사본에 그려서 실시간 보기로 게시"""
+        if self.live_view is None or not self.live_view.viewers:
+            return
+        t = self.stage_timer.begin()
+        self.live_view.publish(self.render_frame(frame.copy(), analysis))
+        self.stage_timer.lap('draw', t)
+
+    def print_controls(self):
+        """조작법 출력"""
+        print("⌨️  조작법:")
+        print("   'q' 또는 ESC: 종료")
+        print("   'r': 일일 리포트 출력")
+        print("   's': 세션 데이터 저장")
+        print("   't': 단계별 지연 시간 표시 전환")
+
+    def handle_key(self, key):
+        """키보드 입력 처리 (종료 요청이면 False 반환)"""
+        if key == ord('q') or key == 27:  # 'q' 또는 ESC
+            self.execute_command('quit')
+        elif key == ord('r'):  # 일일 리포트
+            self.execute_command('report')
+        elif key == ord('s'):  # 데이터 저장
+            self.execute_command('save')
+        elif key == ord('t'):  # 단계별 지연 시간 오버레이 전환
+            self.show_stage_latency = not self.show_stage_latency
+        return self.running
+
+    def execute_command(self, command):
+        """제어 명령 실행 (키 입력, 시그널, 명령 소켓 공통) → 응답 문자열"""
+        if command == 'quit':
+            self.running = False
+            return 'stopping'
+        elif command == 'report':
+            report = self.generate_daily_report()
+            print("\n" + "="*50)
+            print("📊 일일 활동 리포트")
+            print("="*50)
+            for name, value in report.items():
+                print(f"{name}: {value}")
+            print("="*50 + "\n")
+            return json.dumps(report, ensure_ascii=False)
+        elif command == 'save':
             self.save_session_data()
+            return 'saved'
+        elif command == 'status':
+            analysis = self.last_analysis
+            return json.dumps({
+                'camera_id': self.camera_id,
+                'has_pose': bool(analysis and analysis.has_pose),
+                'fall_risk': analysis.fall_risk if analysis else 0,
+                'current_activity': self.current_activity,
+                'inactive_duration': round(self.inactive_duration, 1),
+                'alerts': [alert['type'] for alert in analysis.alerts] if analysis else [],
+                'live_view_viewers': self.live_view.viewers if self.live_view is not None else 0,
+                'first_frame_ms': self.startup['first_frame_ms'],
+                **self.inference_summary(),
+            }, ensure_ascii=False)
+        return f"unknown command: {command}"
+
+    def finish_session(self):
+        """최종 리포트 출력 및 데이터 저장"""
+        print("\n🏁 모니터링이 종료되었습니다.")
+        if self.alert_dispatcher is not None:
+            self.alert_dispatcher.stop()
+        if self.session_log is not None:
+            self.session_log.close()
+        if self.clip_recorder is not None:
+            self.clip_recorder.close()
+        if self.live_view is not None:
+            self.live_view.stop()
+        self.close_store()
+        final_report = self.generate_daily_report()
+        print("\n📊 최종 활동 리포트:")
+        print("="*40)
+        for key, value in final_report.items():
+            print(f"  {key}: {value}")
+        print("="*40)
+        self.stage_timer.print_summary()
+        inference = self.inference_summary()
+        if 'inference_rate' in inference:
+            rate = inference['inference_rate']
+            print(f"⏩ 추론 속도 조절: {rate['frames']}프레임 중 {rate['skipped']}프레임 생략 "
+                  f"({rate['skip_ratio']*100:.1f}%), CPU 약 {rate['cpu_saved_sec']}초 절약, "
+                  f"최대 속도 전환 {rate['boosts']}회 (감지 지연 p95 {rate['boost_latency_ms']['p95']:.0f}ms)")
+        if self.multi_resident is not None:
+            multi = self.multi_resident.summary()
+            print(f"👥 다인실: 거주자 {multi['residents_tracked']}명 추적, 사람 검출 {multi['detector_runs']}회, "
+                  f"프레임당 pose 추론 {multi['pose_calls_per_frame']}회 "
+                  f"(거주자 1명당 {multi['pose_calls_per_resident_frame']}회)")
+        if 'motion_gate' in inference:
+            gate = inference['motion_gate']
+            print(f"🚪 움직임 게이트: {gate['frames']}프레임 중 {gate['skipped']}프레임 추론 생략 "
+                  f"({gate['skip_ratio']*100:.1f}%), CPU 약 {gate['cpu_saved_sec']}초 절약")
+        
+        # 자동 저장
+        self.save_session_data()
 
 if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="노인 활동 모니터링 시스템")
+    parser.add_argument('--pipeline', action='store_true',
+                        help='캡처/추론/렌더링을 별도 스레드로 실행')
+    parser.add_argument('--capture-process', action='store_true',
+                        help='파이프라인 모드에서 캡처를 별도 프로세스로 실행 (공유 메모리로 프레임 전달)')
+    parser.add_argument('--headless', action='store_true', default=None,
+                        help="화면 없이 실행 (기본값: SYSTEM_CONFIG['HEADLESS'])")
+    parser.add_argument('--multi', action='store_true',
+                        help='다인실 모드: 여러 거주자를 추적 ID별로 따로 분석')
+    parser.add_argument('--live-view', action='store_true', default=None,
+                        help="브라우저용 MJPEG 실시간 보기 서버 실행 (기본값: SYSTEM_CONFIG['LIVE_VIEW_ENABLED'])")
+    args = parser.parse_args()
+    
     # 모니터링 시스템 시작
-    monitoring_system = ElderlyMonitoringSystem()
+    monitoring_system = ElderlyMonitoringSystem(headless=args.headless, enable_live_view=args.live_view)
     
     try:
-        monitoring_system.run_monitoring()
+        if args.multi:
+            monitoring_system.run_multi_resident_monitoring()
+        elif args.pipeline or args.capture_process:
+            monitoring_system.run_pipelined_monitoring(use_capture_process=args.capture_process)
+        else:
+            monitoring_system.run_monitoring()
     except KeyboardInterrupt:
         print("\n⏹️  사용자에 의해 모니터링이 중단되었습니다.")
     except Exception as e:
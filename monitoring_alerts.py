@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+노인 활동 모니터링 - 비동기 알림 발송기
+- 크기가 제한된 큐 + 백그라운드 스레드: 캡처/추론 루프는 절대 블로킹되지 않음
+- EMAIL_CONFIG로 만든 SMTP 연결을 풀에 보관해 재사용
+- EMERGENCY_CONTACTS 전원에게 병렬 발송, 실패 시 지수 백오프로 재시도
+  (디스패처 스레드는 발송을 넘기기만 하고 기다리지 않음 → 재시도 중에도 다음 낙상 알림이 바로 처리됨)
+- 알림음도 별도 스레드에서 재생
+- smtplib / email은 이메일을 처음 보낼 때 import (시작 시간 단축, winsound는 Windows에서만)
+
+로컬 테스트용 SMTP 서버 예:
+    python -m aiosmtpd -n -l 127.0.0.1:1025
+    EMAIL_CONFIG = {'SMTP_SERVER': '127.0.0.1', 'SMTP_PORT': 1025, 'USE_TLS': False, 'EMAIL_PASSWORD': '', ...}
+"""
+
+import queue
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+EMAIL_SEVERITIES = ('CRITICAL', 'HIGH')  # 이메일을 보내는 알림 심각도
+SMTP_TIMEOUT = 10.0
+
+
+def play_alert_sound():
+    """알림음 재생 (Windows: winsound, macOS: say, 그 외: 터미널 벨)"""
+    if sys.platform == 'win32':
+        import winsound
+        winsound.Beep(1000, 2000)  # 1000Hz, 2초
+    elif sys.platform == 'darwin':
+        subprocess.run(['say', '낙상이 감지되었습니다'], check=False)  # macOS TTS
+    else:
+        print('\a', end='', flush=True)
+
+
+class SMTPConnectionPool:
+    """EMAIL_CONFIG 기반 SMTP 연결 풀 (연결을 재사용하고 끊어진 연결은 다시 만듦)"""
+
+    def __init__(self, email_config, size=4):
+        self.config = email_config
+        self._idle = queue.LifoQueue(maxsize=size)
+
+    def _connect(self):
+        import smtplib
+        config = self.config
+        conn = smtplib.SMTP(config['SMTP_SERVER'], config['SMTP_PORT'], timeout=SMTP_TIMEOUT)
+        if config.get('USE_TLS'):
+            conn.starttls()
+        if config.get('EMAIL_PASSWORD'):
+            conn.login(config['EMAIL_ADDRESS'], config['EMAIL_PASSWORD'])
+        return conn
+
+    def acquire(self):
+        """살아있는 유휴 연결을 꺼내거나 새로 연결"""
+        import smtplib
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                return self._connect()
+            try:
+                if conn.noop()[0] == 250:
+                    return conn
+            except (smtplib.SMTPException, OSError):
+                pass
+            self.discard(conn)
+
+    def release(self, conn):
+        """사용이 끝난 연결을 풀에 반환 (풀이 가득 차면 닫음)"""
+        try:
+            self._idle.put_nowait(conn)
+        except queue.Full:
+            self.discard(conn)
+
+    def discard(self, conn):
+        import smtplib
+        try:
+            conn.quit()
+        except (smtplib.SMTPException, OSError):
+            try:
+                conn.close()
+            except OSError:
+                pass
+
+    def close(self):
+        while True:
+            try:
+                self.discard(self._idle.get_nowait())
+            except queue.Empty:
+                break
+
+
+class AlertDispatcher:
+    """알림을 백그라운드에서 처리하는 발송기
+
+    submit()은 큐에 넣기만 하고 즉시 반환합니다. 큐가 가득 차면 알림을 버리고 dropped를 늘립니다.
+    """
+
+    def __init__(self, email_config, contacts, enable_email=False, enable_audio=True,
+                 queue_size=100, max_retries=3, backoff=1.0):
+        self.email_config = email_config
+        self.recipients = [c['email'] for c in contacts.values() if c.get('email')]
+        self.enable_email = enable_email
+        self.enable_audio = enable_audio
+        self.max_retries = max_retries
+        self.backoff = backoff
+
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._pool = SMTPConnectionPool(email_config, size=max(1, len(self.recipients)))
+        self._senders = ThreadPoolExecutor(max_workers=max(1, len(self.recipients)),
+                                           thread_name_prefix='alert-smtp')
+        self._audio = ThreadPoolExecutor(max_workers=1, thread_name_prefix='alert-audio')
+        self._thread = None
+
+        # 통계 (sent/failed는 발송 스레드들의 완료 콜백에서 갱신되므로 잠금 사용)
+        self._stats_lock = threading.Lock()
+        self.dropped = 0
+        self.sent = 0
+        self.failed = 0
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='alert-dispatcher', daemon=True)
+            self._thread.start()
+        return self
+
+    def submit(self, alert):
+        """알림 추가 (블로킹 없음) - 큐에 들어가면 True"""
+        try:
+            self._queue.put_nowait(alert)
+            return True
+        except queue.Full:
+            self.dropped += 1
+            print(f"⚠️ 알림 큐가 가득 차 알림을 버렸습니다: {alert.get('type')}")
+            return False
+
+    def _run(self):
+        while True:
+            alert = self._queue.get()
+            if alert is None:
+                break
+            try:
+                self.handle(alert)
+            except Exception as e:
+                print(f"알림 처리 오류: {e}")
+
+    def handle(self, alert):
+        """알림 하나 처리 (디스패처 스레드)"""
+        if self.enable_audio and alert.get('type') == 'FALL':
+            self._audio.submit(self._play_sound)
+
+        if alert.get('severity') not in EMAIL_SEVERITIES:
+            return
+        if not self.enable_email or not self.recipients:
+            print(f"📧 (이메일 비활성) 응급 알림: {alert.get('message')} {alert.get('conditions', '')}")
+            return
+
+        subject, body = self.format_email(alert)
+        for recipient in self.recipients:
+            future = self._senders.submit(self._send_with_retry, recipient, subject, body)
+            future.add_done_callback(self._count_result)
+
+    def _count_result(self, future):
+        """발송 완료 콜백 - 성공/실패 집계"""
+        try:
+            sent = future.result()
+        except Exception as e:
+            print(f"이메일 발송 오류: {e}")
+            sent = False
+        with self._stats_lock:
+            if sent:
+                self.sent += 1
+            else:
+                self.failed += 1
+
+    def _play_sound(self):
+        try:
+            play_alert_sound()
+        except Exception as e:
+            print(f"알림음 재생 실패: {e}")
+
+    def format_email(self, alert):
+        """알림 → (제목, 본문)"""
+        camera = f" [카메라 {alert['camera_id']}]" if alert.get('camera_id') is not None else ""
+        when = datetime.fromtimestamp(alert.get('timestamp', time.time())).strftime('%Y-%m-%d %H:%M:%S')
+        subject = f"[노인 모니터링]{camera} {alert.get('message', alert.get('type'))}"
+        lines = [
+            f"알림 종류: {alert.get('type')}",
+            f"심각도: {alert.get('severity')}",
+            f"발생 시각: {when}",
+        ]
+        if alert.get('conditions'):
+            lines.append(f"감지 조건: {', '.join(alert['conditions'])}")
+        if alert.get('clip'):
+            lines.append(f"사고 전후 영상: {alert['clip']}")
+        lines.append("")
+        lines.append("즉시 상황을 확인해 주세요. 응급 상황이면 119에 신고하세요.")
+        return subject, "\n".join(lines)
+
+    def _send_with_retry(self, recipient, subject, body):
+        """수신자 한 명에게 발송 (실패 시 지수 백오프로 재시도)"""
+        import smtplib
+        from email.mime.text import MIMEText
+        message = MIMEText(body, 'plain', 'utf-8')
+        message['Subject'] = subject
+        message['From'] = self.email_config['EMAIL_ADDRESS']
+        message['To'] = recipient
+
+        for attempt in range(self.max_retries + 1):
+            conn = None
+            try:
+                conn = self._pool.acquire()
+                conn.sendmail(self.email_config['EMAIL_ADDRESS'], [recipient], message.as_string())
+                self._pool.release(conn)
+                print(f"📧 응급 이메일 발송 완료: {recipient}")
+                return True
+            except (smtplib.SMTPException, OSError) as e:
+                if conn is not None:
+                    self._pool.discard(conn)
+                if attempt == self.max_retries:
+                    print(f"이메일 발송 실패 ({recipient}): {e}")
+                    return False
+                time.sleep(self.backoff * (2 ** attempt))
+
+    def stop(self, timeout=10.0):
+        """남은 알림을 처리하고 진행 중인 발송(재시도 포함)이 끝날 때까지 기다린 뒤 종료"""
+        if self._thread is not None:
+            try:
+                self._queue.put(None, timeout=timeout)
+            except queue.Full:
+                pass
+            self._thread.join(timeout=timeout)
+            self._thread = None
+        self._senders.shutdown(wait=True)
+        self._audio.shutdown(wait=False)
+        self._pool.close()
@@ -2,6 +2,7 @@
 # -*- coding: utf-8 -*-
 """
 노인 활동 모니터링 - 데이터 분석 및 리포트 유틸리티
+- SQLite 저장소(monitoring.db)가 있으면 거주자/날짜 인덱스로 기간 조회, 저장소에 없는 날짜는 세션 JSON 파일 검색
 """
 
 import json
@@ -10,6 +11,10 @@ from datetime import datetime, timedelta
 import os
 from pathlib import Path
 
+from monitoring_config import DATA_CONFIG
+from monitoring_rollups import ACTIVITY_CLASSES
+from monitoring_store import ACTIVITY_COLUMNS, MonitoringQueries, day_start, prune_database
+
 # matplotlib은 선택적 import (없어도 기본 분석은 가능)
 try:
     import matplotlib.pyplot as plt
@@ -27,10 +32,11 @@ except ImportError:
     print("⚠️ pandas가 없습니다. 기본 분석만 수행합니다.")
 
 class MonitoringDataAnalyzer:
-    def __init__(self, data_directory="./monitoring_data"):
-        """데이터 분석기 초기화"""
+    def __init__(self, data_directory="./monitoring_data", db_path=None):
+        """데이터 분석기 초기화 (db_path: SQLite 저장소, 기본값은 데이터 폴더의 monitoring.db)"""
         self.data_dir = Path(data_directory)
         self.data_dir.mkdir(exist_ok=True)
+        self.db_path = Path(db_path) if db_path is not None else self.data_dir / "monitoring.db"
         
         # matplotlib 사용 가능한 경우 한글 폰트 설정
         if HAS_MATPLOTLIB:
@@ -67,25 +73,147 @@ class MonitoringDataAnalyzer:
         
         return sorted(session_files)
     
-    def analyze_daily_patterns(self, days_back=7):
-        """일일 활동 패턴 분석"""
-        session_files = self.get_all_session_files(days_back)
-        daily_data = []
-        
-        for file_path in session_files:
+    @property
+    def has_store(self):
+        return self.db_path.exists()
+
+    def _query_range(self, days_back):
+        """최근 N일 (오늘 포함) → (시작, 끝) epoch 초"""
+        end = datetime.now().timestamp()
+        return day_start(end - days_back * 86400), end
+
+    def query_events(self, days_back=7, resident=None, types=None):
+        """저장소의 최근 N일 알림 이벤트 (resident/types로 거르기)"""
+        start, end = self._query_range(days_back)
+        queries = MonitoringQueries(self.db_path)
+        try:
+            return queries.events(start, end, resident=resident, types=types)
+        finally:
+            queries.close()
+
+    def resident_summaries(self, days_back=7):
+        """저장소의 최근 N일 거주자별 요약 (활동 시간, 움직임, 낙상/알림 수) → 거주자 이름순 목록"""
+        start, end = self._query_range(days_back)
+        queries = MonitoringQueries(self.db_path)
+        try:
+            summaries = queries.resident_summaries(start, end)
+        finally:
+            queries.close()
+
+        results = []
+        for resident in sorted(summaries):
+            summary = summaries[resident]
+            observed = summary.get('movement_count') or 0
+            results.append({
+                'resident': resident,
+                'days': summary.get('days') or 0,
+                'avg_movement': summary['movement_sum'] / observed if observed else 0.0,
+                'max_movement': summary.get('movement_max') or 0.0,
+                'inactive_hours': (summary.get('inactive_sec') or 0.0) / 3600,
+                'longest_inactive_minutes': (summary.get('max_inactive') or 0.0) / 60,
+                'activity_hours': {name: (summary.get(column) or 0.0) / 3600
+                                   for name, column in zip(ACTIVITY_CLASSES, ACTIVITY_COLUMNS)},
+                'fall_incidents': summary['falls'],
+                'alerts': summary['alerts'],
+            })
+        return results
+
+    def _daily_patterns_from_store(self, days_back, resident=None):
+        """저장소 일 단위 집계 → {(거주자, 날짜): 일별 합계} (카메라는 합침)"""
+        start, end = self._query_range(days_back)
+        queries = MonitoringQueries(self.db_path)
+        try:
+            rows = queries.daily_activity(start, end, resident=resident)
+            falls = queries.events(start, end, resident=resident, types=['FALL'])
+        finally:
+            queries.close()
+
+        days = {}
+        for row in rows:
+            key = (row['resident'], datetime.fromtimestamp(row['day']).strftime("%Y-%m-%d"))
+            day = days.setdefault(key, self._empty_day())
+            seconds = [row[column] for column in ACTIVITY_COLUMNS]
+            day['duration'] += sum(seconds) / 60
+            day['total_movement'] += row['movement_sum']
+            day['movement_count'] += row['movement_count']
+            day['max_movement'] = max(day['max_movement'], row['movement_max'])
+            day['activity_sec'] = [a + b for a, b in zip(day['activity_sec'], seconds)]
+        for event in falls:
+            key = (event['resident'], datetime.fromtimestamp(event['ts']).strftime("%Y-%m-%d"))
+            if key in days:
+                days[key]['fall_incidents'] += 1
+        return days
+
+    def _daily_patterns_from_sessions(self, days_back, resident=None, covered=()):
+        """세션 JSON 파일 → {(거주자, 날짜): 일별 합계} (covered에 있는 거주자·날짜는 저장소 값을 쓰므로 건너뜀)"""
+        residents = DATA_CONFIG['STORE_RESIDENTS']
+        days = {}
+        for file_path in self.get_all_session_files(days_back):
             data = self.load_session_data(file_path.name)
-            if data and 'daily_report' in data:
-                report = data['daily_report']
-                daily_data.append({
-                    'date': report['date'],
-                    'duration': self._parse_duration(report['monitoring_duration']),
-                    'total_movement': report['total_movement_score'],
-                    'avg_movement': report['average_movement'],
-                    'max_movement': report['max_movement'],
-                    'activity': report['current_activity'],
-                    'fall_incidents': report['fall_incidents']
-                })
-        
+            if not data or 'daily_report' not in data:
+                continue
+            report = data['daily_report']
+            # 저장소와 같은 방식으로 카메라 ID → 거주자 이름
+            camera_id = data.get('session_info', {}).get('camera_id')
+            name = residents.get(camera_id, f"cam{camera_id if camera_id is not None else 0}")
+            key = (name, report['date'])
+            if (resident is not None and name != resident) or key in covered:
+                continue
+
+            day = days.setdefault(key, self._empty_day())
+            duration = self._parse_duration(report['monitoring_duration'])
+            count = data.get('activity_summary', {}).get('pose_frames') or 0
+            if not count and report['average_movement']:
+                count = report['total_movement_score'] / report['average_movement']
+            day['duration'] += duration
+            day['total_movement'] += report['total_movement_score']
+            day['movement_count'] += count
+            day['max_movement'] = max(day['max_movement'], report['max_movement'])
+            day['fall_incidents'] += report['fall_incidents']
+            # 세션 파일에는 종료 시점의 활동 상태만 있으므로 세션 길이만큼 그 상태로 봄
+            activity = report['current_activity']
+            if activity in ACTIVITY_CLASSES:
+                day['activity_sec'][ACTIVITY_CLASSES.index(activity)] += duration * 60
+        return days
+
+    @staticmethod
+    def _empty_day():
+        return {'duration': 0.0, 'total_movement': 0.0, 'movement_count': 0, 'max_movement': 0.0,
+                'activity_sec': [0.0] * len(ACTIVITY_CLASSES), 'fall_incidents': 0}
+
+    def analyze_daily_patterns(self, days_back=7, resident=None):
+        """일일 활동 패턴 분석 - 날짜별 한 행 (resident가 없으면 모든 거주자를 날짜별로 합침)
+
+        저장소(monitoring.db)가 있으면 저장소 일 집계를 쓰고, 저장소에 없는 거주자·날짜는
+        세션 JSON 파일로 채움 (저장소를 켜기 전에 기록한 기간도 리포트에 포함)
+        """
+        days = self._daily_patterns_from_store(days_back, resident) if self.has_store else {}
+        days.update(self._daily_patterns_from_sessions(days_back, resident, covered=days))
+
+        dates = {}
+        for (name, date), day in days.items():
+            merged = dates.setdefault(date, dict(self._empty_day(), residents=[]))
+            merged['residents'].append(name)
+            for column in ('duration', 'total_movement', 'movement_count', 'fall_incidents'):
+                merged[column] += day[column]
+            merged['max_movement'] = max(merged['max_movement'], day['max_movement'])
+            merged['activity_sec'] = [a + b for a, b in zip(merged['activity_sec'], day['activity_sec'])]
+
+        daily_data = []
+        for date in sorted(dates):
+            day = dates[date]
+            observed = day['activity_sec'][:ACTIVITY_CLASSES.index('미감지')]  # 사람이 보인 시간 중 가장 긴 활동 상태
+            daily_data.append({
+                'resident': resident if resident is not None else ', '.join(sorted(day['residents'])),
+                'date': date,
+                'duration': day['duration'],
+                'total_movement': day['total_movement'],
+                'avg_movement': day['total_movement'] / day['movement_count'] if day['movement_count'] else 0.0,
+                'max_movement': day['max_movement'],
+                'activity': ACTIVITY_CLASSES[int(np.argmax(observed))] if any(observed) else '미감지',
+                'fall_incidents': day['fall_incidents'],
+            })
+
         if HAS_PANDAS:
             return pd.DataFrame(daily_data)
         else:
@@ -304,10 +432,15 @@ class MonitoringDataAnalyzer:
                 continue
         
         print(f"🧹 {cleaned_count}개의 오래된 파일이 정리되었습니다.")
+
+        if self.has_store:
+            # 분 단위 집계와 이벤트만 삭제 (일 단위 집계는 장기 추이용으로 유지)
+            minutes, events = prune_database(self.db_path, cutoff_date.timestamp(), cutoff_date.timestamp())
+            print(f"🧹 저장소: 분 집계 {minutes}건, 이벤트 {events}건 정리")
     
-    def generate_weekly_summary(self, days_back=7):
-        """주간 요약 리포트 생성"""
-        data = self.analyze_daily_patterns(days_back)
+    def generate_weekly_summary(self, days_back=7, resident=None):
+        """주간 요약 리포트 생성 (resident: 저장소에서 거주자 한 명만)"""
+        data = self.analyze_daily_patterns(days_back, resident)
         
         # 데이터 타입에 따른 빈 데이터 체크
         is_empty = False
@@ -347,6 +480,15 @@ def main():
     
     analyzer = MonitoringDataAnalyzer()
     
+    # 거주자별 주간 요약 (SQLite 저장소가 있을 때)
+    if analyzer.has_store:
+        residents = analyzer.resident_summaries(days_back=7)
+        print(f"👥 거주자 {len(residents)}명 주간 요약")
+        for row in residents:
+            print(f"  {row['resident']}: {row['days']}일, 평균 움직임 {row['avg_movement']:.4f}, "
+                  f"비활성 {row['inactive_hours']:.1f}시간, 낙상 {row['fall_incidents']}회, 알림 {row['alerts']}건")
+        print()
+
     # 주간 요약 리포트 생성
     summary = analyzer.generate_weekly_summary(days_back=7)
     
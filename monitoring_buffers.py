@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+노인 활동 모니터링 - 고정 크기 버퍼
+- RingBuffer: 미리 할당한 NumPy 구조체 배열 기반 링 버퍼 (프레임마다 할당 없음)
+- RollingExtrema: 단조 덱(monotonic deque) 기반 이동 최솟값/최댓값 (프레임당 분할상환 O(1))
+- RollingStats: 누적 합 기반 이동 합계/평균/최댓값 (프레임당 O(1))
+"""
+
+import math
+from collections import deque
+
+import numpy as np
+
+# 활동 히스토리 한 프레임의 레코드 형식 (활동 중심점, 직전 프레임 대비 움직임)
+ACTIVITY_DTYPE = np.dtype([
+    ('center_x', 'f8'),
+    ('center_y', 'f8'),
+    ('timestamp', 'f8'),
+    ('movement', 'f8'),
+])
+
+
+class RingBuffer:
+    """미리 할당한 구조체 배열에 최근 capacity개의 레코드만 유지하는 링 버퍼"""
+
+    def __init__(self, capacity, dtype):
+        self.capacity = int(capacity)
+        self.dtype = np.dtype(dtype)
+        self._data = np.zeros(self.capacity, dtype=self.dtype)
+        self._next = 0    # 다음에 쓸 위치
+        self._count = 0   # 저장된 레코드 수 (최대 capacity)
+        self.total = 0    # 지금까지 추가된 전체 레코드 수
+
+    def __len__(self):
+        return self._count
+
+    def append(self, *values):
+        """레코드 추가 (필드 순서대로 값 전달) - 가득 차면 가장 오래된 레코드를 덮어씀"""
+        self._data[self._next] = values
+        self._next = (self._next + 1) % self.capacity
+        if self._count < self.capacity:
+            self._count += 1
+        self.total += 1
+
+    def __getitem__(self, index):
+        """index번째 레코드 (0이 가장 오래된 것, -1이 가장 최근 것)"""
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError('링 버퍼 인덱스 범위 초과')
+        return self._data[(self._next - self._count + index) % self.capacity]
+
+    def latest(self, n=None):
+        """최근 n개 레코드를 시간 순서대로 복사해서 반환 (n=None이면 전체)"""
+        n = self._count if n is None else min(n, self._count)
+        start = (self._next - n) % self.capacity
+        if start + n <= self.capacity:
+            return self._data[start:start + n].copy()
+        return np.concatenate((self._data[start:], self._data[:self._next]))
+
+    @property
+    def nbytes(self):
+        """미리 할당한 배열 크기 (바이트, 레코드 수와 무관하게 일정)"""
+        return self._data.nbytes
+
+    def clear(self):
+        self._next = 0
+        self._count = 0
+
+
+class RollingExtrema:
+    """최근 window개 값의 최솟값/최댓값을 단조 덱으로 유지 (NaN/무한대는 자리만 차지하고 비교에서 제외)"""
+
+    def __init__(self, window):
+        self.window = int(window)
+        self._max = deque()  # (순번, 값) - 값이 단조 감소
+        self._min = deque()  # (순번, 값) - 값이 단조 증가
+        self._index = 0
+
+    def push(self, value):
+        index = self._index
+        self._index += 1
+
+        if math.isfinite(value):  # NaN은 비교가 항상 거짓이라 덱에 남아 최댓값/최솟값을 망가뜨림
+            while self._max and self._max[-1][1] <= value:
+                self._max.pop()
+            self._max.append((index, value))
+            while self._min and self._min[-1][1] >= value:
+                self._min.pop()
+            self._min.append((index, value))
+
+        # 윈도우를 벗어난 값 제거
+        expired = index - self.window
+        if self._max and self._max[0][0] <= expired:
+            self._max.popleft()
+        if self._min and self._min[0][0] <= expired:
+            self._min.popleft()
+
+    def __len__(self):
+        return min(self._index, self.window)
+
+    @property
+    def full(self):
+        """윈도우가 가득 찼는지 여부"""
+        return self._index >= self.window
+
+    @property
+    def max(self):
+        return self._max[0][1] if self._max else 0
+
+    @property
+    def min(self):
+        return self._min[0][1] if self._min else 0
+
+    def range(self):
+        """윈도우 안의 최댓값 - 최솟값"""
+        return self.max - self.min
+
+    def clear(self):
+        self._max.clear()
+        self._min.clear()
+        self._index = 0
+
+
+class RollingStats:
+    """최근 window개 값의 합계/평균/최댓값을 프레임당 O(1)로 갱신하는 스트리밍 통계
+
+    합계는 값을 더하고 빼는 방식으로 유지하며, 부동소수점 오차가 쌓이지 않도록
+    window번 추가될 때마다 한 번씩 다시 합산합니다 (분할상환 O(1)).
+    NaN/무한대 값은 0으로 취급합니다.
+    """
+
+    def __init__(self, window):
+        self.window = int(window)
+        self._values = [0.0] * self.window
+        self._next = 0
+        self._count = 0
+        self._sum = 0.0
+        self._extrema = RollingExtrema(self.window)
+        self._since_resum = 0
+
+    def push(self, value):
+        value = float(value)
+        if not math.isfinite(value):
+            value = 0.0
+
+        if self._count == self.window:
+            self._sum -= self._values[self._next]
+        else:
+            self._count += 1
+        self._values[self._next] = value
+        self._sum += value
+        self._next = (self._next + 1) % self.window
+        self._extrema.push(value)
+
+        self._since_resum += 1
+        if self._since_resum >= self.window:
+            self._sum = math.fsum(self._values[:self._count])
+            self._since_resum = 0
+
+    def __len__(self):
+        return self._count
+
+    @property
+    def count(self):
+        return self._count
+
+    @property
+    def full(self):
+        """윈도우가 가득 찼는지 여부"""
+        return self._count == self.window
+
+    @property
+    def sum(self):
+        return self._sum
+
+    @property
+    def mean(self):
+        return self._sum / self._count if self._count else 0.0
+
+    @property
+    def max(self):
+        return self._extrema.max
+
+    @property
+    def min(self):
+        return self._extrema.min
+
+    def clear(self):
+        self._values = [0.0] * self.window
+        self._next = 0
+        self._count = 0
+        self._sum = 0.0
+        self._extrema.clear()
+        self._since_resum = 0
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+노인 활동 모니터링 - 낙상 전후 영상 클립 기록
+- 최근 pre_roll초의 프레임을 JPEG로 압축해 메모리 링 버퍼에 보관
+- max_bytes는 링 버퍼와 수집/저장 대기 중인 클립 프레임을 합친 상한 (같은 JPEG는 한 번만 계산)
+  → 초과하면 오래된 링 버퍼 프레임부터 버리고, 그래도 넘으면 수집 중인 클립을 거기까지만 저장
+- JPEG 인코딩은 워커 스레드에서 처리하고, 프레임 루프는 프레임 복사본을 큐에 넣기만 함
+  (큐가 가득 차면 그 프레임은 버림 - 프레임 루프는 절대 기다리지 않음)
+- 낙상 시 trigger() → 사고 전 pre_roll초 + 사고 후 post_roll초를 모아 백그라운드에서 MP4로 저장
+"""
+
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from monitoring_inference import DUE_TOLERANCE
+
+
+class ClipRecorder:
+    """카메라 하나의 사고 전후 클립 기록기"""
+
+    def __init__(self, output_dir, camera_id=None, fps=15, pre_roll=10.0, post_roll=10.0,
+                 max_bytes=64 * 1024 * 1024, jpeg_quality=70, queue_size=4):
+        """fps: 보관할 프레임 속도, pre_roll/post_roll: 사고 전/후 초,
+        max_bytes: JPEG 메모리 상한 (링 버퍼 + 클립), queue_size: 인코딩 대기 프레임 수 상한"""
+        self.output_dir = Path(output_dir)
+        self.camera_tag = f"cam{camera_id}" if camera_id is not None else "cam0"
+        self.fps = fps
+        self.pre_roll = pre_roll
+        self.post_roll = post_roll
+        self.max_bytes = max_bytes
+        self.encode_params = [cv2.IMWRITE_JPEG_QUALITY, jpeg_quality]
+
+        self._raw = queue.Queue(maxsize=queue_size)
+        self._frames = deque()  # (timestamp, JPEG 바이트)
+        self._bytes = 0           # 링 버퍼 + 클립이 잡고 있는 JPEG 바이트 수 (중복 제외)
+        self._refs = {}           # id(JPEG) → 참조 수 (링 버퍼 1 + 클립마다 1)
+        self._lock = threading.Lock()  # _bytes/_refs - 인코딩 스레드와 저장 스레드가 함께 갱신
+        self._last_added = None
+        self._triggers = deque()  # (timestamp, 경로)
+        self._active = []         # 모으는 중인 클립 {'path', 'start', 'end', 'frames'}
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='clip-writer')
+        self._thread = threading.Thread(target=self._run, name='clip-encoder', daemon=True)
+        self._thread.start()
+
+        # 통계
+        self.dropped = 0
+        self.clips_written = 0
+        self.clips_truncated = 0
+
+    def add_frame(self, frame, timestamp):
+        """프레임 추가 (프레임 루프에서 호출 - 복사 후 바로 반환, 인코딩은 워커 스레드)"""
+        if self._last_added is not None and timestamp - self._last_added < 1.0 / self.fps - DUE_TOLERANCE:
+            return
+        try:
+            self._raw.put_nowait((timestamp, frame.copy()))
+            self._last_added = timestamp
+        except queue.Full:
+            self.dropped += 1
+
+    def trigger(self, timestamp, label='fall'):
+        """사고 시각 기준 전후 클립 저장 예약 → 저장될 MP4 경로"""
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.fromtimestamp(timestamp).strftime('%Y%m%d_%H%M%S')
+        path = self.output_dir / f"{label}_{self.camera_tag}_{stamp}.mp4"
+        self._triggers.append((timestamp, path))
+        return str(path)
+
+    def _run(self):
+        while True:
+            item = self._raw.get()
+            if item is None:
+                break
+            timestamp, frame = item
+            ok, encoded = cv2.imencode('.jpg', frame, self.encode_params)
+            del frame
+            if ok:
+                self._store(timestamp, encoded.tobytes())
+        self._start_triggered()
+        for clip in self._active:
+            self._submit(clip)
+        self._active = []
+
+    def _hold(self, jpeg):
+        key = id(jpeg)
+        with self._lock:
+            count = self._refs.get(key, 0)
+            if count == 0:
+                self._bytes += len(jpeg)
+            self._refs[key] = count + 1
+
+    def _release(self, jpeg):
+        key = id(jpeg)
+        with self._lock:
+            count = self._refs[key] - 1
+            if count == 0:
+                del self._refs[key]
+                self._bytes -= len(jpeg)
+            else:
+                self._refs[key] = count
+
+    def _store(self, timestamp, jpeg):
+        """링 버퍼에 추가하고 오래된 프레임/메모리 초과분을 버림, 클립 수집 진행"""
+        self._frames.append((timestamp, jpeg))
+        self._hold(jpeg)
+        while self._frames and (self._frames[0][0] < timestamp - self.pre_roll or self._bytes > self.max_bytes):
+            _, old = self._frames.popleft()
+            self._release(old)
+
+        self._start_triggered()
+        finished = []
+        for clip in self._active:
+            if timestamp > clip['end']:
+                finished.append(clip)
+            elif self._bytes > self.max_bytes:  # 클립 프레임만으로 상한 초과 → 모은 데까지만 저장
+                self.clips_truncated += 1
+                print(f"⚠️ 클립 메모리 상한 초과 - 사고 후 영상을 {timestamp - clip['end'] + self.post_roll:.1f}초까지만 저장: {clip['path']}")
+                finished.append(clip)
+            elif not clip['frames'] or clip['frames'][-1][0] < timestamp:  # 방금 시작한 클립은 이미 포함
+                clip['frames'].append((timestamp, jpeg))
+                self._hold(jpeg)
+        for clip in finished:
+            self._active.remove(clip)
+            self._submit(clip)
+
+    def _start_triggered(self):
+        """새 트리거 → 링 버퍼에 남아 있는 사고 전 프레임으로 클립 수집 시작"""
+        while self._triggers:
+            timestamp, path = self._triggers.popleft()
+            start, end = timestamp - self.pre_roll, timestamp + self.post_roll
+            frames = [(ts, jpeg) for ts, jpeg in self._frames if start <= ts <= end]
+            for _, jpeg in frames:
+                self._hold(jpeg)
+            self._active.append({'path': path, 'start': start, 'end': end, 'frames': frames})
+
+    def _submit(self, clip):
+        if clip['frames']:
+            self._writer.submit(self._write_clip, clip['path'], clip['frames'])
+
+    def _write_clip(self, path, frames):
+        """JPEG 프레임 목록 → MP4 (백그라운드 스레드)"""
+        try:
+            first = cv2.imdecode(np.frombuffer(frames[0][1], np.uint8), cv2.IMREAD_COLOR)
+            height, width = first.shape[:2]
+            duration = frames[-1][0] - frames[0][0]
+            fps = (len(frames) - 1) / duration if len(frames) > 1 and duration > 0 else self.fps
+            writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*'mp4v'), fps, (width, height))
+            try:
+                for _, jpeg in frames:
+                    writer.write(cv2.imdecode(np.frombuffer(jpeg, np.uint8), cv2.IMREAD_COLOR))
+            finally:
+                writer.release()
+            self.clips_written += 1
+            print(f"🎬 사고 영상 저장: {path} ({len(frames)}프레임, {duration:.1f}초)")
+        except Exception as e:
+            print(f"사고 영상 저장 실패 ({path}): {e}")
+        finally:
+            for _, jpeg in frames:
+                self._release(jpeg)
+
+    def summary(self):
+        return {
+            'buffered_frames': len(self._frames),
+            'buffered_mb': round(self._bytes / (1024 * 1024), 2),
+            'max_mb': round(self.max_bytes / (1024 * 1024), 2),
+            'dropped': self.dropped,
+            'clips_written': self.clips_written,
+            'clips_truncated': self.clips_truncated,
+        }
+
+    def close(self, timeout=30.0):
+        """인코딩 대기 프레임을 처리하고 수집 중인 클립을 (지금까지 모인 만큼) 저장한 뒤 종료"""
+        self._raw.put(None)
+        self._thread.join(timeout=timeout)
+        self._writer.shutdown(wait=True)
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+노인 활동 모니터링 - 교체 가능한 시계
+감지 로직(낙상 쿨다운, 비활성 시간, 건강 알림, 세션 시간)은 모두 clock.now()로 시각을 읽습니다.
+- WallClock: 실제 시각 (실시간 카메라)
+- SimulatedClock: 직접 설정/진행하는 시각 (녹화 영상의 프레임 타임스탬프, 테스트, 가속 시뮬레이션)
+
+예) 하루치 프레임을 몇 초 만에 시뮬레이션:
+    clock = SimulatedClock(start=datetime(2025, 1, 1).timestamp())
+    system = ElderlyMonitoringSystem(clock=clock, headless=True, enable_alerts=False)
+    for landmarks in frames:
+        clock.advance(1 / 30)
+        system.analyze_frame(landmarks)
+"""
+
+import time
+from datetime import datetime
+
+
+class WallClock:
+    """실제 시각"""
+
+    def now(self):
+        """현재 시각 (epoch 초)"""
+        return time.time()
+
+    def datetime(self):
+        return datetime.fromtimestamp(self.now())
+
+
+class SimulatedClock(WallClock):
+    """직접 설정하거나 진행시키는 시각 (프레임 타임스탬프 / 시뮬레이션용)"""
+
+    def __init__(self, start=0.0):
+        self._now = float(start)
+
+    def now(self):
+        return self._now
+
+    def set(self, timestamp):
+        """프레임 타임스탬프 등으로 시각 설정"""
+        self._now = float(timestamp)
+
+    def advance(self, seconds):
+        """시각을 seconds만큼 진행"""
+        self._now += seconds
+        return self._now
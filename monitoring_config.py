@@ -1,6 +1,12 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
-# 노인 활동 모니터링 시스템 설정 파일
+"""
+노인 활동 모니터링 시스템 설정 파일
+
+추론을 건너뛰거나 입력을 줄이는 기능(MOTION_GATE, ADAPTIVE_RATE, PREDICTOR, ROI, AUTOSCALE)의 기본값은
+monitoring_fall_benchmark.py에서 낙상 재현율과 감지 지연이 매 프레임 추론과 같게 나온 것만 켜 둡니다.
+관련 설정을 바꾸면 벤치마크를 다시 실행하세요.
+"""
 
 # 기본 설정
 SYSTEM_CONFIG = {
@@ -8,20 +14,97 @@ SYSTEM_CONFIG = {
     'CAMERA_WIDTH': 640,
     'CAMERA_HEIGHT': 480,
     'CAMERA_FPS': 30,
+    'FRAME_RING_SLOTS': 8,  # 캡처 프로세스 → 추론 공유 메모리 프레임 슬롯 수 (640x480 기준 슬롯당 약 0.9MB)
     
     # MediaPipe 설정
     'MIN_DETECTION_CONFIDENCE': 0.5,
     'MIN_TRACKING_CONFIDENCE': 0.5,
     'MODEL_COMPLEXITY': 1,  # 0(라이트), 1(일반), 2(정확)
     
+    # 움직임 게이트 - 변화가 없는 프레임은 pose 추론을 건너뛰고 직전 랜드마크 재사용
+    'MOTION_GATE_ENABLED': True,
+    'MOTION_GATE_WIDTH': 160,            # 비교용 축소 폭 (px)
+    'MOTION_GATE_PIXEL_THRESHOLD': 25,   # 변화로 보는 밝기 차이 (0~255)
+    'MOTION_GATE_MIN_CHANGED': 0.005,    # 추론을 여는 변화 픽셀 비율
+    'MOTION_GATE_FORCE_INTERVAL': 2.0,   # 변화가 없어도 강제로 추론하는 간격 (초)
+    
+    # 활동 상태별 pose 추론 속도 (fps) - 휴식 중에는 낮추고 낙상 징후가 보이면 즉시 최대 속도
+    'ADAPTIVE_RATE_ENABLED': True,
+    'INFERENCE_RATES': {
+        '휴식 중': 5,
+        '조용한 활동': 10,
+        '보통 활동': 20,
+        '활발한 활동': 30,
+    },
+    'INFERENCE_FULL_RATE': 30,           # 알 수 없음 / 낙상 징후 시 추론 속도
+    'INFERENCE_BOOST_HOLD': 3.0,         # 낙상 징후 후 최대 속도 유지 시간 (초)
+    'INFERENCE_BOOST_INCLINATION': 30,   # 몸 기울기가 이 각도 이상이면 최대 속도
+    'INFERENCE_BOOST_MOVEMENT': 0.02,    # 프레임당 움직임 점수가 이 이상이면 최대 속도
+    'INFERENCE_BOOST_MOTION': 0.05,      # 움직임 게이트 변화 픽셀 비율이 이 이상이면 최대 속도
+    
+    # 랜드마크 예측 - PREDICTOR_INTERVAL 프레임마다만 추론하고 사이 프레임은 등속 칼만 필터로 예측
+    'PREDICTOR_ENABLED': True,
+    'PREDICTOR_INTERVAL': 2,               # 실제 추론 간격 (프레임, 1이면 매 프레임)
+    'PREDICTOR_MAX_ERROR': 0.02,           # 예측 오차(정규화 좌표 평균)가 이보다 크면 다음 프레임도 추론
+    'PREDICTOR_PROCESS_NOISE': 5.0,        # 가속도 잡음 세기 (클수록 측정값을 더 믿음)
+    'PREDICTOR_MEASUREMENT_NOISE': 1e-5,   # 랜드마크 측정 잡음 분산
+    'PREDICTOR_MAX_HORIZON': 0.2,          # 최대 외삽 시간 (초) - 이후에는 위치 유지
+    
+    # 사람 영역(ROI)만 잘라서 추론 - 추적을 놓치면 전체 프레임으로 복귀
+    'ROI_ENABLED': True,
+    'ROI_PADDING': 0.3,        # 사람 크기 대비 여유 비율
+    'ROI_INPUT_SIZE': 256,     # 잘라낸 영역을 축소할 추론 입력 크기 (px)
+    'ROI_MIN_VISIBLE': 8,      # 추적 유지에 필요한 보이는 랜드마크 수
+    'ROI_MIN_SIZE': 0.3,       # 최소 영역 크기 (프레임 짧은 변 대비)
+    
+    # 추론 품질 자동 조절 - 추론 지연이 예산을 넘으면 model_complexity / 입력 해상도를 낮춤
+    'AUTOSCALE_ENABLED': False,  # model_complexity 0의 검출 정확도는 합성 벤치마크로 잴 수 없어 현장 리플레이 후 켬
+    'AUTOSCALE_BUDGET_MS': 33,     # 추론(색 변환 + pose) 1회 목표 시간 (ms)
+    'AUTOSCALE_LEVELS': [          # (model_complexity, 입력 배율) - 품질이 높은 순서
+        (1, 1.0),
+        (1, 0.75),
+        (0, 0.75),
+        (0, 0.5),
+    ],
+    'AUTOSCALE_WINDOW': 30,        # 판단에 쓰는 최근 추론 횟수 (p95 기준)
+    'AUTOSCALE_HEADROOM': 0.6,     # p95가 예산 × 이 값 아래면 한 단계 올림
+    'AUTOSCALE_MIN_DWELL': 5.0,    # 단계 변경 후 최소 유지 시간 (초)
+    
+    # 다인실 모드 - 사람 검출기로 찾은 거주자마다 추적 ID를 붙이고 영역별로 pose 추론
+    'MULTI_RESIDENT_MAX': 4,                  # 동시에 추적할 최대 인원 (거주자당 Pose 인스턴스 1개)
+    'MULTI_RESIDENT_DETECTOR': 'yolov8n.pt',  # ultralytics YOLO 가중치 (미설치 시 OpenCV HOG)
+    'MULTI_RESIDENT_DETECT_WIDTH': 320,       # 사람 검출 입력 크기 (px)
+    'MULTI_RESIDENT_DETECT_INTERVAL': 1.0,    # 모두 추적 중일 때 사람 검출 간격 (초)
+    'MULTI_RESIDENT_SEARCH_INTERVAL': 0.25,   # 놓친 사람이 있을 때 사람 검출 간격 (초)
+    'MULTI_RESIDENT_TRACK_TIMEOUT': 3.0,      # 이 시간 동안 보이지 않으면 추적 종료 (초)
+    'MULTI_RESIDENT_IOU': 0.3,                # 검출 박스와 추적 중인 사람을 같은 사람으로 보는 IoU
+    'MULTI_RESIDENT_WORKERS': 2,              # 거주자별 pose 추론 스레드 수
+    
+    # 분/시간/일 활동 집계 (리포트용) - 단계별로 보관할 완료 버킷 수
+    'ROLLUP_MINUTES': 1440,   # 24시간 분 단위
+    'ROLLUP_HOURS': 168,      # 7일 시간 단위
+    'ROLLUP_DAYS': 31,
+    'ROLLUP_MAX_GAP': 1.0,    # 프레임 간격이 이보다 길면 (카메라 끊김) 이 시간까지만 집계 (초)
+    
     # 히스토리 설정
-    'POSE_HISTORY_SIZE': 300,     # 10초간 자세 데이터 (30fps)
     'ACTIVITY_HISTORY_SIZE': 1800, # 1분간 활동 데이터
     
     # 알림 설정
     'ENABLE_AUDIO_ALERTS': True,
     'ENABLE_EMAIL_ALERTS': False,  # 실제 환경에서만 사용
     'ALERT_COOLDOWN': 10,  # 중복 알림 방지 시간(초)
+    
+    # 헤드리스(서버) 모드 - 화면 없이 감지/저장만 수행
+    'HEADLESS': False,
+    'CONTROL_HOST': '127.0.0.1',  # 명령 소켓 주소 (로컬 전용)
+    'CONTROL_PORT': 8765,         # 명령 소켓 포트 (None이면 시그널로만 제어)
+    
+    # 실시간 보기 - 주석이 그려진 프레임을 로컬 HTTP MJPEG로 제공
+    'LIVE_VIEW_ENABLED': False,
+    'LIVE_VIEW_HOST': '127.0.0.1',  # 로컬 전용 (외부 공개 시 인증 프록시 뒤에 둘 것)
+    'LIVE_VIEW_PORT': 8080,         # 카메라 번호만큼 더해서 사용
+    'LIVE_VIEW_FPS': 15,            # 최대 인코딩 속도
+    'LIVE_VIEW_JPEG_QUALITY': 70,
 }
 
 # 임계값 설정
@@ -156,6 +239,7 @@ LOGGING_CONFIG = {
 UI_CONFIG = {
     'WINDOW_TITLE': '노인 활동 모니터링 시스템',
     'SHOW_FPS': True,
+    'SHOW_STAGE_LATENCY': False,  # 단계별 p50/p95/p99 오버레이 ('t' 키로 전환)
     'SHOW_TIMESTAMP': True,
     'OVERLAY_OPACITY': 0.7,
     'INFO_PANEL_WIDTH': 400,
@@ -181,5 +265,24 @@ DATA_CONFIG = {
     'DATA_RETENTION_DAYS': 30,  # 30일간 데이터 보관
     'EXPORT_FORMAT': 'json',  # json, csv
     'BACKUP_ENABLED': True,
-    'BACKUP_LOCATION': './backups/'
+    'BACKUP_LOCATION': './backups/',
+    
+    # 프레임 단위 세션 로그 (추가 전용, 날짜별 파일)
+    'SESSION_LOG_ENABLED': True,
+    'SESSION_LOG_DIR': './monitoring_data/',
+    
+    # 낙상 전후 영상 클립 (최근 프레임을 JPEG로 메모리에 보관하다가 낙상 시 MP4 저장)
+    'CLIP_ENABLED': True,
+    'CLIP_DIR': './monitoring_data/clips/',
+    'CLIP_PRE_ROLL': 10,        # 낙상 전 초
+    'CLIP_POST_ROLL': 10,       # 낙상 후 초
+    'CLIP_FPS': 15,             # 보관 프레임 속도
+    'CLIP_JPEG_QUALITY': 70,
+    'CLIP_MAX_MEMORY_MB': 64,   # 카메라당 JPEG 버퍼 메모리 상한
+
+    # SQLite 이벤트/활동 집계 저장소 (WAL, 백그라운드 일괄 기록)
+    'STORE_ENABLED': True,
+    'STORE_PATH': './monitoring_data/monitoring.db',
+    'STORE_FLUSH_INTERVAL': 5,      # 모아서 기록하는 주기 (초)
+    'STORE_RESIDENTS': {},          # 카메라 ID → 거주자 이름 (없으면 'cam<ID>')
 }
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+노인 활동 모니터링 - 헤드리스 모드 명령 채널
+화면과 키보드가 없는 서버(NUC 등)에서 키 입력 대신 사용합니다.
+- 시그널: SIGUSR1 → report, SIGUSR2 → save, SIGINT/SIGTERM → quit
+- 로컬 TCP 소켓: 한 줄에 명령 하나 (report, status, save, quit)
+
+사용 예:
+    kill -USR1 <pid>
+    echo report | nc 127.0.0.1 8765
+"""
+
+import queue
+import signal
+import socketserver
+import threading
+
+COMMANDS = ('report', 'status', 'save', 'quit')
+REPLY_TIMEOUT = 5.0  # 모니터링 루프가 명령을 처리할 때까지 기다리는 시간(초)
+
+
+class _CommandHandler(socketserver.StreamRequestHandler):
+    """소켓 연결 하나 - 줄 단위로 명령을 받아 응답"""
+
+    def handle(self):
+        for raw in self.rfile:
+            command = raw.decode('utf-8', errors='ignore').strip().lower()
+            if not command:
+                continue
+            reply = self.server.channel.submit(command, wait=True)
+            self.wfile.write((reply + '\n').encode('utf-8'))
+            if command == 'quit':
+                break
+
+
+class _CommandServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class CommandChannel:
+    """시그널/소켓으로 들어온 명령을 모니터링 루프로 전달하는 채널
+
+    명령은 큐에 쌓이고, 모니터링 루프가 프레임 사이에 poll()로 꺼내 실행합니다.
+    (분석 상태는 항상 모니터링 루프 스레드에서만 변경됩니다)
+    """
+
+    def __init__(self, host='127.0.0.1', port=None):
+        self.host = host
+        self.port = port
+        self._commands = queue.Queue()
+        self._server = None
+        self._server_thread = None
+
+    def submit(self, command, wait=False):
+        """명령 추가 (wait=True면 처리 결과 문자열을 기다려 반환)"""
+        if command not in COMMANDS:
+            return f"unknown command: {command} (사용 가능: {', '.join(COMMANDS)})"
+        reply_queue = queue.Queue(maxsize=1) if wait else None
+        self._commands.put((command, reply_queue))
+        if reply_queue is None:
+            return 'accepted'
+        try:
+            return reply_queue.get(timeout=REPLY_TIMEOUT)
+        except queue.Empty:
+            return 'timeout'
+
+    def poll(self):
+        """대기 중인 (명령, 응답 큐) 목록을 모두 꺼냄 (블로킹 없음)"""
+        pending = []
+        while True:
+            try:
+                pending.append(self._commands.get_nowait())
+            except queue.Empty:
+                return pending
+
+    def dispatch(self, execute):
+        """대기 중인 명령을 execute(command) → 응답 문자열 로 실행"""
+        for command, reply_queue in self.poll():
+            try:
+                reply = execute(command)
+            except Exception as e:
+                reply = f"error: {e}"
+            if reply_queue is not None:
+                reply_queue.put(reply if reply is not None else 'ok')
+
+    def install_signal_handlers(self):
+        """시그널 → 명령 연결 (메인 스레드에서만 가능)"""
+        if threading.current_thread() is not threading.main_thread():
+            return False
+        mapping = {
+            'SIGUSR1': 'report',
+            'SIGUSR2': 'save',
+            'SIGTERM': 'quit',
+            'SIGINT': 'quit',
+        }
+        for name, command in mapping.items():
+            signum = getattr(signal, name, None)  # Windows에는 SIGUSR1/2가 없음
+            if signum is not None:
+                signal.signal(signum, lambda *_args, command=command: self.submit(command))
+        return True
+
+    def start(self):
+        """로컬 명령 소켓 시작 (port가 None이면 시그널만 사용)"""
+        if self.port is None:
+            return
+        try:
+            self._server = _CommandServer((self.host, self.port), _CommandHandler)
+        except OSError as e:
+            print(f"명령 소켓을 열 수 없습니다 ({self.host}:{self.port}): {e}")
+            return
+        self._server.channel = self
+        self._server_thread = threading.Thread(
+            target=self._server.serve_forever, name='monitoring-control', daemon=True
+        )
+        self._server_thread.start()
+        print(f"🔌 명령 소켓 대기 중: {self.host}:{self._server.server_address[1]}")
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
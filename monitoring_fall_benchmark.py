@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+노인 활동 모니터링 - 추론 생략/경량화 기능별 낙상 감지 벤치마크 (합성 장면)
+- 정답 낙상 시각을 아는 합성 장면(정지 → 낙상, 걷다가 낙상, 천천히 주저앉음, 허리 굽히기)을 만들어
+  기능을 하나씩 켠 ElderlyMonitoringSystem.process_frame으로 프레임마다 처리
+- 사람은 회색 팔다리 + 관절마다 색 표식으로 그리고, 표식 색을 찾는 자세 추정기가 pose.process를 대신함
+  → 움직임 게이트(픽셀 차이), ROI(잘라낸 영역), 자동 조절(축소 입력)이 실제 픽셀을 보고 동작
+- 기능별로 낙상 재현율, 낙상 시작부터 알림까지 지연, 기준(모두 끔) 대비 추가 지연, 오경보, pose 호출 비율 비교
+
+합성 장면은 MediaPipe 정확도(특히 model_complexity 0)를 재현하지 않습니다. 기능이 추론을 건너뛰거나
+입력을 줄여서 생기는 지연/누락만 측정하므로, 설치 전에는 현장 녹화 영상으로
+monitoring_replay.py / monitoring_predictor_benchmark.py 결과도 확인하세요.
+
+사용 예:
+    python monitoring_fall_benchmark.py --repeats 4 --output fall_benchmark.json
+"""
+
+import json
+import math
+import time
+from types import SimpleNamespace
+
+import cv2
+import numpy as np
+
+from monitoring_landmarks import (LANDMARK_FIELDS, LEFT_ANKLE, LEFT_HIP, LEFT_SHOULDER, LEFT_WRIST, NOSE,
+                                  NUM_LANDMARKS, RIGHT_ANKLE, RIGHT_HIP, RIGHT_SHOULDER, RIGHT_WRIST, VISIBILITY)
+
+FPS = 30.0
+FRAME_SHAPE = (480, 640)
+LEFT_ELBOW, RIGHT_ELBOW, LEFT_KNEE, RIGHT_KNEE = 13, 14, 25, 26
+MARKERS = (NOSE, LEFT_SHOULDER, RIGHT_SHOULDER, LEFT_ELBOW, RIGHT_ELBOW, LEFT_WRIST, RIGHT_WRIST,
+           LEFT_HIP, RIGHT_HIP, LEFT_KNEE, RIGHT_KNEE, LEFT_ANKLE, RIGHT_ANKLE)
+LIMBS = ((LEFT_SHOULDER, RIGHT_SHOULDER), (LEFT_HIP, RIGHT_HIP), (LEFT_SHOULDER, LEFT_HIP),
+         (RIGHT_SHOULDER, RIGHT_HIP), (LEFT_SHOULDER, LEFT_ELBOW), (LEFT_ELBOW, LEFT_WRIST),
+         (RIGHT_SHOULDER, RIGHT_ELBOW), (RIGHT_ELBOW, RIGHT_WRIST), (LEFT_HIP, LEFT_KNEE),
+         (LEFT_KNEE, LEFT_ANKLE), (RIGHT_HIP, RIGHT_KNEE), (RIGHT_KNEE, RIGHT_ANKLE))
+
+# 표식 색: 색상(hue)을 고르게 나눈 채도 높은 색 - 배경과 팔다리는 무채색
+_HUE_STEP = 180 / len(MARKERS)
+_PALETTE = cv2.cvtColor(np.array([[[round(i * _HUE_STEP), 255, 255] for i in range(len(MARKERS))]], np.uint8),
+                        cv2.COLOR_HSV2BGR)[0]
+
+# 기능별 설정 (나머지 기능은 모두 끔) - 'baseline'은 매 프레임 전체 해상도 추론
+FEATURES = ('motion_gate', 'adaptive_rate', 'predictor', 'roi', 'autoscale')
+_SUMMARY_KEYS = {'motion_gate': 'motion_gate', 'adaptive_rate': 'inference_rate', 'predictor': 'predictor',
+                 'roi': 'roi', 'autoscale': 'autoscale'}  # inference_summary() 항목
+
+
+def ease(a, b, progress, power=1.0):
+    progress = min(max(progress, 0.0), 1.0) ** power
+    return a + (b - a) * progress
+
+
+def skeleton(hip_x, hip_y, height, angle, bend=0.0, swing=0.0):
+    """몸 자세 → {랜드마크: (x, y) 픽셀}
+
+    angle: 엉덩이를 축으로 몸 전체가 기운 각도(도, 0이면 서 있음), bend: 상체만 더 숙인 각도,
+    swing: 걸을 때 팔다리가 앞뒤로 흔들리는 각도, height: 키(px)
+    """
+    def direction(degrees, up):
+        r = math.radians(degrees)
+        return np.array([math.sin(r), -math.cos(r)]) * (1 if up else -1)
+
+    hip = np.array([hip_x, hip_y])
+    up = direction(angle + bend, True)
+    side = np.array([-up[1], up[0]])       # 어깨 방향
+    hip_side = np.array([math.cos(math.radians(angle)), math.sin(math.radians(angle))])
+    shoulder = hip + up * 0.30 * height
+    points = {
+        NOSE: shoulder + up * 0.12 * height,
+        LEFT_SHOULDER: shoulder - side * 0.11 * height,
+        RIGHT_SHOULDER: shoulder + side * 0.11 * height,
+        LEFT_HIP: hip - hip_side * 0.07 * height,
+        RIGHT_HIP: hip + hip_side * 0.07 * height,
+    }
+    for sign, (shoulder_id, elbow, wrist) in ((-1, (LEFT_SHOULDER, LEFT_ELBOW, LEFT_WRIST)),
+                                              (1, (RIGHT_SHOULDER, RIGHT_ELBOW, RIGHT_WRIST))):
+        arm = direction(angle + bend + sign * 8 - sign * swing, False)
+        points[elbow] = points[shoulder_id] + arm * 0.17 * height
+        points[wrist] = points[elbow] + arm * 0.15 * height
+    for sign, (hip_id, knee, ankle) in ((-1, (LEFT_HIP, LEFT_KNEE, LEFT_ANKLE)),
+                                        (1, (RIGHT_HIP, RIGHT_KNEE, RIGHT_ANKLE))):
+        leg = direction(angle + sign * swing, False)
+        points[knee] = points[hip_id] + leg * 0.25 * height
+        points[ankle] = points[knee] + leg * 0.25 * height
+    return points
+
+
+class Scenario:
+    """합성 장면 하나: 시각 → 자세, 정답 낙상 시작 시각 목록"""
+
+    def __init__(self, name, duration, pose_at, falls, seed):
+        self.name = name
+        self.duration = duration
+        self.pose_at = pose_at     # t(초) → skeleton() 인자 dict
+        self.falls = falls         # [(시작 시각, 낙상 동작 시간)]
+        self.seed = seed
+
+    def frames(self):
+        """(시각, BGR 프레임) - 정지 배경 + 사람 + 센서 노이즈"""
+        rng = np.random.default_rng(self.seed)
+        height, width = FRAME_SHAPE
+        texture = rng.uniform(50, 120, (12, 16)).astype(np.float32)
+        background = cv2.resize(texture, (width, height), interpolation=cv2.INTER_CUBIC)
+        background = np.repeat(np.clip(background, 0, 255).astype(np.uint8)[:, :, None], 3, axis=2)
+        noise = [rng.normal(0, 3, FRAME_SHAPE).astype(np.int16) for _ in range(8)]
+
+        for index in range(int(self.duration * FPS)):
+            t = index / FPS
+            points = skeleton(**self.pose_at(t))
+            body = float(np.linalg.norm(points[NOSE] - points[LEFT_ANKLE]))
+            limb_width = max(3, round(body * 0.035))
+            frame = background.copy()
+            for a, b in LIMBS:
+                cv2.line(frame, _px(points[a]), _px(points[b]), (185, 185, 185), limb_width, cv2.LINE_AA)
+            cv2.circle(frame, _px(points[NOSE]), max(4, round(body * 0.05)), (185, 185, 185), -1, cv2.LINE_AA)
+            for marker, color in zip(MARKERS, _PALETTE):
+                cv2.circle(frame, _px(points[marker]), max(3, round(body * 0.014)), color.tolist(), -1, cv2.LINE_AA)
+            frame = np.clip(frame.astype(np.int16) + noise[index % len(noise)][:, :, None], 0, 255).astype(np.uint8)
+            yield t, frame
+
+
+def _px(point):
+    return int(round(point[0])), int(round(point[1]))
+
+
+def build_scenarios(repeats=4):
+    """정지 → 낙상 / 걷다가 낙상 / 천천히 주저앉음 / 허리 굽히기(낙상 아님) × repeats (위치, 방향, 속도 변경)"""
+    floor = FRAME_SHAPE[0] - 30
+    scenarios = []
+    for repeat in range(repeats):
+        rng = np.random.default_rng(1000 + repeat)
+        sign = 1 if repeat % 2 == 0 else -1
+        height = rng.uniform(0.55, 0.8) * FRAME_SHAPE[0]
+        x = FRAME_SHAPE[1] * rng.uniform(0.35, 0.65)
+        stand_y, lie_y = floor - 0.5 * height, floor - 0.06 * height
+
+        def rest_then_fall(rest, fall, x=x, height=height, sign=sign, stand_y=stand_y, lie_y=lie_y):
+            def pose_at(t):
+                sway = 0.6 * math.sin(2 * math.pi * 0.2 * t)  # 숨쉬기 정도의 흔들림 (px)
+                progress = (t - rest) / fall
+                return dict(hip_x=x + sway + ease(0, sign * 0.25 * height, progress), height=height,
+                            hip_y=ease(stand_y, lie_y, progress, power=2.0),  # 중력: 처음엔 느리고 점점 빠르게
+                            angle=ease(0, sign * 88, progress, power=1.5))
+            return pose_at
+
+        fall_time = (0.35, 0.5, 0.7, 0.9)[repeat % 4]
+        scenarios.append(Scenario(f"rest_fall_{repeat}", 18.0, rest_then_fall(12.0, fall_time),
+                                  [(12.0, fall_time)], seed=repeat))
+        scenarios.append(Scenario(f"slow_collapse_{repeat}", 16.0, rest_then_fall(8.0, 1.4),
+                                  [(8.0, 1.4)], seed=100 + repeat))
+
+        walk_start = FRAME_SHAPE[1] * (0.25 if sign > 0 else 0.75)
+        walk_fall_at = 6.0
+        walk_speed = FRAME_SHAPE[1] * 0.4 / walk_fall_at  # 화면 폭의 40%를 걸은 뒤 낙상 (px/초)
+
+        def walk_then_fall(t, height=height, sign=sign, start=walk_start, stand_y=stand_y, lie_y=lie_y):
+            walked = min(t, walk_fall_at)
+            hip_x = start + sign * walk_speed * walked
+            progress = (t - walk_fall_at) / 0.5
+            swing = 20 * math.sin(2 * math.pi * 0.9 * walked) * (1 - min(max(progress, 0), 1))
+            return dict(hip_x=hip_x + ease(0, sign * 0.25 * height, progress), height=height,
+                        hip_y=ease(stand_y, lie_y, progress, power=2.0) + abs(swing) * 0.1,
+                        angle=ease(0, sign * 88, progress, power=1.5), swing=swing)
+        scenarios.append(Scenario(f"walk_fall_{repeat}", 12.0, walk_then_fall,
+                                  [(walk_fall_at, 0.5)], seed=200 + repeat))
+
+        def bend_pickup(t, x=x, height=height, sign=sign, stand_y=stand_y):
+            # 4초 서 있음 → 1.5초 동안 상체 55도 숙임 → 1초 유지 → 1.5초 동안 폄
+            bend = ease(0, 55, (t - 4.0) / 1.5) if t < 6.5 else ease(55, 0, (t - 6.5) / 1.5)
+            return dict(hip_x=x, hip_y=stand_y, height=height, angle=0.0, bend=sign * bend)
+        scenarios.append(Scenario(f"bend_pickup_{repeat}", 12.0, bend_pickup, [], seed=300 + repeat))
+    return scenarios
+
+
+class MarkerPoseEstimator:
+    """색 표식으로 관절 위치를 찾는 pose.process 대용 (PoseEstimator와 같은 process / set_complexity)
+
+    입력(RGB, 전체 프레임 / ROI / 축소 영상) 기준 정규화 좌표를 돌려줍니다.
+    pose_ms > 0이면 느린 컴퓨터를 흉내 내어 그만큼 기다립니다 (자동 조절기가 반응하도록):
+    complexity 0은 60%, 입력 픽셀 수가 줄면 절반만큼 비례해서 줄어듦.
+    """
+
+    def __init__(self, pose_ms=0.0, min_markers=6):
+        self.pose_ms = pose_ms
+        self.min_markers = min_markers
+        self.model_complexity = 1
+        self.calls = 0
+
+    def set_complexity(self, model_complexity):
+        self.model_complexity = model_complexity
+
+    def process(self, image):
+        self.calls += 1
+        if self.pose_ms > 0:
+            pixels = image.shape[0] * image.shape[1] / (FRAME_SHAPE[0] * FRAME_SHAPE[1])
+            factor = (0.6 if self.model_complexity == 0 else 1.0) * (0.5 + 0.5 * pixels)
+            time.sleep(self.pose_ms * factor / 1000.0)
+        return SimpleNamespace(pose_landmarks=self.find_markers(image))
+
+    def find_markers(self, image):
+        height, width = image.shape[:2]
+        hsv = cv2.cvtColor(image, cv2.COLOR_RGB2HSV)
+        ys, xs = np.nonzero((hsv[:, :, 1] > 120) & (hsv[:, :, 2] > 80))  # 채도 높은 표식 픽셀
+        if len(xs) == 0:
+            return None
+        labels = np.rint(hsv[ys, xs, 0] / _HUE_STEP).astype(np.intp) % len(MARKERS)
+        counts = np.bincount(labels, minlength=len(MARKERS))
+        found = counts >= 2
+        if np.count_nonzero(found) < self.min_markers:
+            return None
+        sums_x = np.bincount(labels, weights=xs + 0.5, minlength=len(MARKERS))
+        sums_y = np.bincount(labels, weights=ys + 0.5, minlength=len(MARKERS))
+
+        landmarks = np.zeros((NUM_LANDMARKS, LANDMARK_FIELDS), np.float32)
+        centers = np.stack([sums_x / np.maximum(counts, 1) / width, sums_y / np.maximum(counts, 1) / height], axis=1)
+        landmarks[:, :2] = centers[found].mean(axis=0)  # 보이지 않는 관절은 몸 중심 (visibility 0)
+        for index, marker in enumerate(MARKERS):
+            if found[index]:
+                landmarks[marker, :2] = centers[index]
+                landmarks[marker, VISIBILITY] = 0.99
+        return SimpleNamespace(landmark=[SimpleNamespace(x=float(x), y=float(y), z=float(z), visibility=float(v))
+                                         for x, y, z, v in landmarks])
+
+
+def run_scenario(scenario, feature=None, slow_pose_ms=50.0):
+    """장면 하나를 기능 하나만 켜고 처리 → (낙상 알림 시각 목록, pose 호출 수, 프레임 수, 기능 요약)"""
+    from elderly_monitoring_system import ElderlyMonitoringSystem
+    from monitoring_clock import SimulatedClock
+
+    start = 1000.0  # 시스템의 낙상 쿨다운(마지막 낙상 0초 기준)에 걸리지 않게
+    clock = SimulatedClock(start=start)
+    flags = {f'enable_{name}': name == feature for name in FEATURES}
+    system = ElderlyMonitoringSystem(camera_id=scenario.name, headless=True, clock=clock, enable_alerts=False,
+                                     enable_session_log=False, enable_clips=False, enable_live_view=False,
+                                     enable_store=False, **flags)
+    falls = []
+    system.alert_listeners.append(
+        lambda alert: falls.append(alert['timestamp'] - start) if alert['type'] == 'FALL' else None)
+
+    pose = MarkerPoseEstimator(pose_ms=slow_pose_ms if feature == 'autoscale' else 0.0)
+    frames = 0
+    for t, frame in scenario.frames():
+        clock.set(start + t)
+        system.process_frame(pose, frame)
+        frames += 1
+    return falls, pose.calls, frames, system.inference_summary()
+
+
+def score(scenario, detections, window=3.0):
+    """정답 낙상과 맞추기 → (정답별 감지 시각(없으면 None), 오경보 수)"""
+    remaining = list(detections)
+    matched = []
+    for onset, duration in scenario.falls:
+        hit = next((t for t in remaining if onset <= t <= onset + duration + window), None)
+        if hit is not None:
+            remaining.remove(hit)
+        matched.append(hit)
+    return matched, len(remaining)
+
+
+def benchmark(scenarios, features=FEATURES, slow_pose_ms=50.0, window=3.0):
+    """기준(모두 끔) + 기능별 결과 → {'rows': [...], 'scenarios': [...]}"""
+    configs = (None,) + tuple(features)
+    per_scenario = []
+    totals = {config: {'falls': 0, 'detected': 0, 'latencies': [], 'added': [], 'false_alarms': 0,
+                       'pose_calls': 0, 'frames': 0, 'seconds': 0.0} for config in configs}
+    for scenario in scenarios:
+        baseline_hits = None
+        entry = {'scenario': scenario.name, 'falls': [onset for onset, _ in scenario.falls], 'results': {}}
+        for config in configs:
+            started = time.perf_counter()
+            detections, calls, frames, summary = run_scenario(scenario, config, slow_pose_ms)
+            hits, false_alarms = score(scenario, detections, window)
+            if config is None:
+                baseline_hits = hits
+            total = totals[config]
+            total['seconds'] += time.perf_counter() - started
+            total['falls'] += len(hits)
+            total['false_alarms'] += false_alarms
+            total['pose_calls'] += calls
+            total['frames'] += frames
+            for (onset, _), hit, base in zip(scenario.falls, hits, baseline_hits):
+                if hit is not None:
+                    total['detected'] += 1
+                    total['latencies'].append(hit - onset)
+                    if base is not None:
+                        total['added'].append(hit - base)
+            entry['results'][config or 'baseline'] = {
+                'detections': [round(t, 3) for t in detections], 'false_alarms': false_alarms,
+                'pose_calls': calls, 'frames': frames,
+                'summary': summary.get(_SUMMARY_KEYS[config]) if config else None,
+            }
+        per_scenario.append(entry)
+
+    rows = []
+    for config in configs:
+        total = totals[config]
+        latencies, added = total['latencies'], total['added']
+        rows.append({
+            'feature': config or 'baseline',
+            'falls': total['falls'],
+            'recall': round(total['detected'] / total['falls'], 3) if total['falls'] else 1.0,
+            'mean_latency_sec': round(float(np.mean(latencies)), 3) if latencies else None,
+            'max_latency_sec': round(float(np.max(latencies)), 3) if latencies else None,
+            'mean_added_latency_sec': round(float(np.mean(added)), 3) if added else None,
+            'max_added_latency_sec': round(float(np.max(added)), 3) if added else None,
+            'false_alarms': total['false_alarms'],
+            'pose_call_ratio': round(total['pose_calls'] / total['frames'], 3) if total['frames'] else 0.0,
+            'benchmark_sec': round(total['seconds'], 1),
+        })
+    return {'rows': rows, 'scenarios': per_scenario}
+
+
+def print_table(report):
+    print(f"\n{'기능':<14} {'재현율':>6} {'평균 지연':>9} {'최대 지연':>9} {'추가 지연':>9} {'최대 추가':>9} "
+          f"{'오경보':>6} {'pose 비율':>9}")
+    for row in report['rows']:
+        def seconds(value):
+            return f"{value:>8.3f}s" if value is not None else f"{'-':>9}"
+        print(f"{row['feature']:<14} {row['recall']:>6.2f} {seconds(row['mean_latency_sec'])} "
+              f"{seconds(row['max_latency_sec'])} {seconds(row['mean_added_latency_sec'])} "
+              f"{seconds(row['max_added_latency_sec'])} {row['false_alarms']:>6} {row['pose_call_ratio']:>9.3f}")
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="추론 생략/경량화 기능별 낙상 감지 재현율·지연 벤치마크 (합성 장면)")
+    parser.add_argument('--features', nargs='+', choices=FEATURES, default=list(FEATURES), help='비교할 기능')
+    parser.add_argument('--repeats', type=int, default=4, help='장면 종류별 반복 수 (위치/방향/낙상 속도 변경)')
+    parser.add_argument('--slow-pose-ms', type=float, default=50.0,
+                        help='자동 조절 실행에서 흉내 낼 pose 1회 시간 (ms, 예산을 넘겨야 단계가 내려감)')
+    parser.add_argument('--window', type=float, default=3.0, help='낙상 동작이 끝난 뒤 감지로 인정하는 시간 (초)')
+    parser.add_argument('--output', default='fall_benchmark.json', help='결과 JSON 파일')
+    args = parser.parse_args()
+
+    cv2.setNumThreads(1)
+    scenarios = build_scenarios(args.repeats)
+    print(f"🎬 합성 장면 {len(scenarios)}개, 정답 낙상 {sum(len(s.falls) for s in scenarios)}건")
+    report = benchmark(scenarios, args.features, args.slow_pose_ms, args.window)
+    print_table(report)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n💾 벤치마크 결과 저장: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+노인 활동 모니터링 - 프레임 히스토리 메모리 벤치마크 (dict 레코드 deque vs 미리 할당한 RingBuffer)
+- 예전 방식: pose_history / activity_history에 프레임마다 새 dict를 만들어 deque(maxlen)에 보관
+- 현재 방식: ACTIVITY_DTYPE 구조체 배열 RingBuffer에 값만 덮어씀 (읽는 곳이 없던 pose_history는 제거,
+  급격한 자세 변화는 RollingExtrema 윈도우로 판단)
+- 카메라 N대 분량의 히스토리를 가득 채운 뒤 tracemalloc으로 남아 있는 메모리와 최대 메모리,
+  프레임당 기록 시간, 그동안 일어난 GC 횟수를 비교
+
+사용 예:
+    python monitoring_history_benchmark.py --cameras 16 --frames 5400
+"""
+
+import gc
+import math
+import time
+import tracemalloc
+from collections import deque
+
+import numpy as np
+
+from monitoring_buffers import RingBuffer, ACTIVITY_DTYPE
+from monitoring_config import SYSTEM_CONFIG
+
+LEGACY_POSE_HISTORY_SIZE = 300  # 예전 구현의 pose_history 크기 (10초, 30fps)
+
+
+class DictHistories:
+    """예전 방식: 프레임마다 dict 레코드 (elderly_monitoring_system의 이전 구현과 같은 키)"""
+
+    def __init__(self, activity_size):
+        self.pose_history = deque(maxlen=LEGACY_POSE_HISTORY_SIZE)
+        self.activity_history = deque(maxlen=activity_size)
+
+    def record(self, inclination, ratio, center_x, center_y, now):
+        self.pose_history.append({'inclination': inclination, 'head_hip_ratio': ratio, 'timestamp': now})
+        movement = 0
+        if self.activity_history:
+            prev = self.activity_history[-1]
+            movement = math.hypot(center_x - prev['center'][0], center_y - prev['center'][1])
+        self.activity_history.append({'center': (center_x, center_y), 'timestamp': now, 'movement': movement})
+
+
+class ArrayHistories:
+    """현재 방식: 미리 할당한 구조체 배열 링 버퍼"""
+
+    def __init__(self, activity_size):
+        self.activity_history = RingBuffer(activity_size, ACTIVITY_DTYPE)
+
+    def record(self, inclination, ratio, center_x, center_y, now):
+        movement = 0.0
+        if len(self.activity_history):
+            prev = self.activity_history[-1]
+            movement = math.hypot(center_x - float(prev['center_x']), center_y - float(prev['center_y']))
+        self.activity_history.append(center_x, center_y, now, movement)
+
+
+def _frames(frames, seed=0):
+    """카메라 한 대의 합성 프레임 값 (기울기, 머리/엉덩이 비율, 활동 중심점, 시각) - 미리 만들어 측정에서 제외"""
+    rng = np.random.default_rng(seed)
+    values = rng.random((frames, 4))
+    return [(float(a) * 90.0, float(b) * 1.5, float(c), float(d), i / 30.0) for i, (a, b, c, d) in enumerate(values)]
+
+
+def _record_all(history_class, cameras, activity_size, inputs):
+    histories = [history_class(activity_size) for _ in range(cameras)]
+    for values in inputs:
+        for history in histories:
+            history.record(*values)
+    return histories
+
+
+def run(history_class, cameras, frames, activity_size):
+    """카메라 N대 × frames 프레임 기록 → 측정 결과 dict (시간은 tracemalloc 없이 따로 측정)"""
+    inputs = _frames(frames)
+
+    gc.collect()
+    collections_before = sum(stat['collections'] for stat in gc.get_stats())
+    start = time.perf_counter()
+    histories = _record_all(history_class, cameras, activity_size, inputs)
+    elapsed = time.perf_counter() - start
+    collections = sum(stat['collections'] for stat in gc.get_stats()) - collections_before
+    del histories
+
+    gc.collect()
+    tracemalloc.start()
+    histories = _record_all(history_class, cameras, activity_size, inputs)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del histories
+
+    return {
+        'method': history_class.__name__,
+        'retained_kb_per_camera': round(current / cameras / 1024, 1),
+        'peak_kb_per_camera': round(peak / cameras / 1024, 1),
+        'us_per_frame': round(elapsed / (frames * cameras) * 1e6, 2),
+        'gc_collections': collections,
+    }
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="프레임 히스토리 메모리 벤치마크 (dict deque vs RingBuffer)")
+    parser.add_argument('--cameras', type=int, default=16, help='동시에 모니터링하는 카메라 수')
+    parser.add_argument('--frames', type=int, default=5400, help='카메라당 기록할 프레임 수 (기본 30fps 3분)')
+    args = parser.parse_args()
+
+    activity_size = SYSTEM_CONFIG['ACTIVITY_HISTORY_SIZE']
+    print(f"📏 카메라 {args.cameras}대, 카메라당 {args.frames}프레임, "
+          f"activity_history {activity_size} 레코드 (예전 방식은 pose_history {LEGACY_POSE_HISTORY_SIZE} 레코드 추가)")
+
+    results = [run(cls, args.cameras, args.frames, activity_size) for cls in (DictHistories, ArrayHistories)]
+    print(f"{'방식':<15} {'유지(KB/대)':>12} {'최대(KB/대)':>12} {'µs/프레임':>10} {'GC 횟수':>8}")
+    for row in results:
+        print(f"{row['method']:<15} {row['retained_kb_per_camera']:>12.1f} {row['peak_kb_per_camera']:>12.1f} "
+              f"{row['us_per_frame']:>10.2f} {row['gc_collections']:>8}")
+
+    legacy, compact = results
+    saved = legacy['retained_kb_per_camera'] - compact['retained_kb_per_camera']
+    print(f"\n💾 카메라당 {saved:.1f}KB 절약 ({args.cameras}대: {saved * args.cameras / 1024:.1f}MB), "
+          f"GC {legacy['gc_collections']}회 → {compact['gc_collections']}회")
+
+
+if __name__ == "__main__":
+    main()
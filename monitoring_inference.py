@@ -0,0 +1,515 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+노인 활동 모니터링 - pose 추론 앞단 최적화
+- MotionGate: 축소한 흑백 프레임의 차이로 변화가 없는 프레임을 찾아 pose.process를 건너뜀
+  (건너뛴 프레임은 직전 랜드마크를 재사용, force_interval초마다 강제로 전체 추론)
+- InferenceScheduler: 활동 상태별 목표 추론 속도(fps)로 추론 빈도를 제한하고,
+  낙상 징후가 보이면 즉시 최대 속도로 전환
+- RoiTracker: 직전 랜드마크로 사람 주변 정사각형 영역만 잘라 작은 입력으로 추론하고,
+  결과 랜드마크를 전체 프레임 좌표로 되돌림 (추적을 놓치면 전체 프레임으로 복귀)
+- PoseEstimator / InferenceAutoscaler: 추론 지연이 프레임 예산을 넘으면 model_complexity와
+  입력 해상도를 한 단계씩 낮추고, 여유가 생기면 다시 올림 (히스테리시스 적용)
+- LandmarkPredictor: 랜드마크별 등속 칼만 필터로 추론을 건너뛴 프레임의 랜드마크를 예측
+  (interval 프레임마다, 또는 예측 오차가 커지면 실제 추론) → 분석 단계는 매 프레임 움직이는 랜드마크를 받음
+
+낙상은 큰 움직임이라 게이트가 바로 열리고, 직전 분석에서 낙상 조건이 하나라도 잡혔으면
+force=True로 매 프레임 추론하므로 낙상 감지 지연은 늘어나지 않습니다.
+"""
+
+import time
+
+import cv2
+import numpy as np
+
+from monitoring_landmarks import X, Y, Z, VISIBILITY, VISIBILITY_THRESHOLD
+from monitoring_metrics import LatencyHistogram
+
+DUE_TOLERANCE = 0.005  # 카메라 프레임 간격 오차 허용 (초)
+
+
+class MotionGate:
+    """프레임 차이 기반 추론 게이트
+
+    기준 프레임은 마지막으로 추론한 프레임이므로, 천천히 변하는 움직임도 누적되어 결국 게이트를 엽니다.
+    """
+
+    def __init__(self, width=160, pixel_threshold=25, min_changed=0.005, force_interval=2.0):
+        """width: 비교용 축소 폭(px), pixel_threshold: 변화로 보는 밝기 차이(0~255),
+        min_changed: 추론을 여는 변화 픽셀 비율, force_interval: 강제 추론 간격(초)"""
+        self.width = width
+        self.pixel_threshold = pixel_threshold
+        self.min_changed = min_changed
+        self.force_interval = force_interval
+
+        self._reference = None
+        self._current = None
+        self._last_inference = None
+        self.changed_ratio = 0.0
+
+        # 통계
+        self.frames = 0
+        self.skipped = 0
+        self.forced = 0
+
+    def _prepare(self, frame):
+        """BGR 프레임 → 축소 + 흐림 처리한 흑백 프레임 (센서 노이즈 제거)"""
+        height = max(1, round(frame.shape[0] * self.width / frame.shape[1]))
+        small = cv2.resize(frame, (self.width, height), interpolation=cv2.INTER_AREA)
+        gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        return cv2.GaussianBlur(gray, (5, 5), 0)
+
+    def measure(self, frame):
+        """기준 프레임 대비 변화 픽셀 비율 (기준이 없으면 1.0) - 매 프레임 호출해도 가벼움"""
+        gray = self._current = self._prepare(frame)
+        if self._reference is None or self._reference.shape != gray.shape:
+            self.changed_ratio = 1.0
+        else:
+            diff = cv2.absdiff(gray, self._reference)
+            self.changed_ratio = np.count_nonzero(diff > self.pixel_threshold) / diff.size
+        return self.changed_ratio
+
+    def decide(self, now, force=False):
+        """measure()한 프레임에 pose 추론이 필요하면 True (이때 그 프레임이 새 기준이 됨)"""
+        self.frames += 1
+        if self.changed_ratio >= self.min_changed or self._last_inference is None:
+            infer = True
+        elif force or now - self._last_inference >= self.force_interval:
+            self.forced += 1
+            infer = True
+        else:
+            infer = False
+
+        if infer:
+            self._reference = self._current
+            self._last_inference = now
+        else:
+            self.skipped += 1
+        return infer
+
+    def should_infer(self, frame, now, force=False):
+        """이번 프레임에 pose 추론이 필요하면 True (False면 직전 랜드마크 재사용)"""
+        self.measure(frame)
+        return self.decide(now, force)
+
+    def reset(self):
+        """다음 프레임은 반드시 추론 (카메라 재연결 등)"""
+        self._reference = None
+        self._last_inference = None
+
+    @property
+    def skip_ratio(self):
+        return self.skipped / self.frames if self.frames else 0.0
+
+    def summary(self, pose_ms=0.0):
+        """pose_ms: pose.process 평균 시간(ms) - 절약한 CPU 시간 추정용"""
+        return {
+            'frames': self.frames,
+            'skipped': self.skipped,
+            'forced': self.forced,
+            'skip_ratio': round(self.skip_ratio, 3),
+            'cpu_saved_sec': round(self.skipped * pose_ms / 1000.0, 1),
+        }
+
+
+class InferenceScheduler:
+    """활동 상태별 pose 추론 속도 제한기
+
+    rates: {활동 상태: 목표 fps} (없는 상태는 full_rate)
+    should_infer(urgent=True)가 호출되면 boost_hold초 동안 full_rate로 추론합니다.
+    건너뛴 프레임 수와 pose 평균 시간으로 절약한 CPU 시간을 추정하고,
+    최대 속도로 전환되는 순간까지 장면을 보지 못한 시간(감지 지연)을 기록합니다.
+    """
+
+    def __init__(self, rates, full_rate=30, boost_hold=3.0):
+        self.rates = dict(rates)
+        self.full_rate = full_rate
+        self.boost_hold = boost_hold
+
+        self.current_rate = full_rate
+        self._boost_until = None
+        self._last_inference = None
+
+        # 통계
+        self.frames = 0
+        self.skipped = 0
+        self.boosts = 0
+        self.boost_latency = LatencyHistogram(window=200)  # 최대 속도 전환 시 직전 추론 이후 경과 시간
+
+    def target_rate(self, activity, now):
+        if self._boost_until is not None and now < self._boost_until:
+            return self.full_rate
+        return self.rates.get(activity, self.full_rate)
+
+    def should_infer(self, now, activity, urgent=False):
+        """이번 프레임을 추론할 차례면 True (urgent: 낙상 징후 → 즉시 최대 속도)"""
+        self.frames += 1
+        if urgent:
+            if self._boost_until is None or now >= self._boost_until:  # 새로 최대 속도로 전환
+                self.boosts += 1
+                if self._last_inference is not None:
+                    self.boost_latency.record(now - self._last_inference)
+            self._boost_until = now + self.boost_hold
+
+        rate = self.target_rate(activity, now)
+        if rate != self.current_rate:
+            print(f"⏩ 추론 속도 {self.current_rate} → {rate} fps ({'낙상 징후' if urgent else activity})")
+            self.current_rate = rate
+
+        if urgent or self._last_inference is None or now - self._last_inference >= 1.0 / rate - DUE_TOLERANCE:
+            self._last_inference = now
+            return True
+        self.skipped += 1
+        return False
+
+    def summary(self, pose_ms=0.0):
+        """pose_ms: pose.process 평균 시간(ms) - 절약한 CPU 시간 추정용"""
+        latency = self.boost_latency.summary()
+        return {
+            'frames': self.frames,
+            'skipped': self.skipped,
+            'skip_ratio': round(self.skipped / self.frames, 3) if self.frames else 0.0,
+            'cpu_saved_sec': round(self.skipped * pose_ms / 1000.0, 1),
+            'current_rate': self.current_rate,
+            'boosts': self.boosts,
+            'boost_latency_ms': {'p50': latency['p50'], 'p95': latency['p95'], 'max': latency['max']},
+        }
+
+
+class RoiTracker:
+    """직전 프레임 랜드마크 기반 사람 영역(ROI) 추적기
+
+    box는 (x0, y0, side) 픽셀 정사각형입니다. 잘라낸 영역은 input_size×input_size로 균일하게 축소되므로
+    정규화 좌표는 비율만 바꾸면 전체 프레임 좌표로 돌아갑니다.
+    MediaPipe 추적기가 흔들리지 않도록, 사람이 영역 가장자리에 가까워지거나 크게 작아졌을 때만 영역을 옮깁니다.
+    """
+
+    def __init__(self, padding=0.3, input_size=256, min_visible=8, min_size=0.3):
+        """padding: 사람 크기 대비 여유 비율, input_size: 추론 입력 크기(px),
+        min_visible: 추적 유지에 필요한 보이는 랜드마크 수, min_size: 최소 영역 크기 (프레임 짧은 변 대비)"""
+        self.padding = padding
+        self.input_size = input_size
+        self.min_visible = min_visible
+        self.min_size = min_size
+        self.box = None
+
+        # 통계
+        self.frames = 0
+        self.roi_frames = 0
+        self.lost = 0
+        self.moves = 0
+        self._area_sum = 0.0
+
+    def prepare(self, frame):
+        """BGR 프레임 → (추론 입력 이미지, box) - 추적 중이 아니면 (frame, None)"""
+        self.frames += 1
+        if self.box is None:
+            return frame, None
+        x0, y0, side = self.box
+        crop = frame[y0:y0 + side, x0:x0 + side]
+        self.roi_frames += 1
+        self._area_sum += side * side / (frame.shape[0] * frame.shape[1])
+        if side != self.input_size:  # 입력 크기를 고정해 MediaPipe 추적이 흔들리지 않게 함
+            interpolation = cv2.INTER_AREA if side > self.input_size else cv2.INTER_LINEAR
+            crop = cv2.resize(crop, (self.input_size, self.input_size), interpolation=interpolation)
+        return crop, self.box
+
+    @staticmethod
+    def to_frame(landmarks, box, frame_shape):
+        """ROI 기준 (33, 4) 랜드마크 → 전체 프레임 기준 (제자리 변환)"""
+        if box is None:
+            return landmarks
+        height, width = frame_shape[:2]
+        x0, y0, side = box
+        landmarks[:, X] = (x0 + landmarks[:, X] * side) / width
+        landmarks[:, Y] = (y0 + landmarks[:, Y] * side) / height
+        landmarks[:, Z] *= side / width  # z는 이미지 폭 기준 스케일
+        return landmarks
+
+    def update(self, landmarks, frame_shape):
+        """전체 프레임 기준 랜드마크로 다음 프레임의 영역 갱신 (None이면 추적 종료)"""
+        if landmarks is None:
+            self._lose()
+            return
+        visible = landmarks[:, VISIBILITY] >= VISIBILITY_THRESHOLD
+        if np.count_nonzero(visible) < self.min_visible:
+            self._lose()
+            return
+
+        height, width = frame_shape[:2]
+        points = landmarks[visible, :2] * (width, height)
+        points = np.clip(points, 0, (width - 1, height - 1))
+        (bx0, by0), (bx1, by1) = points.min(axis=0), points.max(axis=0)
+        person = max(bx1 - bx0, by1 - by0)
+
+        if self.box is not None:
+            x0, y0, side = self.box
+            margin = side * self.padding / (1 + 2 * self.padding) / 2
+            inside = (bx0 >= x0 + margin or x0 == 0) and (by0 >= y0 + margin or y0 == 0) and \
+                     (bx1 <= x0 + side - margin or x0 + side == width) and \
+                     (by1 <= y0 + side - margin or y0 + side == height)
+            if inside and person * (1 + 2 * self.padding) >= side * 0.6:
+                return  # 영역 유지
+
+        self.track_box(bx0, by0, bx1, by1, frame_shape)
+
+    def track_box(self, bx0, by0, bx1, by1, frame_shape):
+        """사람 박스 (픽셀 x0, y0, x1, y1) 주변으로 영역 설정 (사람 검출기 결과로 추적 시작할 때도 사용)"""
+        height, width = frame_shape[:2]
+        short = min(width, height)
+        person = max(bx1 - bx0, by1 - by0)
+        side = int(min(short, max(person * (1 + 2 * self.padding), short * self.min_size)))
+        cx, cy = (bx0 + bx1) / 2, (by0 + by1) / 2
+        x0 = int(np.clip(cx - side / 2, 0, width - side))
+        y0 = int(np.clip(cy - side / 2, 0, height - side))
+        self.box = (x0, y0, side)
+        self.moves += 1
+
+    def _lose(self):
+        if self.box is not None:
+            self.lost += 1
+        self.box = None
+
+    def summary(self):
+        return {
+            'frames': self.frames,
+            'roi_ratio': round(self.roi_frames / self.frames, 3) if self.frames else 0.0,
+            'mean_area': round(self._area_sum / self.roi_frames, 3) if self.roi_frames else 1.0,
+            'moves': self.moves,
+            'lost': self.lost,
+        }
+
+
+class PoseEstimator:
+    """실행 중에 model_complexity를 바꿀 수 있는 MediaPipe Pose 래퍼 (with 문 지원)
+
+    mp_pose: mp.solutions.pose 모듈. complexity가 바뀌면 Pose 인스턴스를 새로 만듭니다 (모델 다시 로드).
+    """
+
+    def __init__(self, mp_pose, model_complexity=1, min_detection_confidence=0.5, min_tracking_confidence=0.5):
+        self.mp_pose = mp_pose
+        self.model_complexity = model_complexity
+        self.min_detection_confidence = min_detection_confidence
+        self.min_tracking_confidence = min_tracking_confidence
+        self._pose = None
+        self._open()
+
+    def _open(self):
+        self._pose = self.mp_pose.Pose(
+            min_detection_confidence=self.min_detection_confidence,
+            min_tracking_confidence=self.min_tracking_confidence,
+            model_complexity=self.model_complexity,
+        )
+
+    def process(self, image):
+        return self._pose.process(image)
+
+    def warm_up(self, shape=(480, 640)):
+        """빈 프레임(shape: 높이, 너비)으로 한 번 추론해 모델 로드/그래프 초기화를 미리 끝냄 → 걸린 시간(초)"""
+        blank = np.zeros((shape[0], shape[1], 3), dtype=np.uint8)
+        blank.flags.writeable = False
+        start = time.perf_counter()
+        self._pose.process(blank)
+        return time.perf_counter() - start
+
+    def set_complexity(self, model_complexity):
+        """model_complexity 변경 (같은 값이면 아무것도 하지 않음)"""
+        if model_complexity == self.model_complexity:
+            return
+        self.close()
+        self.model_complexity = model_complexity
+        self._open()
+
+    def close(self):
+        if self._pose is not None:
+            self._pose.close()
+            self._pose = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class InferenceAutoscaler:
+    """추론 지연 기반 품질 단계 조절기
+
+    levels: [(model_complexity, 입력 배율), ...] 품질이 높은 순서. 0단계에서 시작합니다.
+    최근 window개 추론 지연의 p95가 budget_ms를 넘으면 한 단계 내리고,
+    budget_ms × headroom 아래면 한 단계 올립니다. 단계를 바꾼 뒤 min_dwell초 동안과
+    샘플이 다시 window개 모일 때까지는 바꾸지 않습니다 (왔다 갔다 하지 않도록).
+    """
+
+    def __init__(self, levels, budget_ms=33.0, window=30, headroom=0.6, min_dwell=5.0):
+        self.levels = [tuple(level) for level in levels]
+        self.budget_ms = budget_ms
+        self.window = window
+        self.headroom = headroom
+        self.min_dwell = min_dwell
+
+        self.index = 0
+        self._samples = []
+        self._last_switch = None
+        self.switches = []  # 단계 변경 기록 (검출 품질과 비교용)
+
+    @property
+    def level(self):
+        """현재 (model_complexity, 입력 배율)"""
+        return self.levels[self.index]
+
+    def record(self, seconds, now):
+        """추론 한 번의 지연(초) 기록 → 단계가 바뀌었으면 새 (model_complexity, 입력 배율), 아니면 None"""
+        self._samples.append(seconds * 1000.0)
+        if len(self._samples) < self.window:
+            return None
+        if self._last_switch is not None and now - self._last_switch < self.min_dwell:
+            del self._samples[:-self.window]
+            return None
+
+        p95 = float(np.percentile(self._samples[-self.window:], 95))
+        if p95 > self.budget_ms and self.index < len(self.levels) - 1:
+            return self._switch(self.index + 1, p95, now)
+        if p95 < self.budget_ms * self.headroom and self.index > 0:
+            return self._switch(self.index - 1, p95, now)
+        del self._samples[:-self.window]
+        return None
+
+    def _switch(self, index, p95, now):
+        previous = self.level
+        self.index = index
+        self._samples = []
+        self._last_switch = now
+        self.switches.append({
+            'timestamp': now,
+            'from': list(previous),
+            'to': list(self.level),
+            'p95_ms': round(p95, 2),
+        })
+        direction = '⬇️' if index > self.levels.index(previous) else '⬆️'
+        print(f"{direction} 추론 품질 변경: model_complexity {previous[0]} → {self.level[0]}, "
+              f"입력 배율 {previous[1]} → {self.level[1]} (p95 {p95:.1f}ms / 예산 {self.budget_ms:.0f}ms)")
+        return self.level
+
+    def summary(self):
+        return {
+            'model_complexity': self.level[0],
+            'input_scale': self.level[1],
+            'budget_ms': self.budget_ms,
+            'switches': list(self.switches),
+        }
+
+
+class LandmarkPredictor:
+    """(33, 4) 랜드마크 배열 전체에 대한 등속(constant-velocity) 칼만 필터
+
+    x, y, z 좌표마다 [위치, 속도] 상태와 2x2 공분산을 배열로 두고 한 번에 갱신합니다.
+    추론한 프레임에서는 측정값으로 상태를 보정하고, 건너뛴 프레임에서는 마지막 보정 시점부터
+    속도로 외삽한 랜드마크를 돌려줍니다 (max_horizon초 이상은 외삽하지 않고 유지).
+    실제 추론 시 예측과 측정의 차이(혁신, 정규화 좌표)가 max_error를 넘으면 다시 매 프레임 추론합니다.
+    """
+
+    def __init__(self, interval=2, max_error=0.02, process_noise=5.0, measurement_noise=1e-5, max_horizon=0.2):
+        """interval: 실제 추론 간격(프레임), max_error: 매 프레임 추론으로 돌아가는 예측 오차,
+        process_noise: 가속도 잡음 세기, measurement_noise: 측정 잡음 분산, max_horizon: 최대 외삽 시간(초)"""
+        self.interval = interval
+        self.max_error = max_error
+        self.q = process_noise
+        self.r = measurement_noise
+        self.max_horizon = max_horizon
+
+        shape = (33, 3)  # x, y, z
+        self._pos = np.zeros(shape, dtype=np.float64)
+        self._vel = np.zeros(shape, dtype=np.float64)
+        self._p00 = np.zeros(shape)
+        self._p01 = np.zeros(shape)
+        self._p11 = np.zeros(shape)
+        self._visibility = np.zeros(33, dtype=np.float32)
+        self._time = None
+        self._since_update = 0
+        self.error = 0.0
+
+        # 통계
+        self.frames = 0
+        self.predicted = 0
+        self.error_triggers = 0
+        self._error_sum = 0.0
+        self._updates = 0
+
+    @property
+    def ready(self):
+        return self._time is not None
+
+    def due(self, urgent=False):
+        """이번 프레임에 실제 추론이 필요하면 True (False면 predict()로 대신함)"""
+        self.frames += 1
+        if not self.ready or urgent or self._since_update + 1 >= self.interval:
+            return True
+        if self.error > self.max_error:
+            self.error_triggers += 1
+            return True
+        self.predicted += 1
+        self._since_update += 1
+        return False
+
+    def update(self, landmarks, now):
+        """측정 랜드마크로 상태 보정 (보이는 랜드마크만) → 보정 전 예측 오차"""
+        measured = landmarks[:, :3].astype(np.float64)
+        visible = landmarks[:, 3] >= VISIBILITY_THRESHOLD
+        if not self.ready:
+            self._pos[:] = measured
+            self._vel[:] = 0.0
+            self._p00[:] = self.r
+            self._p01[:] = 0.0
+            self._p11[:] = 1.0  # 초기 속도는 모름
+        else:
+            dt = max(now - self._time, 1e-3)
+            # 예측 단계: F = [[1, dt], [0, 1]], Q = q·[[dt³/3, dt²/2], [dt²/2, dt]]
+            self._pos += self._vel * dt
+            p00 = self._p00 + 2 * dt * self._p01 + dt * dt * self._p11 + self.q * dt ** 3 / 3
+            p01 = self._p01 + dt * self._p11 + self.q * dt ** 2 / 2
+            p11 = self._p11 + self.q * dt
+
+            innovation = measured - self._pos
+            if np.any(visible):
+                self.error = float(np.abs(innovation[visible, :2]).mean())
+                self._error_sum += self.error
+                self._updates += 1
+
+            # 보정 단계 (H = [1, 0]) - 안 보이는 랜드마크는 측정값으로 위치만 맞추고 속도는 0
+            gain_pos = p00 / (p00 + self.r)
+            gain_vel = p01 / (p00 + self.r)
+            self._pos += gain_pos * innovation
+            self._vel += gain_vel * innovation
+            self._p11 = p11 - gain_vel * p01
+            self._p01 = (1 - gain_pos) * p01
+            self._p00 = (1 - gain_pos) * p00
+            hidden = ~visible
+            self._pos[hidden] = measured[hidden]
+            self._vel[hidden] = 0.0
+        self._visibility[:] = landmarks[:, 3]
+        self._time = now
+        self._since_update = 0
+        return self.error
+
+    def predict(self, now):
+        """now 시각의 예측 랜드마크 (33, 4) float32 (분석 결과에 그대로 보관되므로 매번 새 배열)"""
+        horizon = min(max(now - self._time, 0.0), self.max_horizon)
+        predicted = np.empty((33, 4), dtype=np.float32)
+        predicted[:, :3] = self._pos + self._vel * horizon
+        predicted[:, 3] = self._visibility
+        return predicted
+
+    def reset(self):
+        """사람을 놓쳤을 때 - 다음 측정부터 새로 시작"""
+        self._time = None
+        self.error = 0.0
+
+    def summary(self):
+        return {
+            'frames': self.frames,
+            'predicted': self.predicted,
+            'predicted_ratio': round(self.predicted / self.frames, 3) if self.frames else 0.0,
+            'error_triggers': self.error_triggers,
+            'mean_error': round(self._error_sum / self._updates, 5) if self._updates else 0.0,
+        }
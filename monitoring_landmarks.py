@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+노인 활동 모니터링 - 랜드마크 배열 표현
+- MediaPipe pose_landmarks를 프레임마다 한 번만 (33, 4) float32 배열 (x, y, z, visibility)로 변환
+- 기울기 / 머리-엉덩이 비율 / 활동 중심점 등 모든 지표를 배열 연산으로 계산
+- 같은 배열 형식을 그대로 로그 저장, 재생, 배치 처리에 사용
+"""
+
+import math
+
+import numpy as np
+
+NUM_LANDMARKS = 33
+LANDMARK_FIELDS = 4  # x, y, z, visibility
+X, Y, Z, VISIBILITY = range(LANDMARK_FIELDS)
+
+# MediaPipe PoseLandmark 인덱스 (mp.solutions.pose.PoseLandmark 값과 동일)
+NOSE = 0
+LEFT_SHOULDER = 11
+RIGHT_SHOULDER = 12
+LEFT_WRIST = 15
+RIGHT_WRIST = 16
+LEFT_HIP = 23
+RIGHT_HIP = 24
+LEFT_ANKLE = 27
+RIGHT_ANKLE = 28
+
+SHOULDERS = np.array([LEFT_SHOULDER, RIGHT_SHOULDER])
+HIPS = np.array([LEFT_HIP, RIGHT_HIP])
+ACTIVITY_POINTS = np.array([LEFT_WRIST, RIGHT_WRIST, LEFT_ANKLE, RIGHT_ANKLE])  # 활동량 측정용 관절
+
+VISIBILITY_THRESHOLD = 0.5
+
+
+def landmarks_to_array(landmarks, out=None):
+    """MediaPipe 랜드마크 → (33, 4) float32 배열
+
+    landmarks: results.pose_landmarks, 그 .landmark 리스트, 또는 이미 변환된 배열
+    out: 재사용할 (33, 4) 배열 (프레임마다 새로 할당하지 않으려면 지정)
+    """
+    if isinstance(landmarks, np.ndarray):
+        return landmarks
+    if hasattr(landmarks, 'landmark'):
+        landmarks = landmarks.landmark
+
+    values = np.fromiter(
+        (v for lm in landmarks for v in (lm.x, lm.y, lm.z, lm.visibility)),
+        dtype=np.float32, count=NUM_LANDMARKS * LANDMARK_FIELDS
+    ).reshape(NUM_LANDMARKS, LANDMARK_FIELDS)
+
+    if out is None:
+        return values
+    out[...] = values
+    return out
+
+
+def body_inclination(arr):
+    """어깨 중점-엉덩이 중점 선과 수직선 사이의 각도(도)"""
+    shoulder_center = arr[SHOULDERS, :2].mean(axis=0)
+    hip_center = arr[HIPS, :2].mean(axis=0)
+    dx, dy = np.abs(shoulder_center - hip_center)
+    return math.degrees(math.atan2(dx, dy))
+
+
+def head_hip_ratio(arr):
+    """코 높이 / 엉덩이 중점 높이 (1보다 크면 머리가 엉덩이보다 낮음)"""
+    hip_y = float(arr[HIPS, Y].mean())
+    return float(arr[NOSE, Y]) / hip_y if hip_y > 0 else 1
+
+
+def activity_center(arr):
+    """보이는 손목/발목의 중심점 (x, y) - 보이는 관절이 없으면 (nan, nan)"""
+    points = arr[ACTIVITY_POINTS]
+    visible = points[:, VISIBILITY] > VISIBILITY_THRESHOLD
+    if not visible.any():
+        return (math.nan, math.nan)
+    center = points[visible, :2].mean(axis=0)
+    return (float(center[0]), float(center[1]))
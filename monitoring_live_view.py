@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+노인 활동 모니터링 - 로컬 HTTP 실시간 보기 (MJPEG)
+- 주석이 그려진 프레임을 MJPEG 스트림으로 제공 (브라우저에서 http://host:port/ 접속)
+- 프레임은 시청자 수와 관계없이 인코딩 스레드에서 한 번만 JPEG로 인코딩하고 모든 시청자가 같은 바이트를 받음
+- 느린 시청자는 버퍼에 쌓지 않고 중간 프레임을 건너뛰어 항상 최신 프레임을 받음
+- 시청자가 없으면 publish()는 아무것도 하지 않음 (추론 루프 비용 없음)
+
+경로:
+    /             간단한 보기 페이지
+    /stream.mjpg  MJPEG 스트림
+    /snapshot.jpg 최신 프레임 한 장
+    /report       generate_daily_report() JSON
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import cv2
+
+BOUNDARY = 'frame'
+CLIENT_TIMEOUT = 10.0  # 전송이 이 시간 이상 막힌 시청자는 연결 종료 (초)
+
+_INDEX_HTML = """<!DOCTYPE html>
+<html lang="ko"><head><meta charset="utf-8"><title>노인 활동 모니터링</title></head>
+<body style="margin:0;background:#111;color:#eee;font-family:sans-serif;text-align:center">
+<h3>🏥 노인 활동 모니터링 - 실시간 보기</h3>
+<img src="/stream.mjpg" style="max-width:100%">
+<pre id="report" style="text-align:left;display:inline-block"></pre>
+<script>
+async function refresh() {
+  const response = await fetch('/report');
+  document.getElementById('report').textContent = JSON.stringify(await response.json(), null, 2);
+}
+refresh(); setInterval(refresh, 5000);
+</script>
+</body></html>
+"""
+
+
+class _LiveViewHandler(BaseHTTPRequestHandler):
+    server_version = 'ElderlyMonitoringLiveView/1.0'
+
+    def do_GET(self):
+        live_view = self.server.live_view
+        path = self.path.split('?', 1)[0]
+        if path == '/':
+            self._send(200, 'text/html; charset=utf-8', _INDEX_HTML.encode('utf-8'))
+        elif path == '/stream.mjpg':
+            self._stream(live_view)
+        elif path == '/snapshot.jpg':
+            live_view.add_viewer()  # 시청자가 있어야 프레임이 게시됨
+            try:
+                _, jpeg = live_view.next_jpeg(live_view.seq, timeout=2.0)
+            finally:
+                live_view.remove_viewer()
+            if jpeg is None:
+                self._send(503, 'text/plain; charset=utf-8', '아직 프레임이 없습니다'.encode('utf-8'))
+            else:
+                self._send(200, 'image/jpeg', jpeg)
+        elif path == '/report':
+            try:
+                report = live_view.report_provider() if live_view.report_provider else {}
+                body = json.dumps(report, ensure_ascii=False, default=str).encode('utf-8')
+                self._send(200, 'application/json; charset=utf-8', body)
+            except Exception as e:
+                self._send(500, 'text/plain; charset=utf-8', str(e).encode('utf-8'))
+        else:
+            self._send(404, 'text/plain; charset=utf-8', b'not found')
+
+    def _send(self, status, content_type, body):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Cache-Control', 'no-store')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _stream(self, live_view):
+        self.send_response(200)
+        self.send_header('Content-Type', f'multipart/x-mixed-replace; boundary={BOUNDARY}')
+        self.send_header('Cache-Control', 'no-store')
+        self.end_headers()
+        self.connection.settimeout(CLIENT_TIMEOUT)
+
+        live_view.add_viewer()
+        seq = live_view.seq  # 시청을 시작한 뒤 인코딩된 프레임부터 보냄
+        try:
+            while not live_view.stopped:
+                seq, jpeg = live_view.next_jpeg(seq, timeout=1.0)
+                if jpeg is None:
+                    continue
+                # 전송하는 동안 나온 프레임은 건너뛰고 다음에는 최신 프레임을 보냄
+                self.wfile.write(f'--{BOUNDARY}\r\nContent-Type: image/jpeg\r\n'
+                                 f'Content-Length: {len(jpeg)}\r\n\r\n'.encode('ascii'))
+                self.wfile.write(jpeg)
+                self.wfile.write(b'\r\n')
+        except OSError:
+            pass  # 시청자 연결 종료 / 전송 시간 초과
+        finally:
+            live_view.remove_viewer()
+
+    def log_message(self, format, *args):
+        pass  # 요청마다 로그를 찍지 않음
+
+
+class LiveViewServer:
+    """MJPEG 실시간 보기 서버 (HTTP 스레드 + 인코딩 스레드 1개)"""
+
+    def __init__(self, host='127.0.0.1', port=8080, fps=15, jpeg_quality=70, report_provider=None):
+        """fps: 인코딩 최대 속도, report_provider: /report에서 호출할 함수 (dict 반환)"""
+        self.host = host
+        self.port = port
+        self.fps = fps
+        self.encode_params = [cv2.IMWRITE_JPEG_QUALITY, jpeg_quality]
+        self.report_provider = report_provider
+
+        self._cond = threading.Condition()
+        self._pending = None  # 인코딩 대기 중인 최신 프레임
+        self.latest_jpeg = None
+        self._seq = 0
+        self.viewers = 0
+        self.stopped = False
+
+        self._server = None
+        self._threads = []
+
+        # 통계
+        self.frames_encoded = 0
+
+    def start(self):
+        """HTTP/인코딩 스레드 시작 → self (포트를 열 수 없으면 경고만 출력하고 None - 실시간 보기 없이 계속 실행)"""
+        try:
+            self._server = ThreadingHTTPServer((self.host, self.port), _LiveViewHandler)
+        except OSError as e:
+            print(f"실시간 보기 서버를 열 수 없습니다 ({self.host}:{self.port}): {e}")
+            return None
+        self._server.daemon_threads = True
+        self._server.live_view = self
+        self.port = self._server.server_address[1]
+        for target, name in ((self._server.serve_forever, 'live-view-http'), (self._encode_loop, 'live-view-encoder')):
+            thread = threading.Thread(target=target, name=name, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        print(f"📺 실시간 보기: http://{self.host}:{self.port}/")
+        return self
+
+    def add_viewer(self):
+        with self._cond:
+            self.viewers += 1
+
+    def remove_viewer(self):
+        with self._cond:
+            self.viewers -= 1
+
+    def publish(self, frame):
+        """주석이 그려진 프레임 게시 (시청자가 없으면 아무것도 하지 않음, 인코딩은 인코딩 스레드)"""
+        if not self.viewers:
+            return
+        frame = frame.copy()
+        with self._cond:
+            self._pending = frame  # 인코딩 전에 새 프레임이 오면 이전 프레임은 버림
+            self._cond.notify_all()
+
+    def _encode_loop(self):
+        interval = 1.0 / self.fps
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending is not None or self.stopped)
+                if self.stopped:
+                    return
+                frame, self._pending = self._pending, None
+
+            start = time.perf_counter()
+            ok, encoded = cv2.imencode('.jpg', frame, self.encode_params)
+            if ok:
+                with self._cond:
+                    self.latest_jpeg = encoded.tobytes()
+                    self._seq += 1
+                    self.frames_encoded += 1
+                    self._cond.notify_all()
+            # 최대 fps 제한 (그사이 게시된 프레임은 최신 것만 남음)
+            remaining = interval - (time.perf_counter() - start)
+            if remaining > 0:
+                time.sleep(remaining)
+
+    @property
+    def seq(self):
+        """마지막으로 인코딩된 프레임 번호"""
+        return self._seq
+
+    def next_jpeg(self, last_seq, timeout=None):
+        """last_seq 이후에 인코딩된 최신 JPEG → (seq, bytes) (타임아웃이면 (last_seq, None))"""
+        with self._cond:
+            self._cond.wait_for(lambda: self._seq != last_seq or self.stopped, timeout)
+            if self._seq == last_seq:
+                return last_seq, None
+            return self._seq, self.latest_jpeg
+
+    def summary(self):
+        return {'viewers': self.viewers, 'frames_encoded': self.frames_encoded, 'port': self.port}
+
+    def stop(self):
+        with self._cond:
+            self.stopped = True
+            self._cond.notify_all()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+        for thread in self._threads:
+            thread.join(timeout=2.0)
+        self._threads = []
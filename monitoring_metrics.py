@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+노인 활동 모니터링 - 단계별 지연 시간 측정
+- time.perf_counter() 기반으로 캡처 / 사람 검출 / 움직임 게이트 / 색 변환 / pose.process / 분석 / 그리기 / 화면 출력 단계를 측정
+- 단계별로 최근 N개 샘플을 유지하고 p50/p95/p99를 계산
+- 화면 오버레이 및 세션 파일 저장용 요약 제공
+- 파이프라인 모드에서는 여러 스레드가 같은 타이머에 기록하므로 기록/요약을 잠금으로 보호
+
+사용 예:
+    t = timer.begin()
+    ret, frame = cap.read()
+    t = timer.lap('capture', t)
+    ...
+    timer.end_frame()
+"""
+
+import threading
+import time
+
+import cv2
+import numpy as np
+
+# 표시 순서
+STAGES = ('capture', 'detect', 'gate', 'convert', 'pose', 'analysis', 'draw', 'display')
+
+
+class LatencyHistogram:
+    """최근 window개 지연 시간 샘플(초)을 보관하고 백분위수를 계산"""
+
+    def __init__(self, window=600):
+        self._samples = np.zeros(window, dtype=np.float64)
+        self._next = 0
+        self._count = 0
+        self.total_count = 0
+
+    def record(self, seconds):
+        self._samples[self._next] = seconds
+        self._next = (self._next + 1) % len(self._samples)
+        if self._count < len(self._samples):
+            self._count += 1
+        self.total_count += 1
+
+    def __len__(self):
+        return self._count
+
+    def summary(self):
+        """밀리초 단위 {'p50', 'p95', 'p99', 'mean', 'max', 'count'}"""
+        if self._count == 0:
+            return {'p50': 0.0, 'p95': 0.0, 'p99': 0.0, 'mean': 0.0, 'max': 0.0, 'count': 0}
+        samples = self._samples[:self._count] * 1000.0
+        p50, p95, p99 = np.percentile(samples, (50, 95, 99))
+        return {
+            'p50': round(float(p50), 3),
+            'p95': round(float(p95), 3),
+            'p99': round(float(p99), 3),
+            'mean': round(float(samples.mean()), 3),
+            'max': round(float(samples.max()), 3),
+            'count': self.total_count,
+        }
+
+
+class StageTimer:
+    """단계별 LatencyHistogram 묶음 + 전체 프레임 시간(FPS)"""
+
+    def __init__(self, window=600, refresh_every=15):
+        self.window = window
+        self.histograms = {}
+        self.frame_time = LatencyHistogram(window)
+        self._frame_start = None
+        self._refresh_every = refresh_every
+        self._cached_summary = None
+        self._frames_since_refresh = 0
+        self._lock = threading.Lock()  # 캡처/추론/렌더 스레드가 동시에 기록
+
+    def begin(self):
+        """프레임/단계 시작 시각"""
+        now = time.perf_counter()
+        if self._frame_start is None:
+            self._frame_start = now
+        return now
+
+    def lap(self, stage, start):
+        """start부터 지금까지를 stage 시간으로 기록하고 현재 시각 반환"""
+        now = time.perf_counter()
+        self.record(stage, now - start)
+        return now
+
+    def record(self, stage, seconds):
+        with self._lock:
+            histogram = self.histograms.get(stage)
+            if histogram is None:
+                histogram = self.histograms[stage] = LatencyHistogram(self.window)
+            histogram.record(seconds)
+
+    def end_frame(self):
+        """프레임 하나 끝 - 프레임 간 시간을 기록 (FPS 계산용)"""
+        now = time.perf_counter()
+        with self._lock:
+            if self._frame_start is not None:
+                self.frame_time.record(now - self._frame_start)
+            self._frame_start = now
+            self._frames_since_refresh += 1
+
+    @staticmethod
+    def _fps(frame_summary):
+        mean_ms = frame_summary['mean']
+        return 1000.0 / mean_ms if mean_ms > 0 else 0.0
+
+    @property
+    def fps(self):
+        with self._lock:
+            return self._fps(self.frame_time.summary())
+
+    def summary(self):
+        """세션 파일 저장용 {stage: {p50, p95, p99, mean, max, count}, 'frame': {...}, 'fps': ...}"""
+        with self._lock:
+            ordered = [s for s in STAGES if s in self.histograms] + \
+                      [s for s in self.histograms if s not in STAGES]
+            result = {stage: self.histograms[stage].summary() for stage in ordered}
+            result['frame'] = self.frame_time.summary()
+        result['fps'] = round(self._fps(result['frame']), 2)
+        return result
+
+    def stage_summary(self, stage):
+        """단계 하나의 요약 (아직 기록이 없으면 None)"""
+        with self._lock:
+            histogram = self.histograms.get(stage)
+            return histogram.summary() if histogram is not None else None
+
+    def cached_summary(self):
+        """화면 오버레이용 요약 (refresh_every 프레임마다 한 번만 다시 계산)"""
+        if self._cached_summary is None or self._frames_since_refresh >= self._refresh_every:
+            self._cached_summary = self.summary()
+            self._frames_since_refresh = 0
+        return self._cached_summary
+
+    def draw_overlay(self, image, show_stages=True, origin=None):
+        """FPS와 단계별 p50/p95/p99를 화면 오른쪽 위에 표시"""
+        summary = self.cached_summary()
+        x, y = origin if origin is not None else (image.shape[1] - 260, 25)
+        cv2.putText(image, f"FPS: {summary['fps']:.1f}", (x, y),
+                   cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2)
+        if not show_stages:
+            return image
+        y += 20
+        cv2.putText(image, "stage   p50 / p95 / p99 ms", (x, y),
+                   cv2.FONT_HERSHEY_SIMPLEX, 0.4, (255, 255, 255), 1)
+        for stage, stats in summary.items():
+            if stage in ('frame', 'fps'):
+                continue
+            y += 16
+            cv2.putText(image, f"{stage:<9}{stats['p50']:6.1f}/{stats['p95']:6.1f}/{stats['p99']:6.1f}",
+                       (x, y), cv2.FONT_HERSHEY_SIMPLEX, 0.4, (255, 255, 255), 1)
+        return image
+
+    def print_summary(self, title="⏱️  단계별 지연 시간 (ms)"):
+        summary = self.summary()
+        print(f"\n{title}")
+        print(f"  {'stage':<10}{'p50':>8}{'p95':>8}{'p99':>8}{'mean':>8}")
+        for stage, stats in summary.items():
+            if stage == 'fps':
+                continue
+            print(f"  {stage:<10}{stats['p50']:>8.2f}{stats['p95']:>8.2f}{stats['p99']:>8.2f}{stats['mean']:>8.2f}")
+        print(f"  FPS: {summary['fps']:.1f}")
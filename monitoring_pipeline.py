@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+노인 활동 모니터링 - 스레드 파이프라인
+- 캡처 / 추론 / 렌더링 단계를 별도 스레드로 분리
+- 단계 사이는 "최신 프레임 우선" 큐로 연결 (오래된 프레임은 버림)
+- 캡처 시점부터 화면 출력까지의 지연 시간 측정
+- frame_ring을 주면 별도 캡처 프로세스가 쓴 공유 메모리 프레임을 큐 전달 없이 읽음
+  (추론 직전에 한 번 복사하고, 복사 중에 덮어써진 프레임은 분석하지 않고 버림)
+"""
+
+import time
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any
+
+import cv2
+
+
+class LatestFrameQueue:
+    """크기가 제한된 "최신 프레임 우선" 큐
+
+    put은 절대 블로킹되지 않으며, 큐가 가득 차면 가장 오래된 항목을 버립니다.
+    get은 대기 중인 항목 중 가장 최신 항목만 돌려주고 나머지는 버립니다.
+    """
+
+    def __init__(self, maxsize=1):
+        self._items = deque(maxlen=maxsize)
+        self._cond = threading.Condition()
+        self._closed = False
+        self.dropped = 0  # 소비되지 못하고 버려진 항목 수
+
+    def put(self, item):
+        with self._cond:
+            if len(self._items) == self._items.maxlen:
+                self.dropped += 1
+            self._items.append(item)
+            self._cond.notify()
+
+    def get(self, timeout=None):
+        """가장 최신 항목 반환 (타임아웃 또는 종료 시 None)"""
+        with self._cond:
+            self._cond.wait_for(lambda: self._items or self._closed, timeout)
+            if not self._items:
+                return None
+            item = self._items.pop()
+            self.dropped += len(self._items)
+            self._items.clear()
+            return item
+
+    def close(self):
+        """대기 중인 소비자를 깨우고 큐를 닫음"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    @property
+    def closed(self):
+        return self._closed
+
+
+@dataclass
+class FramePacket:
+    """파이프라인 단계 사이를 이동하는 프레임 묶음"""
+    seq: int
+    frame: Any                       # BGR 프레임 (좌우 반전 완료)
+    capture_time: float              # time.perf_counter() 기준 캡처 시각
+    analysis: Any = None             # 추론 단계에서 만든 FrameAnalysis
+    ref: Any = None                  # 공유 메모리 프레임 참조 (frame이 공유 버퍼 뷰인 경우)
+    inference_time: float = 0.0      # 전처리 + 추론 + 분석 소요 시간(초)
+    extra: dict = field(default_factory=dict)
+
+
+class MonitoringPipeline:
+    """ElderlyMonitoringSystem용 캡처/추론/렌더링 3단계 파이프라인
+
+    - 캡처 스레드: 카메라에서 계속 읽어 frame_queue에 넣음 (카메라 버퍼가 밀리지 않음)
+    - 추론 스레드: 항상 가장 최신 프레임으로 pose.process + 낙상/활동 분석
+    - 렌더링(메인 스레드): 분석 결과 표시, cv2.imshow / waitKey 처리
+    """
+
+    def __init__(self, system, pose, cap=None, window_title='노인 활동 모니터링 시스템', frame_ring=None):
+        """cap: cv2.VideoCapture (같은 프로세스에서 캡처) 또는
+        frame_ring: 캡처 프로세스가 쓰는 SharedFrameRing (좌우 반전은 캡처 프로세스에서 완료)"""
+        self.system = system
+        self.pose = pose
+        self.cap = cap
+        self.frame_ring = frame_ring
+        self.window_title = window_title
+
+        self.frame_queue = LatestFrameQueue(maxsize=1)
+        self.result_queue = LatestFrameQueue(maxsize=1)
+        self.stop_event = threading.Event()
+
+        # 통계
+        self.captured_frames = 0
+        self.analyzed_frames = 0
+        self.rendered_frames = 0
+        self.torn_frames = 0     # 처리 중에 캡처 프로세스가 덮어쓴 공유 메모리 프레임 수
+        self.last_latency = 0.0  # 캡처 → 화면 출력 지연(초)
+        self.avg_latency = 0.0   # 지수 이동 평균
+        self.inference_fps = 0.0
+
+        self._threads = []
+
+    def capture_loop(self):
+        """캡처 단계: 프레임을 읽어 최신 프레임 큐에 넣음"""
+        timer = self.system.stage_timer
+        seq = 0
+        while not self.stop_event.is_set() and self.cap.isOpened():
+            t = time.perf_counter()
+            ret, frame = self.cap.read()
+            if not ret:
+                break
+            capture_time = timer.lap('capture', t)
+            frame = cv2.flip(frame, 1)  # 좌우 반전으로 자연스러운 움직임
+            self.frame_queue.put(FramePacket(seq=seq, frame=frame, capture_time=capture_time))
+            seq += 1
+            self.captured_frames = seq
+        self.frame_queue.close()
+
+    def ring_loop(self):
+        """캡처 단계 (공유 메모리): 캡처 프로세스가 쓴 최신 프레임 참조를 큐에 넣음 (복사 없음)"""
+        seq = -1
+        while not self.stop_event.is_set():
+            ref = self.frame_ring.wait_next(seq, timeout=0.5)
+            if ref is None:
+                if self.frame_ring.closed:
+                    break
+                continue
+            seq = ref.seq
+            self.frame_queue.put(FramePacket(seq=seq, frame=ref.frame, capture_time=ref.timestamp, ref=ref))
+            self.captured_frames += 1
+        self.frame_queue.close()
+
+    def inference_loop(self):
+        """추론 단계: 최신 프레임에 대해 자세 검출과 분석 수행"""
+        last_done = None
+        while not self.stop_event.is_set():
+            packet = self.frame_queue.get(timeout=0.5)
+            if packet is None:
+                if self.frame_queue.closed:
+                    break
+                continue
+
+            if packet.ref is not None:
+                # 공유 슬롯을 복사한 뒤, 복사하는 동안 덮어써지지 않았는지 확인하고 복사본으로 추론
+                # (분석은 낙상 상태를 바꾸므로, 찢어진 프레임은 결과를 버리는 것이 아니라 아예 분석하지 않음)
+                frame = packet.frame.copy()
+                if not packet.ref.valid():
+                    self.torn_frames += 1  # 링 슬롯 수를 늘릴 것
+                    continue
+                packet.frame, packet.ref = frame, None
+
+            start = time.perf_counter()
+            _, packet.analysis = self.system.process_frame(self.pose, packet.frame)
+
+            done = time.perf_counter()
+            packet.inference_time = done - start
+            if last_done is not None and done > last_done:
+                fps = 1.0 / (done - last_done)
+                self.inference_fps = fps if self.inference_fps == 0 else 0.9 * self.inference_fps + 0.1 * fps
+            last_done = done
+
+            self.analyzed_frames += 1
+            self.result_queue.put(packet)
+        self.result_queue.close()
+
+    def render(self, packet):
+        """렌더링 단계: 분석 결과를 프레임에 그림 (공유 메모리 프레임은 추론 단계에서 이미 복사본으로 바뀜)"""
+        frame = self.system.render_frame(packet.frame, packet.analysis)
+
+        # 지연 시간 표시
+        cv2.putText(frame, f"Latency: {self.last_latency*1000:.0f}ms (avg {self.avg_latency*1000:.0f}ms)",
+                   (20, frame.shape[0] - 40), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+        cv2.putText(frame, f"Inference: {self.inference_fps:.1f} FPS / dropped {self.frame_queue.dropped}",
+                   (20, frame.shape[0] - 15), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+        return frame
+
+    def start(self):
+        """캡처/추론 스레드 시작"""
+        capture = self.ring_loop if self.frame_ring is not None else self.capture_loop
+        for target, name in ((capture, 'capture'), (self.inference_loop, 'inference')):
+            thread = threading.Thread(target=target, name=f'monitoring-{name}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self):
+        """모든 단계 종료"""
+        self.stop_event.set()
+        self.frame_queue.close()
+        self.result_queue.close()
+        for thread in self._threads:
+            thread.join(timeout=2.0)
+        self._threads = []
+
+    def run(self):
+        """렌더링 루프 실행 (cv2.imshow는 메인 스레드에서 호출해야 함)"""
+        self.start()
+        try:
+            while not self.stop_event.is_set():
+                packet = self.result_queue.get(timeout=0.5)
+                if packet is None:
+                    if self.result_queue.closed:
+                        break
+                    continue
+
+                timer = self.system.stage_timer
+                t = timer.begin()
+                frame = self.render(packet)
+                capture_time = packet.capture_time
+                packet = None
+                t = timer.lap('draw', t)
+
+                # 지연 시간 갱신 (캡처 → 출력 직전)
+                self.last_latency = time.perf_counter() - capture_time
+                self.avg_latency = self.last_latency if self.rendered_frames == 0 else \
+                    0.9 * self.avg_latency + 0.1 * self.last_latency
+                self.rendered_frames += 1
+
+                if self.system.live_view is not None:
+                    self.system.live_view.publish(frame)
+                cv2.imshow(self.window_title, frame)
+
+                key = cv2.waitKey(1) & 0xFF
+                timer.lap('display', t)
+                timer.end_frame()
+                if not self.system.handle_key(key):
+                    break
+        finally:
+            self.stop()
+
+        print(f"⏱️  파이프라인 통계: 캡처 {self.captured_frames} / 분석 {self.analyzed_frames} / "
+              f"출력 {self.rendered_frames} 프레임, 평균 지연 {self.avg_latency*1000:.1f}ms"
+              + (f", 덮어써진 프레임 {self.torn_frames}" if self.frame_ring is not None else ""))
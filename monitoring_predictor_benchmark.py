@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+노인 활동 모니터링 - 랜드마크 예측기 벤치마크 (절약한 CPU vs 낙상 감지 일치도)
+- 녹화 영상마다 모든 프레임에 pose를 한 번만 실행해 랜드마크와 추론 시간을 캐시 (기준: 매 프레임 추론)
+- 캐시한 랜드마크로 예측 간격별 분석을 다시 실행: 추론하지 않는 프레임은 LandmarkPredictor 예측값 사용
+- 간격별로 pose 호출 수 / 절약한 CPU 시간, 기준 대비 낙상 감지 재현율·정밀도·감지 시각 차이,
+  건너뛴 프레임의 예측 오차(실제 랜드마크 대비)를 비교
+
+사용 예:
+    python monitoring_predictor_benchmark.py recordings/ --intervals 2 3 4 --output predictor_benchmark.json
+"""
+
+import json
+import time
+from pathlib import Path
+
+import numpy as np
+
+from monitoring_replay import find_videos, frame_timestamp
+
+
+def extract_landmarks(path):
+    """영상의 모든 프레임에 pose 실행 → (프레임 시각 목록, 랜드마크 목록(없으면 None), pose 평균 ms)"""
+    import cv2
+    cv2.setNumThreads(1)
+    from elderly_monitoring_system import ElderlyMonitoringSystem
+    from monitoring_landmarks import landmarks_to_array
+
+    cap = cv2.VideoCapture(str(path))
+    if not cap.isOpened():
+        print(f"❌ 영상을 열 수 없습니다: {path}")
+        return None
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+
+    system = ElderlyMonitoringSystem(camera_id=Path(path).stem, headless=True, enable_alerts=False,
+                                     enable_session_log=False, enable_autoscale=False, enable_clips=False,
+                                     enable_live_view=False, enable_store=False)
+    timestamps, landmarks = [], []
+    pose_seconds = 0.0
+    index = 0
+    with system.create_pose() as pose:
+        while True:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            timestamps.append(frame_timestamp(cap, index, fps))
+            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            rgb_frame.flags.writeable = False
+            start = time.perf_counter()
+            results = pose.process(rgb_frame)
+            pose_seconds += time.perf_counter() - start
+            landmarks.append(landmarks_to_array(results.pose_landmarks).copy() if results.pose_landmarks else None)
+            index += 1
+    cap.release()
+    return timestamps, landmarks, (pose_seconds * 1000.0 / index if index else 0.0)
+
+
+def simulate(timestamps, landmarks, interval=None, max_error=None):
+    """캐시한 랜드마크로 분석 실행 (interval=None이면 기준: 매 프레임 측정값) → 결과 dict"""
+    from elderly_monitoring_system import ElderlyMonitoringSystem
+    from monitoring_clock import SimulatedClock
+    from monitoring_config import SYSTEM_CONFIG
+    from monitoring_inference import LandmarkPredictor
+    from monitoring_landmarks import VISIBILITY, VISIBILITY_THRESHOLD
+
+    clock = SimulatedClock(start=0.0)
+    system = ElderlyMonitoringSystem(headless=True, enable_alerts=False, enable_session_log=False, clock=clock,
+                                     enable_motion_gate=False, enable_adaptive_rate=False, enable_roi=False,
+                                     enable_autoscale=False, enable_clips=False, enable_live_view=False,
+                                     enable_predictor=False, enable_store=False)
+    falls = []
+    system.alert_listeners.append(lambda alert: falls.append(alert['timestamp']) if alert['type'] == 'FALL' else None)
+
+    predictor = None
+    if interval is not None:
+        predictor = LandmarkPredictor(
+            interval=interval,
+            max_error=SYSTEM_CONFIG['PREDICTOR_MAX_ERROR'] if max_error is None else max_error,
+            process_noise=SYSTEM_CONFIG['PREDICTOR_PROCESS_NOISE'],
+            measurement_noise=SYSTEM_CONFIG['PREDICTOR_MEASUREMENT_NOISE'],
+            max_horizon=SYSTEM_CONFIG['PREDICTOR_MAX_HORIZON'],
+        )
+
+    pose_calls = 0
+    errors = []
+    has_pose = False
+    for timestamp, measured in zip(timestamps, landmarks):
+        clock.set(timestamp)
+        if predictor is None or predictor.due(system.fall_trending()):
+            # process_frame과 같은 순서: 추론 → 예측기 보정 (사람을 놓치면 초기화)
+            pose_calls += 1
+            current = measured
+            has_pose = measured is not None
+            if measured is None:
+                if predictor is not None:
+                    predictor.reset()
+            elif predictor is not None:
+                predictor.update(measured, timestamp)
+        else:
+            current = predictor.predict(timestamp) if has_pose and predictor.ready else None
+            if current is not None and measured is not None:
+                visible = measured[:, VISIBILITY] >= VISIBILITY_THRESHOLD
+                if np.any(visible):
+                    errors.append(float(np.abs(current[visible, :2] - measured[visible, :2]).mean()))
+        system.analyze_frame(current)
+
+    return {
+        'interval': interval or 1,
+        'pose_calls': pose_calls,
+        'falls': falls,
+        'mean_prediction_error': round(float(np.mean(errors)), 5) if errors else 0.0,
+        'p95_prediction_error': round(float(np.percentile(errors, 95)), 5) if errors else 0.0,
+        'predictor': predictor.summary() if predictor is not None else None,
+    }
+
+
+def match_falls(reference, candidate, tolerance=1.0):
+    """기준 낙상 시각과 비교 → (일치 수, 감지 시각 차이 목록 (초, 양수면 늦음))"""
+    unmatched = list(candidate)
+    delays = []
+    for ref_time in reference:
+        nearest = min(unmatched, key=lambda t: abs(t - ref_time), default=None)
+        if nearest is not None and abs(nearest - ref_time) <= tolerance:
+            unmatched.remove(nearest)
+            delays.append(nearest - ref_time)
+    return len(delays), delays
+
+
+def benchmark_file(path, intervals, max_error=None, tolerance=1.0):
+    """영상 하나: 기준 + 간격별 결과"""
+    extracted = extract_landmarks(path)
+    if extracted is None:
+        return None
+    timestamps, landmarks, pose_ms = extracted
+    baseline = simulate(timestamps, landmarks)
+    rows = []
+    for interval in intervals:
+        result = simulate(timestamps, landmarks, interval, max_error)
+        matched, delays = match_falls(baseline['falls'], result['falls'], tolerance)
+        saved_calls = baseline['pose_calls'] - result['pose_calls']
+        rows.append({
+            'interval': interval,
+            'pose_calls': result['pose_calls'],
+            'cpu_saved_ratio': round(saved_calls / baseline['pose_calls'], 3) if baseline['pose_calls'] else 0.0,
+            'cpu_saved_sec': round(saved_calls * pose_ms / 1000.0, 2),
+            'falls': len(result['falls']),
+            'fall_recall': round(matched / len(baseline['falls']), 3) if baseline['falls'] else 1.0,
+            'fall_precision': round(matched / len(result['falls']), 3) if result['falls'] else 1.0,
+            'mean_fall_delay_sec': round(float(np.mean(delays)), 3) if delays else 0.0,
+            'mean_prediction_error': result['mean_prediction_error'],
+            'p95_prediction_error': result['p95_prediction_error'],
+            'predictor': result['predictor'],
+        })
+    return {
+        'file': str(path),
+        'frames': len(timestamps),
+        'pose_ms': round(pose_ms, 2),
+        'baseline_falls': len(baseline['falls']),
+        'results': rows,
+    }
+
+
+def print_table(report):
+    print(f"\n📼 {report['file']} ({report['frames']}프레임, pose {report['pose_ms']}ms, "
+          f"기준 낙상 {report['baseline_falls']}건)")
+    print(f"{'간격':>4} {'추론':>6} {'CPU 절약':>9} {'낙상':>4} {'재현율':>6} {'정밀도':>6} {'지연(s)':>7} {'예측 오차':>9}")
+    for row in report['results']:
+        print(f"{row['interval']:>4} {row['pose_calls']:>6} {row['cpu_saved_ratio']*100:>8.1f}% {row['falls']:>4} "
+              f"{row['fall_recall']:>6.2f} {row['fall_precision']:>6.2f} {row['mean_fall_delay_sec']:>7.3f} "
+              f"{row['mean_prediction_error']:>9.4f}")
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="랜드마크 예측기 벤치마크 (CPU 절약 vs 낙상 감지 일치도)")
+    parser.add_argument('inputs', nargs='+', help='영상 파일 또는 폴더')
+    parser.add_argument('--intervals', type=int, nargs='+', default=[2, 3, 4], help='비교할 추론 간격 (프레임)')
+    parser.add_argument('--max-error', type=float, default=None,
+                        help="매 프레임 추론으로 돌아가는 예측 오차 (기본값: SYSTEM_CONFIG['PREDICTOR_MAX_ERROR'])")
+    parser.add_argument('--tolerance', type=float, default=1.0, help='같은 낙상으로 보는 시각 차이 (초)')
+    parser.add_argument('--output', default='predictor_benchmark.json', help='결과 JSON 파일')
+    args = parser.parse_args()
+
+    reports = []
+    for video in find_videos(args.inputs):
+        report = benchmark_file(video, args.intervals, args.max_error, args.tolerance)
+        if report:
+            print_table(report)
+            reports.append(report)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(reports, f, ensure_ascii=False, indent=2)
+    print(f"\n💾 벤치마크 결과 저장: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+노인 활동 모니터링 - 녹화 영상 재생(리플레이) 평가
+- 녹화된 영상 파일/폴더를 전체 감지 파이프라인으로 실시간보다 빠르게 처리 (waitKey 대기 없음)
+- time.time() 대신 영상 파일의 프레임 타임스탬프 사용
+- 파일마다 낙상/활동 결과를 JSON으로 저장 → 임계값 변경 후 과거 영상 재평가용
+
+사용 예:
+    python monitoring_replay.py recordings/ --output replay_results --workers 4
+"""
+
+import json
+import os
+import time
+from collections import Counter
+from pathlib import Path
+
+import cv2
+
+VIDEO_EXTENSIONS = ('.mp4', '.avi', '.mov', '.mkv', '.m4v', '.webm')
+
+
+def find_videos(inputs):
+    """파일/폴더 목록 → 영상 파일 목록 (폴더는 하위까지 검색)"""
+    videos = []
+    for item in inputs:
+        path = Path(item)
+        if path.is_dir():
+            videos.extend(sorted(p for p in path.rglob('*') if p.suffix.lower() in VIDEO_EXTENSIONS))
+        elif path.is_file():
+            videos.append(path)
+        else:
+            print(f"⚠️ 찾을 수 없습니다: {item}")
+    return videos
+
+
+def frame_timestamp(cap, index, fps):
+    """현재 프레임의 영상 내 시각(초) - 백엔드가 위치를 주지 않으면 프레임 번호로 계산"""
+    pos_msec = cap.get(cv2.CAP_PROP_POS_MSEC)
+    if pos_msec > 0 or index == 0:
+        return pos_msec / 1000.0
+    return index / fps
+
+
+def replay_file(path, output_dir):
+    """영상 파일 하나를 재생하며 분석하고 결과 dict 반환 (결과 JSON도 저장)"""
+    cv2.setNumThreads(1)
+    from elderly_monitoring_system import ElderlyMonitoringSystem
+    from monitoring_clock import SimulatedClock
+    from monitoring_config import THRESHOLDS
+
+    path = Path(path)
+    cap = cv2.VideoCapture(str(path))
+    if not cap.isOpened():
+        print(f"❌ 영상을 열 수 없습니다: {path}")
+        return None
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+
+    # 절대 시각 기준: 파일 수정 시각 - 영상 길이 ≈ 녹화 시작 시각
+    base_time = os.path.getmtime(path) - (frame_count / fps if frame_count > 0 else 0)
+    clock = SimulatedClock(start=base_time)  # 프레임 타임스탬프로 진행하는 시계
+
+    # 실제 시각으로 동작하는 부가 서비스(알림 발송, 세션 로그, 사고 영상, 실시간 보기, 저장소)는 모두 끔
+    # → 리플레이가 포트를 열거나 운영 데이터에 섞이지 않고, 결과는 영상 내용만으로 결정됨
+    system = ElderlyMonitoringSystem(camera_id=path.stem, headless=True, clock=clock,
+                                     enable_alerts=False, enable_session_log=False,
+                                     enable_clips=False, enable_live_view=False, enable_store=False,
+                                     enable_autoscale=False)  # 결과가 컴퓨터 속도에 따라 달라지지 않도록
+    fall_events = []
+    health_alerts = []
+    system.alert_listeners.append(
+        lambda alert: (fall_events if alert['type'] == 'FALL' else health_alerts).append(alert)
+    )
+
+    activity_frames = Counter()
+    pose_frames = 0
+    max_inactive = 0.0
+    video_time = 0.0
+    index = 0
+    start = time.perf_counter()
+
+    with system.create_pose() as pose:
+        while True:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            video_time = frame_timestamp(cap, index, fps)
+            clock.set(base_time + video_time)
+
+            _, analysis = system.process_frame(pose, frame)
+
+            if analysis.has_pose:
+                pose_frames += 1
+            activity_frames[system.current_activity] += 1
+            max_inactive = max(max_inactive, system.inactive_duration)
+            index += 1
+
+    cap.release()
+    elapsed = time.perf_counter() - start
+    duration = video_time + 1.0 / fps if index else 0.0
+
+    report = system.generate_daily_report()
+    result = {
+        'file': str(path),
+        'frames': index,
+        'pose_frames': pose_frames,
+        'video_fps': round(fps, 2),
+        'video_duration_sec': round(duration, 2),
+        'processing_sec': round(elapsed, 2),
+        'speedup': round(duration / elapsed, 2) if elapsed > 0 else 0.0,
+        'fall_events': [
+            {'time_sec': round(alert['timestamp'] - base_time, 2), 'conditions': alert.get('conditions', [])}
+            for alert in fall_events
+        ],
+        'health_alerts': [
+            {'time_sec': round(alert['timestamp'] - base_time, 2), 'type': alert['type'], 'severity': alert['severity']}
+            for alert in health_alerts
+        ],
+        'activity_seconds': {level: round(count / fps, 2) for level, count in activity_frames.items()},
+        'max_inactive_sec': round(max_inactive, 2),
+        'movement': {
+            'total': report['total_movement_score'],
+            'average': report['average_movement'],
+            'max': report['max_movement'],
+        },
+        'stage_latency': system.stage_timer.summary(),
+        **system.inference_summary(),
+        'thresholds': dict(THRESHOLDS),
+    }
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    out_path = output_dir / f"{path.stem}_replay.json"
+    with open(out_path, 'w', encoding='utf-8') as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+
+    print(f"🎞️  {path.name}: {index}프레임, 낙상 {len(fall_events)}건, "
+          f"{result['speedup']}배속 → {out_path}")
+    return result
+
+
+def replay_all(inputs, output_dir='replay_results', workers=1):
+    """여러 영상을 재생 (workers > 1이면 파일 단위로 프로세스 병렬 처리)"""
+    videos = find_videos(inputs)
+    if not videos:
+        print("⚠️ 재생할 영상이 없습니다.")
+        return []
+
+    print(f"🔁 {len(videos)}개 영상 재생 시작 (워커 {workers}개)")
+    if workers > 1:
+        import multiprocessing as mp_proc
+        ctx = mp_proc.get_context('spawn')
+        with ctx.Pool(processes=workers) as pool:
+            results = pool.starmap(replay_file, [(video, output_dir) for video in videos])
+    else:
+        results = [replay_file(video, output_dir) for video in videos]
+
+    results = [r for r in results if r]
+    total_video = sum(r['video_duration_sec'] for r in results)
+    total_falls = sum(len(r['fall_events']) for r in results)
+    print(f"\n✅ 재생 완료: 영상 {total_video/3600:.2f}시간, 낙상 {total_falls}건")
+    return results
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="노인 활동 모니터링 - 녹화 영상 재평가")
+    parser.add_argument('inputs', nargs='+', help='영상 파일 또는 폴더')
+    parser.add_argument('--output', default='replay_results', help='결과 JSON 저장 폴더')
+    parser.add_argument('--workers', type=int, default=1, help='병렬 처리할 프로세스 수')
+    args = parser.parse_args()
+
+    replay_all(args.inputs, args.output, args.workers)
+
+
+if __name__ == "__main__":
+    main()
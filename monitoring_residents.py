@@ -0,0 +1,401 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+노인 활동 모니터링 - 다인실(여러 거주자) 모드
+- MediaPipe Pose는 한 사람만 추적하므로, 사람 검출기가 찾은 사람마다 추적 ID를 붙이고
+  그 사람 주변 영역(ROI)만 잘라 각자의 Pose 인스턴스로 추론 (추론은 스레드 풀에서 병렬 실행)
+- 거주자마다 별도 분석 상태 (낙상 상태, 기울기 윈도우, activity_history, 건강 알림) 유지
+- 사람 수가 늘어도 비용이 선형으로 늘지 않도록:
+    · 사람 검출기는 모두 추적 중이면 DETECT_INTERVAL초마다만 실행 (놓친 사람이 있으면 SEARCH_INTERVAL초)
+    · 한 번 찾은 영역은 다음 프레임에 다시 사용 (랜드마크로 영역을 옮기고, 검출기 없이 추적 유지)
+    · 영역마다 움직임 게이트 + 활동 상태별 추론 속도 적용 (가만히 있는 사람은 추론 생략)
+
+사람 검출기: ultralytics YOLO (yolov8n.pt, 누워 있는 사람도 검출) - 설치되어 있지 않으면 OpenCV HOG
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+
+from monitoring_config import SYSTEM_CONFIG
+from monitoring_inference import MotionGate, InferenceScheduler, RoiTracker
+from monitoring_landmarks import X, Y, VISIBILITY, VISIBILITY_THRESHOLD, landmarks_to_array
+
+PERSON_CLASS = 0        # COCO 'person'
+DUPLICATE_IOU = 0.7     # 두 추적 영역이 이 이상 겹치면 같은 사람으로 보고 나중 ID를 정리
+
+
+def box_iou(a, b):
+    """(x0, y0, x1, y1) 박스 두 개의 IoU"""
+    ix0, iy0 = max(a[0], b[0]), max(a[1], b[1])
+    ix1, iy1 = min(a[2], b[2]), min(a[3], b[3])
+    inter = max(0.0, ix1 - ix0) * max(0.0, iy1 - iy0)
+    union = (a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - inter
+    return inter / union if union > 0 else 0.0
+
+
+def person_box(landmarks, frame_shape):
+    """전체 프레임 기준 (33, 4) 랜드마크 → 보이는 관절의 픽셀 박스 (보이는 관절이 없으면 None)"""
+    visible = landmarks[:, VISIBILITY] >= VISIBILITY_THRESHOLD
+    if not np.any(visible):
+        return None
+    height, width = frame_shape[:2]
+    points = landmarks[visible][:, [X, Y]] * (width, height)
+    (x0, y0), (x1, y1) = points.min(axis=0), points.max(axis=0)
+    return float(x0), float(y0), float(x1), float(y1)
+
+
+class PersonDetector:
+    """경량 사람 검출기 - 프레임 → 사람 박스 (픽셀 x0, y0, x1, y1) 목록"""
+
+    def __init__(self, model='yolov8n.pt', width=320, min_score=0.4, nms_threshold=0.45):
+        """model: YOLO 가중치 파일 (ultralytics가 없으면 HOG 사용), width: 검출용 축소 폭(px),
+        min_score: 최소 신뢰도, nms_threshold: HOG 중복 박스 제거 기준"""
+        self.width = width
+        self.min_score = min_score
+        self.nms_threshold = nms_threshold
+        self.runs = 0
+
+        try:
+            from ultralytics import YOLO  # torch를 함께 불러오므로 다인실 모드에서만 import
+        except ImportError:
+            YOLO = None
+
+        if YOLO is not None:
+            self.backend = 'yolo'
+            self._model = YOLO(model)
+        elif hasattr(cv2, 'HOGDescriptor'):
+            self.backend = 'hog'
+            self._model = cv2.HOGDescriptor()
+            self._model.setSVMDetector(cv2.HOGDescriptor_getDefaultPeopleDetector())
+            print("⚠️ ultralytics가 설치되지 않아 HOG 사람 검출기를 사용합니다 (서 있는 사람 위주로 검출).")
+        else:
+            raise RuntimeError("사람 검출기를 사용할 수 없습니다: pip install ultralytics")
+
+    def detect(self, frame):
+        self.runs += 1
+        if self.backend == 'yolo':
+            results = self._model(frame, imgsz=self.width, classes=[PERSON_CLASS],
+                                  conf=self.min_score, verbose=False)
+            return [tuple(float(v) for v in box) for box in results[0].boxes.xyxy.tolist()]
+
+        # HOG: 64x128 창이라 축소 폭이 너무 작으면 멀리 있는 사람을 놓침
+        scale = min(1.0, self.width / frame.shape[1])
+        small = cv2.resize(frame, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA) if scale < 1.0 else frame
+        rects, weights = self._model.detectMultiScale(small, winStride=(8, 8), padding=(8, 8), scale=1.05)
+        if len(rects) == 0:
+            return []
+        keep = cv2.dnn.NMSBoxes([list(map(int, r)) for r in rects], np.ravel(weights).tolist(),
+                                self.min_score, self.nms_threshold)
+        return [(x / scale, y / scale, (x + w) / scale, (y + h) / scale)
+                for x, y, w, h in (rects[i] for i in np.ravel(keep))]
+
+
+class ResidentTrack:
+    """추적 중인 거주자 한 명 (ID별 ROI, Pose 인스턴스, 추론 생략 상태, 분석 상태)"""
+
+    def __init__(self, track_id, monitor, pose, roi, gate=None, scheduler=None):
+        """monitor: 이 거주자 전용 ElderlyMonitoringSystem (분석 상태만 사용), pose: 전용 PoseEstimator"""
+        self.track_id = track_id
+        self.monitor = monitor
+        self.pose = pose
+        self.roi = roi
+        self.gate = gate
+        self.scheduler = scheduler
+
+        self.landmarks = None   # 마지막 추론 결과 (전체 프레임 기준, 추론 생략 시 재사용)
+        self.has_result = False
+        self.box = None         # 사람 박스 (픽셀) - 검출 결과와 짝짓기용
+        self.last_seen = None
+        self.analysis = None
+
+        # 통계
+        self.frames = 0
+        self.inferred = 0
+
+    @property
+    def tracking(self):
+        return self.roi.box is not None
+
+
+class MultiResidentMonitor:
+    """한 카메라 안의 여러 거주자 모니터링 (사람 검출 → 추적 ID → ID별 ROI pose 추론 → ID별 분석)"""
+
+    def __init__(self, system, max_residents=4, detector_model='yolov8n.pt', detect_width=320,
+                 detect_interval=1.0, search_interval=0.25, track_timeout=3.0, iou_threshold=0.3, workers=2):
+        """system: 카메라 단위 ElderlyMonitoringSystem (시계, 알림, 클립, 단계별 지연 시간 공유)
+        detect_interval: 모두 추적 중일 때 검출 간격(초), search_interval: 놓친 사람이 있을 때 검출 간격(초),
+        track_timeout: 이 시간 동안 보이지 않으면 추적 종료(초), workers: pose 추론 스레드 수"""
+        self.system = system
+        self.max_residents = max_residents
+        self.detect_interval = detect_interval
+        self.search_interval = search_interval
+        self.track_timeout = track_timeout
+        self.iou_threshold = iou_threshold
+
+        self.detector = PersonDetector(detector_model, width=detect_width)
+        self.tracks = {}
+        self.final_reports = {}  # 추적이 끝난 거주자의 마지막 리포트
+        self._next_id = 1
+        self._last_detect = None
+        self._spare_pose = None  # warm_up에서 미리 초기화한 첫 거주자용 PoseEstimator
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='resident-pose')
+
+        # 통계
+        self.frames = 0
+        self.pose_calls = 0
+        self.resident_frames = 0  # 프레임마다 추적 중인 거주자 수의 합
+
+        print(f"👥 다인실 모드: 최대 {max_residents}명, 사람 검출기 {self.detector.backend}, 추론 스레드 {workers}개")
+
+    def process_frame(self, frame):
+        """프레임 한 장 처리 → {추적 ID: FrameAnalysis}"""
+        system = self.system
+        timer = system.stage_timer
+        t = timer.begin()
+        now = system.clock.now()
+        if system.clip_recorder is not None:
+            system.clip_recorder.add_frame(frame, now)
+        self.frames += 1
+
+        if self._detection_due(now):
+            self._detect(frame, now)
+            t = timer.lap('detect', t)
+
+        # 추적 중인 거주자별 추론 (각자 다른 Pose 인스턴스라 병렬 실행 가능)
+        active = [track for track in self.tracks.values() if track.tracking]
+        if active:
+            boxes = {track.track_id: track.box for track in active if track.box is not None}
+            list(self._executor.map(lambda track: self._infer(track, frame, now, boxes), active))
+            t = timer.lap('pose', t)
+
+        analyses = {}
+        for track in list(self.tracks.values()):
+            landmarks = track.landmarks if track.tracking else None
+            if landmarks is not None:
+                track.last_seen = now
+                track.box = person_box(landmarks, frame.shape) or track.box
+            track.analysis = track.monitor.analyze_frame(landmarks)
+            analyses[track.track_id] = track.analysis
+        self.resident_frames += len(active)
+        self._prune(now)
+        timer.lap('analysis', t)
+        return analyses
+
+    def _detection_due(self, now):
+        if self._last_detect is None:
+            return True
+        searching = not self.tracks or any(not track.tracking for track in self.tracks.values())
+        interval = self.search_interval if searching else self.detect_interval
+        return now - self._last_detect >= interval
+
+    def _detect(self, frame, now):
+        """검출 박스를 기존 추적과 IoU로 짝짓고, 놓친 추적은 다시 잡고, 남는 박스는 새 거주자로 추가"""
+        self._last_detect = now
+        boxes = self.detector.detect(frame)
+
+        pairs = sorted(((box_iou(track.box, box), track_id, index)
+                        for track_id, track in self.tracks.items() if track.box is not None
+                        for index, box in enumerate(boxes)), reverse=True)
+        matched_tracks, matched_boxes = set(), set()
+        for iou, track_id, index in pairs:
+            if iou < self.iou_threshold:
+                break
+            if track_id in matched_tracks or index in matched_boxes:
+                continue
+            matched_tracks.add(track_id)
+            matched_boxes.add(index)
+            track = self.tracks[track_id]
+            if not track.tracking:  # 놓친 사람 → 검출 박스 주변에서 다시 추적
+                track.roi.track_box(*boxes[index], frame.shape)
+                track.box = boxes[index]
+                track.has_result = False
+                if track.gate is not None:
+                    track.gate.reset()
+
+        for index, box in enumerate(boxes):
+            if index in matched_boxes or len(self.tracks) >= self.max_residents:
+                continue
+            cx, cy = (box[0] + box[2]) / 2, (box[1] + box[3]) / 2
+            if any(t.box is not None and t.box[0] <= cx <= t.box[2] and t.box[1] <= cy <= t.box[3]
+                   for t in self.tracks.values()):
+                continue  # 이미 추적 중인 사람 안쪽 (검출 박스와 관절 박스 크기 차이)
+            self._add_track(box, frame.shape, now)
+
+    def _add_track(self, box, frame_shape, now):
+        system = self.system
+        track_id = self._next_id
+        self._next_id += 1
+
+        roi = RoiTracker(
+            padding=SYSTEM_CONFIG['ROI_PADDING'],
+            input_size=SYSTEM_CONFIG['ROI_INPUT_SIZE'],
+            min_visible=SYSTEM_CONFIG['ROI_MIN_VISIBLE'],
+            min_size=0.0,  # 다인실에서는 다른 사람이 들어오지 않게 사람 크기 기준으로만 자름
+        )
+        roi.track_box(*box, frame_shape)
+        gate = MotionGate(
+            width=SYSTEM_CONFIG['MOTION_GATE_WIDTH'],
+            pixel_threshold=SYSTEM_CONFIG['MOTION_GATE_PIXEL_THRESHOLD'],
+            min_changed=SYSTEM_CONFIG['MOTION_GATE_MIN_CHANGED'],
+            force_interval=SYSTEM_CONFIG['MOTION_GATE_FORCE_INTERVAL'],
+        ) if SYSTEM_CONFIG['MOTION_GATE_ENABLED'] else None
+        scheduler = InferenceScheduler(
+            SYSTEM_CONFIG['INFERENCE_RATES'],
+            full_rate=SYSTEM_CONFIG['INFERENCE_FULL_RATE'],
+            boost_hold=SYSTEM_CONFIG['INFERENCE_BOOST_HOLD'],
+        ) if SYSTEM_CONFIG['ADAPTIVE_RATE_ENABLED'] else None
+
+        pose = self._spare_pose if self._spare_pose is not None else system.create_pose()
+        self._spare_pose = None
+        track = ResidentTrack(track_id, system.create_resident_monitor(track_id), pose, roi, gate, scheduler)
+        track.box = box
+        track.last_seen = now
+        self.tracks[track_id] = track
+        print(f"👤 거주자 #{track_id} 추적 시작")
+
+    def _infer(self, track, frame, now, boxes):
+        """거주자 한 명 추론 (스레드 풀에서 실행 - 이 거주자의 상태만 변경)
+
+        boxes: 추적 중인 모든 거주자의 사람 박스 - 영역 안에 들어온 다른 사람은 가려서
+        이 거주자의 Pose가 옆 사람으로 옮겨 가지 않게 함
+        """
+        track.frames += 1
+        image, box = track.roi.prepare(frame)
+        image = self._mask_others(image, box, track.track_id, boxes)
+        urgent = track.monitor.fall_trending()
+        infer = True
+        if track.scheduler is not None:
+            infer = track.scheduler.should_infer(now, track.monitor.current_activity, urgent)
+        if infer and track.gate is not None:
+            infer = track.gate.should_infer(image, now, force=urgent)
+        if not infer and track.has_result:
+            return  # 직전 랜드마크 재사용
+
+        track.inferred += 1
+        rgb_image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        rgb_image.flags.writeable = False
+        results = track.pose.process(rgb_image)
+        landmarks = None
+        if results.pose_landmarks:
+            landmarks = RoiTracker.to_frame(landmarks_to_array(results.pose_landmarks), box, frame.shape)
+        track.landmarks = landmarks
+        track.has_result = True
+        track.roi.update(landmarks, frame.shape)
+
+    @staticmethod
+    def _mask_others(image, box, track_id, boxes):
+        """ROI 이미지에서 다른 거주자 박스를 검게 칠함 (이 거주자 박스와 겹치는 부분은 남김)"""
+        x0, y0, side = box
+        scale = image.shape[0] / side
+
+        def to_crop(b):
+            return (int(np.clip((b[0] - x0) * scale, 0, image.shape[1])), int(np.clip((b[1] - y0) * scale, 0, image.shape[0])),
+                    int(np.clip((b[2] - x0) * scale, 0, image.shape[1])), int(np.clip((b[3] - y0) * scale, 0, image.shape[0])))
+
+        others = [to_crop(b) for other_id, b in boxes.items() if other_id != track_id]
+        others = [(cx0, cy0, cx1, cy1) for cx0, cy0, cx1, cy1 in others if cx1 > cx0 and cy1 > cy0]
+        if not others:
+            return image
+        masked = image.copy()  # ROI가 프레임 뷰일 수 있으므로 원본 프레임은 건드리지 않음
+        for cx0, cy0, cx1, cy1 in others:
+            masked[cy0:cy1, cx0:cx1] = 0
+        if track_id in boxes:
+            ox0, oy0, ox1, oy1 = to_crop(boxes[track_id])
+            masked[oy0:oy1, ox0:ox1] = image[oy0:oy1, ox0:ox1]
+        return masked
+
+    def _prune(self, now):
+        """오래 보이지 않은 거주자와 같은 사람을 따라가게 된 중복 추적 정리"""
+        for track_id, track in list(self.tracks.items()):
+            if now - track.last_seen > self.track_timeout:
+                self._remove(track_id, "화면에서 벗어남")
+        kept = []
+        for track in sorted(self.tracks.values(), key=lambda t: t.track_id):
+            if not track.tracking or track.box is None:
+                continue
+            duplicate = next((older for older in kept if box_iou(older.box, track.box) >= DUPLICATE_IOU), None)
+            if duplicate is not None:
+                self._remove(track.track_id, f"#{duplicate.track_id}과 같은 사람")
+            else:
+                kept.append(track)
+
+    def _remove(self, track_id, reason):
+        track = self.tracks.pop(track_id)
+        track.pose.close()
+        track.monitor.activity_rollup.flush()  # 진행 중인 분 집계를 저장소로
+        self.final_reports[track_id] = track.monitor.generate_daily_report()
+        self.pose_calls += track.inferred
+        print(f"👤 거주자 #{track_id} 추적 종료 ({reason})")
+
+    def render(self, image):
+        """거주자별 스켈레톤, 영역, ID/상태 표시"""
+        system = self.system
+        for track in self.tracks.values():
+            analysis = track.analysis
+            risk = analysis.fall_risk if analysis is not None and analysis.has_pose else 0
+            color = (0, 0, 255) if risk >= 2 else (0, 165, 255) if risk == 1 else (0, 255, 0)
+            if analysis is not None and analysis.has_pose:
+                system.draw_skeleton(image, analysis.landmarks)
+            if track.roi.box is not None:
+                x0, y0, side = track.roi.box
+                cv2.rectangle(image, (x0, y0), (x0 + side, y0 + side), color, 1)
+            if track.box is not None:
+                label = f"#{track.track_id} {track.monitor.current_activity}"
+                if track.monitor.inactive_duration > track.monitor.LOW_ACTIVITY_THRESHOLD:
+                    label += f" ({int(track.monitor.inactive_duration / 60)}min)"
+                cv2.putText(image, label, (int(track.box[0]), max(15, int(track.box[1]) - 8)),
+                            cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 2)
+
+        cv2.putText(image, f"Residents: {len(self.tracks)}  pose/frame: {self.pose_calls_per_frame:.2f}",
+                    (20, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
+        if system.show_fps:
+            system.stage_timer.draw_overlay(image, show_stages=system.show_stage_latency,
+                                            origin=(image.shape[1] - 235, 25))
+        return image
+
+    @property
+    def pose_calls_per_frame(self):
+        calls = self.pose_calls + sum(track.inferred for track in self.tracks.values())
+        return calls / self.frames if self.frames else 0.0
+
+    def reports(self):
+        """거주자별 일일 리포트 (추적 종료된 거주자 포함)"""
+        reports = {f"#{track_id}": report for track_id, report in list(self.final_reports.items())}
+        for track_id, track in list(self.tracks.items()):  # 실시간 보기 스레드에서도 호출됨
+            reports[f"#{track_id}"] = track.monitor.generate_daily_report()
+        return reports
+
+    def summary(self):
+        calls = self.pose_calls + sum(track.inferred for track in self.tracks.values())
+        return {
+            'frames': self.frames,
+            'residents_tracked': self._next_id - 1,
+            'residents_active': len(self.tracks),
+            'detector': self.detector.backend,
+            'detector_runs': self.detector.runs,
+            'pose_calls': calls,
+            'pose_calls_per_frame': round(self.pose_calls_per_frame, 3),
+            # 추적 중인 거주자 1명·1프레임당 실제 추론 비율 (1.0이면 생략 없음)
+            'pose_calls_per_resident_frame': round(calls / self.resident_frames, 3) if self.resident_frames else 0.0,
+        }
+
+    def warm_up(self, frame_shape):
+        """카메라를 열기 전에 사람 검출기와 첫 거주자용 Pose를 빈 프레임으로 초기화 → 걸린 시간(초)"""
+        start = time.perf_counter()
+        self.detector.detect(np.zeros((frame_shape[0], frame_shape[1], 3), dtype=np.uint8))
+        self.detector.runs -= 1  # 통계에서 제외
+        if self._spare_pose is None:
+            self._spare_pose = self.system.create_pose()
+            self._spare_pose.warm_up(frame_shape)
+        return time.perf_counter() - start
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+        for track_id in list(self.tracks):
+            self._remove(track_id, "모니터링 종료")
+        if self._spare_pose is not None:
+            self._spare_pose.close()
+            self._spare_pose = None
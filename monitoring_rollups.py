@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+노인 활동 모니터링 - 분/시간/일 단위 활동 집계 (롤업)
+- 프레임마다 현재 분 버킷만 O(1)로 갱신 (움직임 합계/최댓값/횟수, 활동 상태별 시간, 비활성 시간)
+- 분이 끝나면 완료된 분 버킷을 분 링 버퍼에 넣고 현재 시간 버킷에 합침 → 시간이 끝나면 일 버킷에 합침
+- 단계별 링 버퍼 크기가 고정이라 세션이 며칠이 되어도 메모리는 일정
+- 리포트는 프레임 수가 아니라 버킷 수에 비례 (오늘 합계는 일 + 시간 + 분 버킷 3개만 합침)
+
+시간/일 경계는 로컬 시각 기준 (정각, 자정)
+"""
+
+import math
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from monitoring_buffers import RingBuffer
+
+# 활동 상태 분류 (analyze_activity_level의 분류 + 알 수 없음 + 사람 미감지)
+ACTIVITY_CLASSES = ('휴식 중', '조용한 활동', '보통 활동', '활발한 활동', '알 수 없음', '미감지')
+UNKNOWN_CLASS = ACTIVITY_CLASSES.index('알 수 없음')
+ABSENT_CLASS = ACTIVITY_CLASSES.index('미감지')
+_CLASS_INDEX = {name: index for index, name in enumerate(ACTIVITY_CLASSES)}
+
+# 버킷 한 개의 레코드 형식
+ROLLUP_DTYPE = np.dtype([
+    ('start', 'f8'),             # 버킷 시작 시각 (epoch 초)
+    ('frames', 'i8'),            # 기록된 프레임 수
+    ('movement_count', 'i8'),    # 움직임을 측정한 프레임 수 (사람이 보인 프레임)
+    ('movement_sum', 'f8'),
+    ('movement_max', 'f8'),
+    ('inactive_sec', 'f8'),      # 움직임이 임계값 이하였던 시간
+    ('max_inactive', 'f8'),      # 버킷 안에서 관측된 가장 긴 연속 비활성 시간
+    ('activity_sec', 'f8', (len(ACTIVITY_CLASSES),)),
+])
+
+
+class RollupBucket:
+    """집계 중인 버킷 하나 (현재 분/시간/일)"""
+
+    __slots__ = ('start', 'frames', 'movement_count', 'movement_sum', 'movement_max',
+                 'inactive_sec', 'max_inactive', 'activity_sec')
+
+    def __init__(self, start):
+        self.start = start
+        self.frames = 0
+        self.movement_count = 0
+        self.movement_sum = 0.0
+        self.movement_max = 0.0
+        self.inactive_sec = 0.0
+        self.max_inactive = 0.0
+        self.activity_sec = [0.0] * len(ACTIVITY_CLASSES)
+
+    def merge(self, other):
+        """다른 버킷(RollupBucket 또는 ROLLUP_DTYPE 레코드)을 합침"""
+        if isinstance(other, np.void):
+            other = RollupBucket.from_record(other)
+        self.frames += other.frames
+        self.movement_count += other.movement_count
+        self.movement_sum += other.movement_sum
+        self.movement_max = max(self.movement_max, other.movement_max)
+        self.inactive_sec += other.inactive_sec
+        self.max_inactive = max(self.max_inactive, other.max_inactive)
+        for index, seconds in enumerate(other.activity_sec):
+            self.activity_sec[index] += seconds
+        return self
+
+    @classmethod
+    def from_record(cls, record):
+        bucket = cls(float(record['start']))
+        bucket.frames = int(record['frames'])
+        bucket.movement_count = int(record['movement_count'])
+        bucket.movement_sum = float(record['movement_sum'])
+        bucket.movement_max = float(record['movement_max'])
+        bucket.inactive_sec = float(record['inactive_sec'])
+        bucket.max_inactive = float(record['max_inactive'])
+        bucket.activity_sec = [float(v) for v in record['activity_sec']]
+        return bucket
+
+    def to_record(self):
+        """RingBuffer.append에 넘길 필드 순서대로의 값"""
+        return (self.start, self.frames, self.movement_count, self.movement_sum, self.movement_max,
+                self.inactive_sec, self.max_inactive, self.activity_sec)
+
+    def to_dict(self):
+        return {
+            'start': datetime.fromtimestamp(self.start).isoformat(timespec='minutes'),
+            'frames': self.frames,
+            'movement_sum': round(self.movement_sum, 4),
+            'movement_mean': round(self.movement_sum / self.movement_count, 5) if self.movement_count else 0.0,
+            'movement_max': round(self.movement_max, 4),
+            'inactive_min': round(self.inactive_sec / 60, 1),
+            'max_inactive_min': round(self.max_inactive / 60, 1),
+            'activity_min': {name: round(seconds / 60, 1)
+                             for name, seconds in zip(ACTIVITY_CLASSES, self.activity_sec) if seconds > 0},
+        }
+
+
+class ActivityRollup:
+    """분 → 시간 → 일 계층 활동 집계기 (프레임당 O(1), 메모리 고정)"""
+
+    def __init__(self, minutes=1440, hours=168, days=31, max_gap=1.0, inactive_threshold=0.01):
+        """minutes/hours/days: 단계별로 보관할 완료 버킷 수, max_gap: 프레임 간격이 이보다 길면 (카메라 끊김 등)
+        이 시간까지만 집계(초), inactive_threshold: 비활성으로 보는 프레임당 움직임"""
+        self.max_gap = max_gap
+        self.inactive_threshold = inactive_threshold
+        self.minutes = RingBuffer(minutes, ROLLUP_DTYPE)
+        self.hours = RingBuffer(hours, ROLLUP_DTYPE)
+        self.days = RingBuffer(days, ROLLUP_DTYPE)
+
+        self._minute = self._hour = self._day = None
+        self._minute_end = self._hour_end = self._day_end = None
+        self._last_time = None
+
+        # 완료된 분 버킷(RollupBucket)을 받는 함수 목록 (예: SQLite 저장소)
+        self.minute_listeners = []
+
+    def record(self, now, movement, activity, inactive_duration=0.0):
+        """프레임 한 장 기록 (movement: 프레임당 움직임, 사람이 없으면 None)
+
+        관절이 가려져 움직임을 잴 수 없는 프레임(NaN/무한대)은 활동 상태 시간만 더하고
+        움직임 합계/횟수/비활성 시간에는 넣지 않음 → 리포트 JSON에 NaN이 섞이지 않음
+        """
+        if self._minute is None or now >= self._minute_end:
+            self._roll(now)
+        dt = 0.0 if self._last_time is None else min(max(now - self._last_time, 0.0), self.max_gap)
+        self._last_time = now
+
+        bucket = self._minute
+        bucket.frames += 1
+        if movement is None:
+            bucket.activity_sec[ABSENT_CLASS] += dt
+            return
+        if math.isfinite(movement):
+            bucket.movement_count += 1
+            bucket.movement_sum += movement
+            if movement > bucket.movement_max:
+                bucket.movement_max = movement
+            if movement <= self.inactive_threshold:
+                bucket.inactive_sec += dt
+        if inactive_duration > bucket.max_inactive:
+            bucket.max_inactive = inactive_duration
+        bucket.activity_sec[_CLASS_INDEX.get(activity, UNKNOWN_CLASS)] += dt
+
+    def _roll(self, now):
+        """now가 속한 분 버킷으로 이동 (끝난 버킷은 링 버퍼에 넣고 위 단계로 합침)"""
+        if self._minute is not None:
+            self._close_minute()
+        if self._hour is not None and now >= self._hour_end:
+            self._close_hour()
+        if self._day is not None and now >= self._day_end:
+            self._close_day()
+
+        moment = datetime.fromtimestamp(now)
+        minute_start = moment.replace(second=0, microsecond=0)
+        self._minute = RollupBucket(minute_start.timestamp())
+        self._minute_end = (minute_start + timedelta(minutes=1)).timestamp()
+        if self._hour is None:
+            hour_start = minute_start.replace(minute=0)
+            self._hour = RollupBucket(hour_start.timestamp())
+            self._hour_end = (hour_start + timedelta(hours=1)).timestamp()
+        if self._day is None:
+            day_start = minute_start.replace(hour=0, minute=0)
+            self._day = RollupBucket(day_start.timestamp())
+            self._day_end = (day_start + timedelta(days=1)).timestamp()
+
+    def _close_minute(self):
+        self.minutes.append(*self._minute.to_record())
+        self._hour.merge(self._minute)
+        for listener in self.minute_listeners:
+            try:
+                listener(self._minute)
+            except Exception as e:
+                print(f"활동 집계 전달 오류: {e}")
+
+    def flush(self):
+        """진행 중인 분 버킷을 닫음 (세션 종료 시 - 마지막 몇십 초도 저장소에 전달)"""
+        if self._minute is not None:
+            self._close_minute()
+            self._minute = None
+
+    def _close_hour(self):
+        self.hours.append(*self._hour.to_record())
+        self._day.merge(self._hour)
+        self._hour = None
+
+    def _close_day(self):
+        self.days.append(*self._day.to_record())
+        self._day = None
+
+    def today(self):
+        """오늘(현재 일 버킷) 합계 - 완료되지 않은 시간/분 버킷 포함, O(1)"""
+        # 실시간 보기 스레드에서도 호출되므로 버킷이 바뀌는 중이어도 있는 것만 합침
+        day, hour, minute = self._day, self._hour, self._minute
+        if day is None:
+            return RollupBucket(0.0)
+        total = RollupBucket(day.start).merge(day)
+        for bucket in (hour, minute):
+            if bucket is not None:
+                total.merge(bucket)
+        return total
+
+    def session(self):
+        """보관 중인 모든 일 버킷 + 오늘 합계 - O(일 버킷 수)"""
+        total = RollupBucket(float(self.days[0]['start']) if len(self.days) else self.today().start)
+        for record in self.days.latest():
+            total.merge(record)
+        return total.merge(self.today())
+
+    def minutely(self, n=60):
+        """최근 n개 분 버킷 (진행 중인 분 포함) → dict 목록"""
+        buckets = [RollupBucket.from_record(record) for record in self.minutes.latest(n)]
+        if self._minute is not None:
+            buckets.append(self._minute)
+        return [bucket.to_dict() for bucket in buckets[-n:]]
+
+    def hourly(self, n=24):
+        """최근 n개 시간 버킷 (진행 중인 시간 포함) → dict 목록"""
+        buckets = [RollupBucket.from_record(record) for record in self.hours.latest(n)]
+        hour, minute = self._hour, self._minute
+        if hour is not None:
+            current = RollupBucket(hour.start).merge(hour)
+            buckets.append(current.merge(minute) if minute is not None else current)
+        return [bucket.to_dict() for bucket in buckets[-n:]]
+
+    def daily(self):
+        """보관 중인 일 버킷 + 오늘 → dict 목록"""
+        buckets = [RollupBucket.from_record(record) for record in self.days.latest()]
+        if self._day is not None:
+            buckets.append(self.today())
+        return [bucket.to_dict() for bucket in buckets]
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+노인 활동 모니터링 - 추가 전용(append-only) 세션 로그
+- 프레임마다 랜드마크 배열과 분석 지표를 길이 접두 바이너리 레코드로 기록
+- 프레임 루프에서는 메모리 버퍼에 바이트를 붙이기만 하고 (수 µs),
+  백그라운드 스레드가 DATA_CONFIG['SAVE_INTERVAL']초마다 파일에 씀
+- 파일은 카메라/날짜별로 나뉨: session_cam{N}_{YYYYMMDD}.emslog
+
+레코드 형식 (리틀 엔디언):
+    uint32  페이로드 길이
+    float64 timestamp
+    uint8   flags (bit0: 사람 감지, bit1: 이번 프레임에 낙상 알림 발생)
+    uint8   fall_risk
+    uint8   activity_code (ACTIVITY_LEVELS 인덱스)
+    uint8   (예약)
+    float32 inclination, head_hip_ratio, movement, inactive_duration
+    float32[33*4] 랜드마크 (사람이 감지된 경우에만)
+"""
+
+import os
+import struct
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+from monitoring_landmarks import NUM_LANDMARKS, LANDMARK_FIELDS
+
+FILE_MAGIC = b'EMSLOG1\n'
+FILE_SUFFIX = '.emslog'
+
+ACTIVITY_LEVELS = ["알 수 없음", "휴식 중", "조용한 활동", "보통 활동", "활발한 활동"]
+_ACTIVITY_CODES = {name: code for code, name in enumerate(ACTIVITY_LEVELS)}
+
+FLAG_HAS_POSE = 0x01
+FLAG_FALL_ALERT = 0x02
+
+_LENGTH = struct.Struct('<I')
+_HEADER = struct.Struct('<dBBBxffff')
+_LANDMARK_BYTES = NUM_LANDMARKS * LANDMARK_FIELDS * 4
+
+
+def encode_record(analysis, current_activity):
+    """FrameAnalysis → 길이 접두 레코드 바이트"""
+    activity = analysis.activity or {}
+    flags = (FLAG_HAS_POSE if analysis.has_pose else 0) | \
+            (FLAG_FALL_ALERT if analysis.fall_alert_triggered else 0)
+    header = _HEADER.pack(
+        analysis.timestamp,
+        flags,
+        min(analysis.fall_risk, 255),
+        _ACTIVITY_CODES.get(current_activity, 0),
+        analysis.inclination,
+        analysis.head_hip_ratio,
+        activity.get('movement_score', 0.0),
+        activity.get('inactive_duration', 0.0),
+    )
+    if analysis.has_pose:
+        payload = header + analysis.landmarks.astype(np.float32, copy=False).tobytes()
+    else:
+        payload = header
+    return _LENGTH.pack(len(payload)) + payload
+
+
+def decode_record(payload):
+    """페이로드 바이트 → 레코드 dict"""
+    timestamp, flags, fall_risk, activity_code, inclination, ratio, movement, inactive = \
+        _HEADER.unpack_from(payload)
+    landmarks = None
+    if flags & FLAG_HAS_POSE and len(payload) >= _HEADER.size + _LANDMARK_BYTES:
+        landmarks = np.frombuffer(payload, dtype=np.float32, count=NUM_LANDMARKS * LANDMARK_FIELDS,
+                                  offset=_HEADER.size).reshape(NUM_LANDMARKS, LANDMARK_FIELDS)
+    return {
+        'timestamp': timestamp,
+        'has_pose': bool(flags & FLAG_HAS_POSE),
+        'fall_alert': bool(flags & FLAG_FALL_ALERT),
+        'fall_risk': fall_risk,
+        'activity_level': ACTIVITY_LEVELS[activity_code] if activity_code < len(ACTIVITY_LEVELS) else ACTIVITY_LEVELS[0],
+        'inclination': inclination,
+        'head_hip_ratio': ratio,
+        'movement': movement,
+        'inactive_duration': inactive,
+        'landmarks': landmarks,
+    }
+
+
+def read_session_log(path):
+    """세션 로그 파일의 레코드를 순서대로 읽음 (마지막 레코드가 잘린 경우 거기서 멈춤)"""
+    with open(path, 'rb') as f:
+        if f.read(len(FILE_MAGIC)) != FILE_MAGIC:
+            raise ValueError(f"세션 로그 파일이 아닙니다: {path}")
+        while True:
+            prefix = f.read(_LENGTH.size)
+            if len(prefix) < _LENGTH.size:
+                return
+            (length,) = _LENGTH.unpack(prefix)
+            payload = f.read(length)
+            if len(payload) < length:
+                return  # 비정상 종료로 잘린 레코드
+            yield decode_record(payload)
+
+
+class SessionLogWriter:
+    """프레임 레코드를 모아 주기적으로 파일에 추가하는 백그라운드 기록기"""
+
+    def __init__(self, directory, camera_id=None, flush_interval=300):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.camera_tag = f"cam{camera_id}" if camera_id is not None else "cam0"
+        self.flush_interval = flush_interval
+
+        self._buffer = []  # (날짜 키, 레코드 바이트)
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='session-log', daemon=True)
+        self._thread.start()
+
+        self.records_written = 0
+        self.bytes_written = 0
+
+    def path_for(self, day_key):
+        return self.directory / f"session_{self.camera_tag}_{day_key}{FILE_SUFFIX}"
+
+    def append(self, analysis, current_activity):
+        """프레임 레코드 추가 (프레임 루프에서 호출, 파일 I/O 없음)"""
+        record = encode_record(analysis, current_activity)
+        day_key = datetime.fromtimestamp(analysis.timestamp).strftime('%Y%m%d')
+        with self._lock:
+            self._buffer.append((day_key, record))
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+
+    def flush(self):
+        """버퍼에 쌓인 레코드를 날짜별 파일에 추가하고 디스크에 동기화"""
+        with self._lock:
+            pending, self._buffer = self._buffer, []
+        if not pending:
+            return
+
+        with self._write_lock:
+            start = 0
+            while start < len(pending):
+                day_key = pending[start][0]
+                end = start
+                while end < len(pending) and pending[end][0] == day_key:
+                    end += 1
+                chunk = b''.join(record for _, record in pending[start:end])
+                self._write(self.path_for(day_key), chunk)
+                self.records_written += end - start
+                start = end
+
+    def _write(self, path, data):
+        try:
+            with open(path, 'ab') as f:
+                if f.tell() == 0:
+                    f.write(FILE_MAGIC)
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            self.bytes_written += len(data)
+        except OSError as e:
+            print(f"세션 로그 기록 실패 ({path}): {e}")
+
+    def close(self):
+        """기록 스레드를 멈추고 남은 레코드를 모두 씀"""
+        self._stop.set()
+        self._thread.join(timeout=5.0)
+        self.flush()
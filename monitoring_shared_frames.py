@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+노인 활동 모니터링 - 공유 메모리 프레임 링
+- 프로세스 사이에서 프레임을 피클링하지 않고 주고받기 위한 multiprocessing.shared_memory 링 버퍼
+- 슬롯마다 작은 헤더 (시퀀스 번호, 타임스탬프, shape) + 프레임 바이트
+- 쓰기 프로세스는 하나, 읽기 프로세스(추론, 녹화 등)는 여러 개가 같은 버퍼를 복사 없이 읽음
+- 읽는 동안 쓰기 쪽이 링을 한 바퀴 돌아 슬롯을 덮어썼는지는 FrameRef.valid()로 확인
+
+메모리 배치:
+    [제어 헤더 64B: int64 최신 시퀀스, int64 종료 플래그]
+    [슬롯 0: 헤더 32B (int64 seq, float64 timestamp, uint32 h, w, c) + 프레임 바이트] ...
+
+사용 예:
+    ring = SharedFrameRing((480, 640, 3), slots=8)            # 만든 쪽
+    reader = SharedFrameRing.attach(ring.name, (480, 640, 3), 8)  # 다른 프로세스
+    ref = reader.wait_next(after_seq=-1, timeout=1.0)
+"""
+
+import struct
+import time
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Any
+
+import numpy as np
+
+_CONTROL = struct.Struct('<qq48x')  # 최신 시퀀스, 종료 플래그
+_SLOT = struct.Struct('<qdIII4x')   # seq, timestamp, height, width, channels
+_ALIGN = 64
+
+WRITING = -1  # 쓰는 중인 슬롯의 seq
+
+
+@dataclass
+class FrameRef:
+    """공유 메모리 슬롯에 있는 프레임 참조 (frame은 복사본이 아닌 공유 버퍼 뷰)"""
+    seq: int
+    timestamp: float
+    frame: Any
+    ring: Any
+
+    def valid(self):
+        """쓰기 쪽이 아직 이 슬롯을 덮어쓰지 않았으면 True (뷰를 다 쓴 뒤 확인)"""
+        return self.ring.slot_seq(self.seq % self.ring.slots) == self.seq
+
+
+class SharedFrameRing:
+    """공유 메모리 프레임 링 버퍼 (쓰기 1, 읽기 N)"""
+
+    def __init__(self, shape=(480, 640, 3), slots=8, name=None, create=True):
+        """shape: 최대 프레임 shape (이보다 작은 프레임도 저장 가능), slots: 슬롯 수"""
+        self.shape = tuple(shape)
+        self.slots = slots
+        self.capacity = int(np.prod(self.shape))
+        self.slot_size = -(-(_SLOT.size + self.capacity) // _ALIGN) * _ALIGN
+        size = _CONTROL.size + slots * self.slot_size
+
+        self.owner = create
+        self.shm = shared_memory.SharedMemory(name=name, create=create, size=size if create else 0)
+        self._buf = self.shm.buf
+        if create:
+            _CONTROL.pack_into(self._buf, 0, -1, 0)
+            for index in range(slots):
+                _SLOT.pack_into(self._buf, self._slot_offset(index), WRITING, 0.0, 0, 0, 0)
+        self._next_seq = self.latest_seq() + 1
+
+    @classmethod
+    def attach(cls, name, shape=(480, 640, 3), slots=8):
+        """다른 프로세스가 만든 링에 연결"""
+        return cls(shape, slots, name=name, create=False)
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def _slot_offset(self, index):
+        return _CONTROL.size + index * self.slot_size
+
+    def _view(self, index, shape):
+        return np.ndarray(shape, dtype=np.uint8, buffer=self._buf,
+                          offset=self._slot_offset(index) + _SLOT.size)
+
+    # 쓰기 쪽
+    def acquire(self, shape=None):
+        """다음 슬롯을 쓰기용으로 잡음 → (seq, 슬롯 뷰) - 뷰에 직접 쓴 뒤 commit()"""
+        shape = self.shape if shape is None else tuple(shape)
+        if int(np.prod(shape)) > self.capacity:
+            raise ValueError(f"프레임이 슬롯보다 큽니다: {shape} > {self.shape}")
+        seq = self._next_seq
+        index = seq % self.slots
+        _SLOT.pack_into(self._buf, self._slot_offset(index), WRITING, 0.0, *self._shape3(shape))
+        return seq, self._view(index, shape)
+
+    def commit(self, seq, timestamp, shape=None):
+        """acquire()한 슬롯 쓰기 완료 → 읽기 쪽에 공개"""
+        shape = self.shape if shape is None else tuple(shape)
+        _SLOT.pack_into(self._buf, self._slot_offset(seq % self.slots), seq, timestamp, *self._shape3(shape))
+        _CONTROL.pack_into(self._buf, 0, seq, self.closed)
+        self._next_seq = seq + 1
+        return seq
+
+    def write(self, frame, timestamp=None):
+        """프레임을 다음 슬롯에 복사하고 공개 → seq"""
+        seq, slot = self.acquire(frame.shape)
+        np.copyto(slot, frame.reshape(slot.shape))
+        return self.commit(seq, time.perf_counter() if timestamp is None else timestamp, frame.shape)
+
+    def close_stream(self):
+        """더 이상 프레임이 없음을 읽기 쪽에 알림"""
+        _CONTROL.pack_into(self._buf, 0, self.latest_seq(), 1)
+
+    @staticmethod
+    def _shape3(shape):
+        return (shape + (1, 1))[:3]
+
+    # 읽기 쪽
+    def latest_seq(self):
+        return _CONTROL.unpack_from(self._buf, 0)[0]
+
+    @property
+    def closed(self):
+        return bool(_CONTROL.unpack_from(self._buf, 0)[1])
+
+    def slot_seq(self, index):
+        return _SLOT.unpack_from(self._buf, self._slot_offset(index))[0]
+
+    def get(self, seq):
+        """seq 프레임 참조 (이미 덮어써졌거나 쓰는 중이면 None)"""
+        if seq < 0:
+            return None
+        index = seq % self.slots
+        slot_seq, timestamp, height, width, channels = _SLOT.unpack_from(self._buf, self._slot_offset(index))
+        if slot_seq != seq:
+            return None
+        shape = (height, width, channels) if channels > 1 else (height, width)
+        return FrameRef(seq, timestamp, self._view(index, shape), self)
+
+    def latest(self):
+        return self.get(self.latest_seq())
+
+    def wait_next(self, after_seq, timeout=None, poll=0.001):
+        """after_seq보다 새로운 최신 프레임을 기다림 (타임아웃 또는 스트림 종료 시 None)"""
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        while True:
+            seq = self.latest_seq()
+            if seq > after_seq:
+                ref = self.get(seq)
+                if ref is not None:
+                    return ref
+            elif self.closed:
+                return None
+            if deadline is not None and time.perf_counter() >= deadline:
+                return None
+            time.sleep(poll)
+
+    def close(self):
+        """공유 메모리 연결 해제 (만든 쪽이면 삭제까지) - 이 링의 뷰를 더 이상 쓰지 않을 때 호출"""
+        self._buf = None
+        try:
+            self.shm.close()
+        except BufferError:
+            print("⚠️ 공유 메모리 뷰가 아직 사용 중이라 연결을 바로 해제하지 못했습니다.")
+        if self.owner:
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
+
+
+def capture_process(source, ring_name, shape, slots, stop_event, flip=True):
+    """캡처 프로세스: 카메라 프레임을 공유 메모리 링에 씀 (프레임 피클링 없음)"""
+    import cv2
+    cv2.setNumThreads(1)
+
+    ring = SharedFrameRing.attach(ring_name, shape, slots)
+    cap = cv2.VideoCapture(source)
+    cap.set(cv2.CAP_PROP_FRAME_WIDTH, shape[1])
+    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, shape[0])
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+    frame = slot = None
+    try:
+        while not stop_event.is_set() and cap.isOpened():
+            ret, frame = cap.read(frame)
+            if not ret:
+                break
+            if frame.shape != ring.shape:
+                print(f"⚠️ 카메라 해상도가 공유 메모리 슬롯과 다릅니다: {frame.shape} != {ring.shape}")
+                break
+            seq, slot = ring.acquire()
+            if flip:
+                cv2.flip(frame, 1, dst=slot)  # 좌우 반전을 슬롯에 바로 씀
+            else:
+                np.copyto(slot, frame)
+            ring.commit(seq, time.perf_counter())
+    finally:
+        cap.release()
+        ring.close_stream()
+        frame = slot = None  # 공유 버퍼 뷰를 놓아야 연결을 해제할 수 있음
+        ring.close()
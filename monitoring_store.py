@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+노인 활동 모니터링 - SQLite 이벤트/활동 집계 저장소
+- 낙상/건강 알림 이벤트, 분 단위 활동 집계, 일 단위 활동 집계를 로컬 SQLite 파일 하나에 저장 (WAL 모드)
+- 거주자 / 카메라 / 시각 인덱스 → 기간 조회가 디렉터리 검색 없이 인덱스 범위 조회로 끝남
+- 프레임 루프와 알림 수신자는 메모리 목록에 붙이기만 하고, 백그라운드 스레드가 flush_interval초마다
+  모아서 씀 (이벤트와 분 집계는 트랜잭션을 나눠 집계 쪽 오류가 낙상 이벤트 기록을 막지 않음)
+- NaN/무한대 값은 0으로 바꿔서 넘기고, 그래도 기록할 수 없는 행은 버림 (같은 묶음을 끝없이 재시도하지 않음)
+- 분 버킷을 쓸 때 같은 트랜잭션에서 일 버킷에도 합쳐 두므로 (upsert), 주간 리포트는 거주자당 7행만 읽음
+
+테이블:
+    events          (ts, camera, resident, type, severity, message, details JSON)
+    activity_minutes(resident, camera, minute, 움직임/비활성/활동 상태별 시간) - 기본 키 (resident, camera, minute)
+    activity_days   (resident, camera, day, 같은 열) - 기본 키 (resident, camera, day)
+
+사용 예:
+    store = MonitoringStore('monitoring_data/monitoring.db').start()
+    store.add_event(alert, resident='101호')
+    store.close()
+    week = MonitoringQueries('monitoring_data/monitoring.db').resident_summaries(start, end)
+"""
+
+import json
+import math
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+
+from monitoring_rollups import ACTIVITY_CLASSES
+
+# ACTIVITY_CLASSES 순서대로의 활동 상태별 시간(초) 열
+ACTIVITY_COLUMNS = ('rest_sec', 'quiet_sec', 'moderate_sec', 'active_sec', 'unknown_sec', 'absent_sec')
+assert len(ACTIVITY_COLUMNS) == len(ACTIVITY_CLASSES)
+
+_BUCKET_COLUMNS = ('frames', 'movement_count', 'movement_sum', 'movement_max',
+                   'inactive_sec', 'max_inactive') + ACTIVITY_COLUMNS
+_MAX_COLUMNS = ('movement_max', 'max_inactive')
+
+
+def _bucket_table(name, key):
+    columns = ',\n    '.join(f"{column} {'INTEGER' if column in ('frames', 'movement_count') else 'REAL'} NOT NULL DEFAULT 0"
+                             for column in _BUCKET_COLUMNS)
+    return f"""
+CREATE TABLE IF NOT EXISTS {name} (
+    resident TEXT NOT NULL,
+    camera TEXT NOT NULL,
+    {key} REAL NOT NULL,
+    {columns},
+    PRIMARY KEY (resident, camera, {key})
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_{name}_camera ON {name}(camera, {key});
+CREATE INDEX IF NOT EXISTS idx_{name}_time ON {name}({key});
+"""
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    camera TEXT NOT NULL,
+    resident TEXT NOT NULL,
+    type TEXT NOT NULL,
+    severity TEXT,
+    message TEXT,
+    details TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_events_resident ON events(resident, ts);
+CREATE INDEX IF NOT EXISTS idx_events_camera ON events(camera, ts);
+CREATE INDEX IF NOT EXISTS idx_events_time ON events(ts);
+""" + _bucket_table('activity_minutes', 'minute') + _bucket_table('activity_days', 'day')
+
+
+def _upsert(table, key):
+    """같은 (거주자, 카메라, 시각) 버킷이 있으면 합침 (합계는 더하고 최댓값은 MAX)"""
+    columns = ('resident', 'camera', key) + _BUCKET_COLUMNS
+    updates = ', '.join(f"{c} = MAX({c}, excluded.{c})" if c in _MAX_COLUMNS else f"{c} = {c} + excluded.{c}"
+                        for c in _BUCKET_COLUMNS)
+    return (f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))}) "
+            f"ON CONFLICT(resident, camera, {key}) DO UPDATE SET {updates}")
+
+
+_INSERT_EVENT = "INSERT INTO events (ts, camera, resident, type, severity, message, details) VALUES (?, ?, ?, ?, ?, ?, ?)"
+_UPSERT_MINUTE = _upsert('activity_minutes', 'minute')
+_UPSERT_DAY = _upsert('activity_days', 'day')
+
+
+def _finite(value):
+    """NaN/무한대 → 0.0 (sqlite3는 NaN을 NULL로 바인딩해서 NOT NULL 제약에 걸림)"""
+    value = float(value)
+    return value if math.isfinite(value) else 0.0
+
+
+def day_start(timestamp):
+    """시각이 속한 날의 로컬 자정 (epoch 초)"""
+    return datetime.fromtimestamp(timestamp).replace(hour=0, minute=0, second=0, microsecond=0).timestamp()
+
+
+def open_database(path, readonly=False):
+    """SQLite 연결 (WAL 모드 - 기록 중에도 다른 프로세스가 조회 가능)"""
+    if readonly:
+        connection = sqlite3.connect(f"file:{Path(path)}?mode=ro", uri=True)
+    else:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(str(path), timeout=30.0)  # 여러 카메라 프로세스가 같은 파일에 기록
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")  # WAL에서는 전원 차단 시 마지막 트랜잭션만 잃을 수 있음
+        connection.executescript(SCHEMA)
+    connection.row_factory = sqlite3.Row
+    return connection
+
+
+class MonitoringStore:
+    """이벤트/활동 집계를 모아서 백그라운드로 기록하는 SQLite 저장소"""
+
+    def __init__(self, path, flush_interval=5.0):
+        self.path = Path(path)
+        self.flush_interval = flush_interval
+
+        self._events = []
+        self._minutes = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._connection = None
+
+        # 통계
+        self.events_written = 0
+        self.minutes_written = 0
+        self.transactions = 0
+        self.rows_dropped = 0
+
+    def start(self):
+        open_database(self.path).close()  # 스키마만 만들고, 기록용 연결은 기록 스레드에서 엶
+        self._thread = threading.Thread(target=self._run, name='monitoring-store', daemon=True)
+        self._thread.start()
+        return self
+
+    def add_event(self, alert, resident):
+        """알림 dict 기록 예약 (알림 수신자로 등록해서 사용)"""
+        details = {key: value for key, value in alert.items()
+                   if key not in ('type', 'severity', 'message', 'timestamp', 'camera_id')}
+        row = (alert['timestamp'], str(alert.get('camera_id')), resident, alert['type'],
+               alert.get('severity'), alert.get('message'), json.dumps(details, ensure_ascii=False, default=str))
+        with self._lock:
+            self._events.append(row)
+
+    def add_minute(self, camera_id, resident, bucket):
+        """완료된 분 버킷(RollupBucket) 기록 예약 (ActivityRollup.minute_listeners로 등록해서 사용)"""
+        values = (int(bucket.frames), int(bucket.movement_count),
+                  *(_finite(value) for value in (bucket.movement_sum, bucket.movement_max, bucket.inactive_sec,
+                                                 bucket.max_inactive, *bucket.activity_sec)))
+        with self._lock:
+            self._minutes.append((resident, str(camera_id), bucket.start, values))
+
+    def _run(self):
+        self._connection = open_database(self.path)
+        try:
+            while not self._stop.wait(self.flush_interval):
+                self._flush()
+            self._flush()
+        finally:
+            self._connection.close()
+
+    def _flush(self):
+        """쌓인 이벤트/분 버킷 기록 - 기록 스레드에서만 호출
+
+        이벤트와 분 버킷(일 버킷 합산 포함)은 각각 한 트랜잭션으로 씀
+        → 집계 행 하나가 실패해도 같은 주기의 낙상 이벤트는 기록됨
+        """
+        with self._lock:
+            events, self._events = self._events, []
+            minutes, self._minutes = self._minutes, []
+        if events:
+            self.events_written += self._write(events, self._write_events, self._events)
+        if minutes:
+            self.minutes_written += self._write(minutes, self._write_minutes, self._minutes)
+
+    def _write_events(self, rows):
+        self._connection.executemany(_INSERT_EVENT, rows)
+
+    def _write_minutes(self, rows):
+        self._connection.executemany(
+            _UPSERT_MINUTE, [(resident, camera, start, *values) for resident, camera, start, values in rows])
+        self._connection.executemany(
+            _UPSERT_DAY, [(resident, camera, day_start(start), *values) for resident, camera, start, values in rows])
+
+    def _write(self, rows, write, pending):
+        """rows를 한 트랜잭션으로 기록하고 기록한 행 수 반환
+
+        잠김/디스크 오류(OperationalError)는 pending 앞에 되돌려 다음 주기에 다시 시도하고,
+        값 때문에 실패하면 한 행씩 다시 써서 기록할 수 없는 행만 버림
+        """
+        try:
+            with self._connection:  # 한 트랜잭션 (오류 시 롤백)
+                write(rows)
+            self.transactions += 1
+            return len(rows)
+        except sqlite3.OperationalError as e:
+            print(f"저장소 기록 실패 ({self.path}): {e} - 다음 주기에 다시 시도")
+            with self._lock:
+                pending[:0] = rows
+            return 0
+        except sqlite3.Error as e:
+            print(f"저장소 기록 오류 ({self.path}): {e} - 한 행씩 다시 기록")
+
+        written = 0
+        for row in rows:
+            try:
+                with self._connection:
+                    write([row])
+                self.transactions += 1
+                written += 1
+            except sqlite3.Error as e:
+                self.rows_dropped += 1
+                print(f"⚠️ 저장소에 기록할 수 없는 행을 버립니다 ({e}): {row}")
+        return written
+
+    def summary(self):
+        return {
+            'path': str(self.path),
+            'events_written': self.events_written,
+            'minutes_written': self.minutes_written,
+            'transactions': self.transactions,
+            'rows_dropped': self.rows_dropped,
+        }
+
+    def close(self):
+        """기록 스레드를 멈추고 남은 항목을 모두 기록"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()  # 남은 항목을 다 쓸 때까지 기다림 (데이터 유실 방지)
+            self._thread = None
+
+
+class MonitoringQueries:
+    """저장소 기간 조회 (분석/리포트용, 읽기 전용 연결 - 기록 중에도 사용 가능)"""
+
+    def __init__(self, path):
+        self.connection = open_database(path, readonly=True)
+
+    def daily_activity(self, start, end, resident=None, camera=None):
+        """[start, end) 기간의 거주자·날짜별 활동 집계 → dict 목록 (activity_days 인덱스 범위 조회)"""
+        sql = "SELECT * FROM activity_days WHERE day >= ? AND day < ?"
+        params = [day_start(start), end]
+        if resident is not None:
+            sql += " AND resident = ?"
+            params.append(resident)
+        if camera is not None:
+            sql += " AND camera = ?"
+            params.append(str(camera))
+        return [dict(row) for row in self.connection.execute(sql + " ORDER BY resident, day", params)]
+
+    def minute_activity(self, start, end, resident):
+        """거주자 한 명의 분 단위 활동 집계"""
+        rows = self.connection.execute(
+            "SELECT * FROM activity_minutes WHERE resident = ? AND minute >= ? AND minute < ? ORDER BY minute",
+            (resident, start, end))
+        return [dict(row) for row in rows]
+
+    def events(self, start, end, resident=None, camera=None, types=None):
+        """[start, end) 기간의 이벤트 → dict 목록 (details는 JSON 해석)"""
+        sql = "SELECT ts, camera, resident, type, severity, message, details FROM events WHERE ts >= ? AND ts < ?"
+        params = [start, end]
+        if resident is not None:
+            sql += " AND resident = ?"
+            params.append(resident)
+        if camera is not None:
+            sql += " AND camera = ?"
+            params.append(str(camera))
+        if types:
+            sql += f" AND type IN ({', '.join('?' * len(types))})"
+            params.extend(types)
+        results = []
+        for row in self.connection.execute(sql + " ORDER BY ts", params):
+            event = dict(row)
+            event['details'] = json.loads(event['details']) if event['details'] else {}
+            results.append(event)
+        return results
+
+    def resident_summaries(self, start, end):
+        """[start, end) 기간의 거주자별 요약 (활동 합계 + 이벤트 수) - 일 버킷과 이벤트 인덱스만 사용"""
+        activity_sums = ', '.join(f"SUM({column}) AS {column}" for column in ACTIVITY_COLUMNS)
+        rows = self.connection.execute(f"""
+            SELECT resident, COUNT(DISTINCT day) AS days, SUM(frames) AS frames,
+                   SUM(movement_count) AS movement_count, SUM(movement_sum) AS movement_sum,
+                   MAX(movement_max) AS movement_max, SUM(inactive_sec) AS inactive_sec,
+                   MAX(max_inactive) AS max_inactive, {activity_sums}
+            FROM activity_days WHERE day >= ? AND day < ? GROUP BY resident""", (day_start(start), end))
+        summaries = {row['resident']: dict(row) for row in rows}
+        for summary in summaries.values():
+            summary['falls'] = 0
+            summary['alerts'] = 0
+        for row in self.connection.execute(
+                "SELECT resident, SUM(type = 'FALL') AS falls, COUNT(*) AS alerts FROM events "
+                "WHERE ts >= ? AND ts < ? GROUP BY resident", (start, end)):
+            summary = summaries.setdefault(row['resident'], {'resident': row['resident']})
+            summary['falls'] = row['falls']
+            summary['alerts'] = row['alerts']
+        return summaries
+
+    def close(self):
+        self.connection.close()
+
+
+def prune_database(path, minutes_before, events_before=None):
+    """보관 기간이 지난 분 단위 집계/이벤트 삭제 (일 단위 집계는 유지) → (삭제한 분 행 수, 이벤트 수)"""
+    connection = open_database(path)
+    try:
+        with connection:
+            minutes = connection.execute("DELETE FROM activity_minutes WHERE minute < ?", (minutes_before,)).rowcount
+            events = 0
+            if events_before is not None:
+                events = connection.execute("DELETE FROM events WHERE ts < ?", (events_before,)).rowcount
+    finally:
+        connection.close()
+    return minutes, events
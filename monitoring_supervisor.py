@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+노인 활동 모니터링 - 다중 카메라 슈퍼바이저
+- 카메라(방)마다 별도 프로세스와 별도 MediaPipe Pose 인스턴스 사용 (GIL 경쟁 없음)
+- 워커 프로세스를 CPU 코어에 고정
+- 모든 워커의 알림/리포트/통계를 부모 프로세스 하나로 수집
+"""
+
+import os
+import time
+import queue
+import multiprocessing as mp_proc
+
+# 워커 → 부모 이벤트 종류
+EVENT_ALERT = 'alert'
+EVENT_REPORT = 'report'
+EVENT_STATS = 'stats'
+EVENT_EXIT = 'exit'
+
+STATS_INTERVAL = 5.0     # 통계 전송 주기(초)
+REPORT_INTERVAL = 60.0   # 리포트 전송 주기(초)
+
+
+def parse_source(source):
+    """'0' 같은 숫자 문자열은 카메라 인덱스로, 나머지는 파일/URL 경로로 해석"""
+    if isinstance(source, str) and source.isdigit():
+        return int(source)
+    return source
+
+
+def available_cores():
+    """현재 프로세스가 사용할 수 있는 CPU 코어 목록"""
+    if hasattr(os, 'sched_getaffinity'):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def pin_to_core(core):
+    """현재 프로세스를 지정한 코어에 고정 (지원하지 않는 OS에서는 무시)"""
+    if core is None or not hasattr(os, 'sched_setaffinity'):
+        return False
+    try:
+        os.sched_setaffinity(0, {core})
+        return True
+    except OSError as e:
+        print(f"코어 고정 실패 (core {core}): {e}")
+        return False
+
+
+def camera_worker(camera_id, source, event_queue, stop_event, core=None):
+    """카메라 하나를 담당하는 워커 프로세스 본체"""
+    pinned = pin_to_core(core)
+
+    # 프로세스 하나가 코어 하나를 쓰도록 내부 스레드 수 제한
+    import cv2
+    cv2.setNumThreads(1)
+    from elderly_monitoring_system import ElderlyMonitoringSystem
+
+    system = ElderlyMonitoringSystem(camera_id=camera_id, headless=True)
+    system.alert_listeners.append(
+        lambda alert: event_queue.put((EVENT_ALERT, camera_id, alert))
+    )
+
+    frames = 0
+    window_frames = 0
+    window_start = time.time()
+    window_cpu = time.process_time()
+    last_report = time.time()
+    cap = None
+
+    try:
+        with system.create_pose() as pose:
+            system.warm_up(pose)  # 워치독 재시작 직후 첫 프레임부터 정상 속도로 감지
+            cap = system.open_camera(parse_source(source))
+
+            if not cap.isOpened():
+                event_queue.put((EVENT_EXIT, camera_id, {'reason': f'카메라를 열 수 없습니다: {source}'}))
+                return
+
+            while not stop_event.is_set() and cap.isOpened():
+                ret, frame = cap.read()
+                if not ret:
+                    break
+
+                _, analysis = system.process_frame(pose, frame)  # 헤드리스: 화면용 좌우 반전 생략
+                system.publish_live_view(frame, analysis)
+                frames += 1
+                window_frames += 1
+
+                now = time.time()
+                if now - window_start >= STATS_INTERVAL:
+                    cpu_now = time.process_time()
+                    elapsed = now - window_start
+                    event_queue.put((EVENT_STATS, camera_id, {
+                        'fps': window_frames / elapsed,
+                        'cpu_percent': 100.0 * (cpu_now - window_cpu) / elapsed,
+                        'frames': frames,
+                        'skip_ratio': system.inference_skip_ratio,
+                        'core': core if pinned else None,
+                        'pid': os.getpid(),
+                        'first_frame_ms': system.startup['first_frame_ms'],
+                    }))
+                    window_start, window_cpu, window_frames = now, cpu_now, 0
+
+                if now - last_report >= REPORT_INTERVAL:
+                    event_queue.put((EVENT_REPORT, camera_id, system.generate_daily_report()))
+                    last_report = now
+    finally:
+        try:
+            if cap is not None:
+                cap.release()
+            # 알림 발송 대기분, 세션 로그, 사고 영상, 실시간 보기, 저장소까지 정리하고 세션 저장
+            system.finish_session()
+            event_queue.put((EVENT_REPORT, camera_id, system.generate_daily_report()))
+        finally:
+            event_queue.put((EVENT_EXIT, camera_id, {'reason': '종료', 'frames': frames}))
+
+
+class MonitoringSupervisor:
+    """여러 카메라 워커를 실행하고 이벤트를 모으는 부모 프로세스"""
+
+    def __init__(self, sources, pin_cores=True):
+        self.sources = list(sources)
+        self.pin_cores = pin_cores
+
+        # Windows/macOS와 동작을 맞추고 MediaPipe 상태가 fork로 복제되지 않도록 spawn 사용
+        self.ctx = mp_proc.get_context('spawn')
+        self.event_queue = self.ctx.Queue()
+        self.stop_event = self.ctx.Event()
+        self.workers = {}
+
+        self.stats = {}     # camera_id → 최근 통계
+        self.reports = {}   # camera_id → 최근 리포트
+        self.alerts = []    # 수집된 모든 알림
+
+    def start(self):
+        """카메라마다 워커 프로세스 시작 (코어는 라운드 로빈으로 배정)"""
+        cores = available_cores()
+        for camera_id, source in enumerate(self.sources):
+            core = cores[camera_id % len(cores)] if self.pin_cores else None
+            process = self.ctx.Process(
+                target=camera_worker,
+                args=(camera_id, source, self.event_queue, self.stop_event, core),
+                name=f'camera-{camera_id}',
+                daemon=True,
+            )
+            process.start()
+            self.workers[camera_id] = process
+            core_info = f" (core {core})" if core is not None else ""
+            print(f"🎥 카메라 {camera_id} 워커 시작: {source}{core_info}")
+
+    def handle_event(self, event):
+        """워커 이벤트 처리"""
+        kind, camera_id, payload = event
+        if kind == EVENT_ALERT:
+            self.alerts.append(payload)
+            print(f"\n🚨 [카메라 {camera_id}] {payload['message']} ({payload['severity']})")
+        elif kind == EVENT_STATS:
+            self.stats[camera_id] = payload
+        elif kind == EVENT_REPORT:
+            self.reports[camera_id] = payload
+        elif kind == EVENT_EXIT:
+            print(f"⏹️  카메라 {camera_id} 워커 종료: {payload.get('reason')}")
+
+    def print_stats(self):
+        """카메라별 FPS / CPU 사용률 출력"""
+        if not self.stats:
+            return
+        print("\n" + "="*50)
+        print(f"{'카메라':<8}{'FPS':>8}{'CPU %':>10}{'생략 %':>10}{'프레임':>10}{'코어':>8}{'시작(s)':>9}")
+        for camera_id in sorted(self.stats):
+            s = self.stats[camera_id]
+            core = s['core'] if s['core'] is not None else '-'
+            cold_start = f"{s['first_frame_ms'] / 1000:.2f}" if s.get('first_frame_ms') is not None else '-'
+            print(f"{camera_id:<8}{s['fps']:>8.1f}{s['cpu_percent']:>10.1f}{s['skip_ratio']*100:>10.1f}"
+                  f"{s['frames']:>10}{core:>8}{cold_start:>9}")
+        print("="*50)
+
+    def alive_workers(self):
+        return [p for p in self.workers.values() if p.is_alive()]
+
+    def run(self):
+        """이벤트 수집 루프 (모든 워커가 종료되거나 Ctrl+C까지)"""
+        self.start()
+        last_print = time.time()
+        try:
+            while self.alive_workers() or not self.event_queue.empty():
+                try:
+                    self.handle_event(self.event_queue.get(timeout=1.0))
+                except queue.Empty:
+                    pass
+                if time.time() - last_print >= STATS_INTERVAL:
+                    self.print_stats()
+                    last_print = time.time()
+        except KeyboardInterrupt:
+            print("\n⏹️  사용자에 의해 모니터링이 중단되었습니다.")
+        finally:
+            self.stop()
+
+    def stop(self):
+        """모든 워커 종료 후 남은 이벤트 수집"""
+        self.stop_event.set()
+        deadline = time.time() + 10.0
+        while self.alive_workers() and time.time() < deadline:
+            try:
+                self.handle_event(self.event_queue.get(timeout=0.5))
+            except queue.Empty:
+                pass
+        for process in self.workers.values():
+            if process.is_alive():
+                process.terminate()
+            process.join(timeout=1.0)
+        while True:
+            try:
+                self.handle_event(self.event_queue.get_nowait())
+            except queue.Empty:
+                break
+
+        print("\n📊 카메라별 최종 리포트:")
+        for camera_id in sorted(self.reports):
+            print(f"  [카메라 {camera_id}] {self.reports[camera_id]}")
+        print(f"🚨 수집된 알림: {len(self.alerts)}건")
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="노인 활동 모니터링 - 다중 카메라 슈퍼바이저")
+    parser.add_argument('sources', nargs='+', help='카메라 인덱스(0, 1, ...) 또는 영상 파일/스트림 URL')
+    parser.add_argument('--no-pin', action='store_true', help='워커를 CPU 코어에 고정하지 않음')
+    args = parser.parse_args()
+
+    supervisor = MonitoringSupervisor(args.sources, pin_cores=not args.no_pin)
+    supervisor.run()
+
+
+if __name__ == "__main__":
+    main()
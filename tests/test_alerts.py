@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+"""AlertDispatcher 테스트 - 로컬 SMTP 서버(테스트 안에서 띄우는 최소 구현)로 실제 발송 경로 확인"""
+
+import email
+import socketserver
+import threading
+import time
+from email.header import decode_header, make_header
+
+import pytest
+
+from monitoring_alerts import AlertDispatcher
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    """smtplib가 쓰는 명령만 처리하는 최소 SMTP 세션"""
+
+    def reply(self, line):
+        self.wfile.write(line.encode('ascii') + b'\r\n')
+
+    def handle(self):
+        server = self.server
+        with server.lock:
+            server.connections += 1
+        self.reply('220 localhost test smtp')
+        recipients = []
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode('ascii', 'replace').strip()
+            verb = command[:4].upper()
+            if verb in ('EHLO', 'HELO'):
+                self.reply('250 localhost')
+            elif verb == 'MAIL':
+                recipients = []
+                self.reply('250 OK')
+            elif verb == 'RCPT':
+                recipients.append(command.split(':', 1)[1].strip(' <>'))
+                self.reply('250 OK')
+            elif verb == 'DATA':
+                self.reply('354 End data with <CR><LF>.<CR><LF>')
+                lines = []
+                while True:
+                    data = self.rfile.readline()
+                    if data in (b'.\r\n', b''):
+                        break
+                    lines.append(data[1:] if data.startswith(b'..') else data)
+                with server.lock:
+                    if server.fail_next > 0:
+                        server.fail_next -= 1
+                        self.reply('451 Temporary failure')
+                        continue
+                    server.messages.append((recipients, email.message_from_bytes(b''.join(lines))))
+                self.reply('250 Queued')
+            elif verb in ('NOOP', 'RSET'):
+                self.reply('250 OK')
+            elif verb == 'QUIT':
+                self.reply('221 Bye')
+                return
+            else:
+                self.reply('502 Not implemented')
+
+
+class _SMTPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), _SMTPHandler)
+        self.lock = threading.Lock()
+        self.messages = []
+        self.connections = 0
+        self.fail_next = 0
+
+
+@pytest.fixture
+def smtp_server():
+    server = _SMTPServer()
+    thread = threading.Thread(target=server.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+CONTACTS = {
+    'family': {'name': '가족', 'email': 'family@example.com'},
+    'caregiver': {'name': '요양보호사', 'email': 'care@example.com'},
+    'doctor': {'name': '주치의', 'phone': '010-0000-0000'},  # 이메일 없음 → 제외
+}
+
+
+def dispatcher_for(server, **kwargs):
+    config = {'SMTP_SERVER': '127.0.0.1', 'SMTP_PORT': server.server_address[1], 'USE_TLS': False,
+              'EMAIL_ADDRESS': 'monitor@example.com', 'EMAIL_PASSWORD': ''}
+    return AlertDispatcher(config, CONTACTS, enable_email=True, enable_audio=False, backoff=0.01, **kwargs)
+
+
+def fall_alert(**extra):
+    return {'type': 'FALL', 'severity': 'CRITICAL', 'message': '낙상이 감지되었습니다!',
+            'timestamp': 1767600000.0, 'camera_id': 1, 'conditions': ['몸이 많이 기울어짐'], **extra}
+
+
+def test_sends_to_every_contact_with_email(smtp_server):
+    dispatcher = dispatcher_for(smtp_server)
+    dispatcher.handle(fall_alert(clip='clips/fall.mp4'))
+    dispatcher.stop()
+
+    assert dispatcher.sent == 2 and dispatcher.failed == 0
+    assert sorted(r for recipients, _ in smtp_server.messages for r in recipients) == \
+        ['care@example.com', 'family@example.com']
+    message = smtp_server.messages[0][1]
+    assert str(make_header(decode_header(message['Subject']))) == '[노인 모니터링] [카메라 1] 낙상이 감지되었습니다!'
+    body = message.get_payload(decode=True).decode('utf-8')
+    assert '몸이 많이 기울어짐' in body and 'clips/fall.mp4' in body
+
+
+def test_connections_are_pooled_across_alerts(smtp_server):
+    dispatcher = dispatcher_for(smtp_server)
+    for _ in range(3):
+        dispatcher.handle(fall_alert())
+    dispatcher.stop()
+    assert dispatcher.sent == 6
+    assert smtp_server.connections <= len(dispatcher.recipients)
+
+
+def test_retries_after_temporary_failure(smtp_server):
+    smtp_server.fail_next = 1
+    dispatcher = dispatcher_for(smtp_server)
+    dispatcher.recipients = ['family@example.com']
+    dispatcher.handle(fall_alert())
+    dispatcher.stop()
+    assert dispatcher.sent == 1 and dispatcher.failed == 0
+    assert len(smtp_server.messages) == 1
+
+
+def test_gives_up_after_max_retries(smtp_server):
+    smtp_server.fail_next = 10
+    dispatcher = dispatcher_for(smtp_server, max_retries=2)
+    dispatcher.recipients = ['family@example.com']
+    dispatcher.handle(fall_alert())
+    dispatcher.stop()
+    assert dispatcher.sent == 0 and dispatcher.failed == 1
+    assert smtp_server.fail_next == 7  # 최초 1회 + 재시도 2회
+
+
+def test_low_severity_alert_sends_no_email(smtp_server):
+    dispatcher = dispatcher_for(smtp_server)
+    dispatcher.handle({'type': 'INACTIVITY', 'severity': 'MEDIUM', 'message': '장시간 비활성', 'timestamp': 0.0})
+    dispatcher.stop()
+    assert smtp_server.messages == [] and smtp_server.connections == 0
+
+
+def test_submit_never_blocks_and_stop_drains_queue(smtp_server):
+    dispatcher = dispatcher_for(smtp_server, queue_size=1)
+    assert dispatcher.submit(fall_alert())
+    assert not dispatcher.submit(fall_alert())  # 스레드 시작 전이라 큐가 가득 참 → 버림
+    assert dispatcher.dropped == 1
+    dispatcher.start()
+    dispatcher.stop()
+    assert dispatcher.sent == 2
+
+
+def test_retrying_send_does_not_block_next_alert(smtp_server):
+    """재시도/백오프 중인 발송이 있어도 디스패처 스레드는 다음 알림을 바로 처리"""
+    smtp_server.fail_next = 2
+    dispatcher = dispatcher_for(smtp_server)
+    dispatcher.backoff = 0.3  # 재시도 대기 0.3초 + 0.6초
+    dispatcher.recipients = ['family@example.com']
+    start = time.perf_counter()
+    dispatcher.handle(fall_alert())
+    dispatcher.handle(fall_alert(message='두 번째 낙상'))
+    assert time.perf_counter() - start < 0.2
+    dispatcher.stop()  # 진행 중인 발송이 끝날 때까지 기다림
+    assert dispatcher.sent == 2 and dispatcher.failed == 0
+
+
+def test_counters_are_consistent_under_parallel_sends(smtp_server):
+    dispatcher = dispatcher_for(smtp_server)
+    dispatcher.recipients = [f'user{i}@example.com' for i in range(8)]
+    for _ in range(10):
+        dispatcher.handle(fall_alert())
+    dispatcher.stop()
+    assert dispatcher.sent == 80 and dispatcher.failed == 0
+    assert len(smtp_server.messages) == 80
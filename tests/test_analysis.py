@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""MonitoringDataAnalyzer 일별 패턴 테스트 (저장소 + 세션 JSON 병합)"""
+
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from monitoring_analysis import HAS_PANDAS, MonitoringDataAnalyzer
+from monitoring_rollups import ACTIVITY_CLASSES, RollupBucket
+from monitoring_store import MonitoringStore
+
+TODAY = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+YESTERDAY = TODAY - timedelta(days=1)
+
+
+def bucket(start, movement_sum=1.0, frames=100):
+    b = RollupBucket(start)
+    b.frames = b.movement_count = frames
+    b.movement_sum = movement_sum
+    b.movement_max = 0.05
+    b.activity_sec[ACTIVITY_CLASSES.index('보통 활동')] = 60.0
+    return b
+
+
+def write_session(directory, when, camera_id=None, total=2.0, falls=0):
+    data = {
+        'session_info': {'camera_id': camera_id},
+        'daily_report': {
+            'date': when.strftime('%Y-%m-%d'),
+            'monitoring_duration': '0:30:00',
+            'total_movement_score': total,
+            'average_movement': total / 400,
+            'max_movement': 0.1,
+            'current_activity': '휴식 중',
+            'fall_incidents': falls,
+        },
+        'activity_summary': {'total_frames': 400, 'pose_frames': 400},
+    }
+    path = directory / f"elderly_monitoring_{when.strftime('%Y%m%d_%H%M%S')}.json"
+    path.write_text(json.dumps(data, ensure_ascii=False), encoding='utf-8')
+
+
+def rows(data):
+    return data.to_dict('records') if HAS_PANDAS else data
+
+
+@pytest.fixture
+def analyzer(tmp_path):
+    return MonitoringDataAnalyzer(tmp_path)
+
+
+def test_residents_are_merged_per_date(analyzer):
+    """resident 없이 조회하면 거주자별 행이 아니라 날짜별 한 행"""
+    store = MonitoringStore(analyzer.db_path, flush_interval=60).start()
+    store.add_minute(0, '101호', bucket(TODAY.timestamp() + 60, movement_sum=1.0))
+    store.add_minute(1, '102호', bucket(TODAY.timestamp() + 120, movement_sum=3.0))
+    store.add_event({'type': 'FALL', 'severity': 'HIGH', 'message': '낙상', 'camera_id': 1,
+                     'timestamp': TODAY.timestamp() + 130}, resident='102호')
+    store.close()
+
+    [day] = rows(analyzer.analyze_daily_patterns(7))
+    assert day['date'] == TODAY.strftime('%Y-%m-%d')
+    assert day['resident'] == '101호, 102호'
+    assert day['total_movement'] == pytest.approx(4.0)
+    assert day['avg_movement'] == pytest.approx(0.02)
+    assert day['duration'] == pytest.approx(2.0)
+    assert day['activity'] == '보통 활동'
+    assert day['fall_incidents'] == 1
+
+    [day] = rows(analyzer.analyze_daily_patterns(7, resident='102호'))
+    assert day['resident'] == '102호' and day['total_movement'] == pytest.approx(3.0)
+
+
+def test_sessions_fill_dates_missing_from_store(analyzer, tmp_path):
+    """저장소를 켜기 전 날짜는 세션 JSON에서, 저장소에 있는 날짜는 저장소에서"""
+    write_session(tmp_path, YESTERDAY + timedelta(hours=9), falls=1)
+    write_session(tmp_path, TODAY + timedelta(minutes=5), total=99.0)  # 저장소에 이미 있는 날짜 → 무시
+    store = MonitoringStore(analyzer.db_path, flush_interval=60).start()
+    store.add_minute(0, 'cam0', bucket(TODAY.timestamp() + 60))
+    store.close()
+
+    yesterday, today = rows(analyzer.analyze_daily_patterns(7))
+    assert yesterday['date'] == YESTERDAY.strftime('%Y-%m-%d')
+    assert yesterday['resident'] == 'cam0'
+    assert yesterday['duration'] == pytest.approx(30.0)
+    assert yesterday['avg_movement'] == pytest.approx(0.005)
+    assert yesterday['activity'] == '휴식 중'
+    assert yesterday['fall_incidents'] == 1
+    assert today['total_movement'] == pytest.approx(1.0)
+
+    assert rows(analyzer.analyze_daily_patterns(7, resident='101호')) == []
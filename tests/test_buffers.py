@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+"""RingBuffer / RollingExtrema / RollingStats 테스트 (순환, 빈 상태, NaN)"""
+
+import math
+
+import numpy as np
+import pytest
+
+from monitoring_buffers import ACTIVITY_DTYPE, RingBuffer, RollingExtrema, RollingStats
+
+
+def filled(capacity, count):
+    buffer = RingBuffer(capacity, ACTIVITY_DTYPE)
+    for i in range(count):
+        buffer.append(float(i), 0.0, float(i), 0.0)
+    return buffer
+
+
+def test_ring_buffer_empty():
+    buffer = RingBuffer(4, ACTIVITY_DTYPE)
+    assert len(buffer) == 0
+    assert len(buffer.latest()) == 0
+    assert len(buffer.latest(3)) == 0
+    with pytest.raises(IndexError):
+        buffer[-1]
+    with pytest.raises(IndexError):
+        buffer[0]
+
+
+def test_ring_buffer_before_wrap():
+    buffer = filled(4, 3)
+    assert len(buffer) == 3
+    assert buffer[0]['center_x'] == 0.0 and buffer[-1]['center_x'] == 2.0
+    assert list(buffer.latest()['timestamp']) == [0.0, 1.0, 2.0]
+
+
+@pytest.mark.parametrize('count', [4, 5, 7, 8, 11])
+def test_ring_buffer_wraparound_keeps_latest_in_order(count):
+    buffer = filled(4, count)
+    expected = [float(i) for i in range(count - 4, count)]
+    assert len(buffer) == 4
+    assert buffer.total == count
+    assert list(buffer.latest()['center_x']) == expected
+    assert list(buffer.latest(2)['center_x']) == expected[-2:]
+    assert list(buffer.latest(10)['center_x']) == expected
+    assert [float(buffer[i]['center_x']) for i in range(-4, 4)] == expected * 2
+    with pytest.raises(IndexError):
+        buffer[4]
+
+
+def test_ring_buffer_latest_is_a_copy_and_size_is_fixed():
+    buffer = filled(4, 6)
+    nbytes = buffer.nbytes
+    snapshot = buffer.latest()
+    buffer.append(99.0, 0.0, 99.0, 0.0)
+    assert snapshot['center_x'][-1] == 5.0
+    assert buffer.nbytes == nbytes == 4 * ACTIVITY_DTYPE.itemsize
+    buffer.clear()
+    assert len(buffer) == 0 and len(buffer.latest()) == 0
+
+
+def test_rolling_extrema_matches_brute_force():
+    rng = np.random.default_rng(1)
+    values = rng.random(200).tolist()
+    extrema = RollingExtrema(7)
+    for i, value in enumerate(values):
+        extrema.push(value)
+        window = values[max(0, i - 6):i + 1]
+        assert extrema.max == max(window)
+        assert extrema.min == min(window)
+        assert extrema.range() == pytest.approx(max(window) - min(window))
+    assert extrema.full and len(extrema) == 7
+
+
+def test_rolling_extrema_empty():
+    extrema = RollingExtrema(3)
+    assert not extrema.full and len(extrema) == 0
+    assert extrema.max == 0 and extrema.min == 0 and extrema.range() == 0
+
+
+def test_rolling_extrema_skips_nan():
+    extrema = RollingExtrema(3)
+    for value in (1.0, math.nan, 5.0):
+        extrema.push(value)
+    assert (extrema.min, extrema.max) == (1.0, 5.0)
+    extrema.push(math.nan)  # 1.0이 윈도우를 벗어남
+    assert (extrema.min, extrema.max) == (5.0, 5.0)
+    extrema.push(math.nan)
+    extrema.push(math.inf)  # 윈도우에 유한한 값이 없음
+    assert extrema.range() == 0 and len(extrema) == 3
+
+
+def test_rolling_stats_window_and_wraparound():
+    stats = RollingStats(4)
+    assert stats.mean == 0.0 and not stats.full
+    for value in range(1, 11):
+        stats.push(value)
+    assert stats.full and stats.count == 4
+    assert stats.sum == pytest.approx(7 + 8 + 9 + 10)
+    assert stats.mean == pytest.approx(8.5)
+    assert (stats.min, stats.max) == (7.0, 10.0)
+
+
+def test_rolling_stats_treats_nan_as_zero():
+    stats = RollingStats(3)
+    for value in (0.3, math.nan, math.inf, -math.inf):
+        stats.push(value)
+    assert math.isfinite(stats.sum) and stats.sum == 0.0
+    assert stats.max == 0.0
+    stats.push(0.6)
+    assert stats.mean == pytest.approx(0.2)
+
+
+def test_rolling_stats_resum_limits_drift():
+    stats = RollingStats(10)
+    for i in range(10_000):
+        stats.push(0.1 if i % 2 else 1e6)
+    assert stats.sum == pytest.approx(5 * 1e6 + 5 * 0.1, rel=0, abs=1e-6)
+    stats.clear()
+    assert stats.count == 0 and stats.sum == 0.0
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+"""ClipRecorder 테스트 - 사고 전후 클립 저장과 메모리 상한"""
+
+import numpy as np
+
+from monitoring_clips import ClipRecorder
+
+FPS = 10
+BASE = 1767600000.0
+
+
+def noise_frames(count, seed=0):
+    """JPEG로 잘 압축되지 않는 프레임 (프레임당 수십 KB)"""
+    rng = np.random.default_rng(seed)
+    return [rng.integers(0, 256, (120, 160, 3), dtype=np.uint8) for _ in range(count)]
+
+
+class MeasuredRecorder(ClipRecorder):
+    """프레임을 저장할 때마다 잡고 있는 메모리 최댓값 기록"""
+
+    peak_bytes = 0
+
+    def _store(self, timestamp, jpeg):
+        super()._store(timestamp, jpeg)
+        self.peak_bytes = max(self.peak_bytes, self._bytes)
+
+
+def record(recorder, frames, trigger_at=()):
+    for index, frame in enumerate(frames):
+        timestamp = BASE + index / FPS
+        recorder.add_frame(frame, timestamp)
+        if index in trigger_at:
+            recorder.trigger(timestamp)
+    recorder.close()
+
+
+def ring_bytes(recorder):
+    return sum(len(jpeg) for _, jpeg in recorder._frames)
+
+
+def test_clip_contains_pre_and_post_roll(tmp_path):
+    recorder = ClipRecorder(tmp_path, fps=FPS, pre_roll=1.0, post_roll=1.0, queue_size=1000)
+    record(recorder, noise_frames(40), trigger_at=(20,))
+    assert recorder.clips_written == 1 and recorder.clips_truncated == 0
+    assert len(list(tmp_path.glob('*.mp4'))) == 1
+    assert recorder._bytes == ring_bytes(recorder)  # 클립을 저장하고 나면 링 버퍼만 남음
+
+
+def test_long_post_roll_and_back_to_back_triggers_stay_within_max_bytes(tmp_path):
+    frames = noise_frames(120)
+    recorder = MeasuredRecorder(tmp_path, fps=FPS, pre_roll=2.0, post_roll=30.0,
+                                max_bytes=400 * 1024, queue_size=1000)
+    frame_bytes = 80 * 1024  # 잡음 프레임 JPEG 한 장 크기보다 큼
+    record(recorder, frames, trigger_at=(25, 35, 45))
+    assert recorder.peak_bytes <= recorder.max_bytes + frame_bytes
+    assert recorder.clips_truncated >= 1
+    assert recorder.clips_written >= 1
+    assert recorder._bytes == ring_bytes(recorder)
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""모듈 간 정합성 테스트 - 설정 키 누락(KeyError)과 없는 모듈/이름 import(ModuleNotFoundError) 회귀 방지
+
+커밋 하나만 꺼내도 실행되도록, 코드가 읽는 설정 키와 monitoring_* import가 모두 같은 트리에 있어야 함
+"""
+
+import ast
+import importlib
+from pathlib import Path
+
+import pytest
+
+import monitoring_config
+
+ROOT = Path(__file__).resolve().parent.parent
+SOURCES = sorted(ROOT.glob('*.py'))
+CONFIG_DICTS = {name for name, value in vars(monitoring_config).items() if name.isupper() and isinstance(value, dict)}
+
+
+def _tree(path):
+    return ast.parse(path.read_text(encoding='utf-8'), filename=str(path))
+
+
+def _config_keys(tree):
+    """SYSTEM_CONFIG['KEY'] 같은 문자열 상수 키 접근 → (딕셔너리 이름, 키, 줄 번호)"""
+    for node in ast.walk(tree):
+        if (isinstance(node, ast.Subscript) and isinstance(node.value, ast.Name)
+                and node.value.id in CONFIG_DICTS
+                and isinstance(node.slice, ast.Constant) and isinstance(node.slice.value, str)):
+            yield node.value.id, node.slice.value, node.lineno
+
+
+def _monitoring_imports(tree):
+    """함수 안의 지연 import까지 포함한 monitoring_* import → (모듈, 가져오는 이름 또는 None, 줄 번호)"""
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                if alias.name.startswith('monitoring_'):
+                    yield alias.name, None, node.lineno
+        elif isinstance(node, ast.ImportFrom) and node.module and node.module.startswith('monitoring_'):
+            for alias in node.names:
+                yield node.module, alias.name, node.lineno
+
+
+@pytest.mark.parametrize('path', SOURCES, ids=lambda p: p.name)
+def test_config_keys_exist(path):
+    missing = [f"{path.name}:{line} {name}['{key}']" for name, key, line in _config_keys(_tree(path))
+               if key not in getattr(monitoring_config, name)]
+    assert missing == []
+
+
+@pytest.mark.parametrize('path', SOURCES, ids=lambda p: p.name)
+def test_monitoring_imports_resolve(path):
+    missing = []
+    for module_name, name, line in _monitoring_imports(_tree(path)):
+        if not (ROOT / f'{module_name}.py').exists():
+            missing.append(f"{path.name}:{line} {module_name}")
+        elif name is not None and not hasattr(importlib.import_module(module_name), name):
+            missing.append(f"{path.name}:{line} {module_name}.{name}")
+    assert missing == []
+
+
+def test_main_module_imports_without_camera_or_mediapipe():
+    """메인 모듈은 import만으로 카메라/MediaPipe/winsound를 요구하지 않음 (헤드리스 서버, 테스트 환경)"""
+    module = importlib.import_module('elderly_monitoring_system')
+    assert hasattr(module, 'ElderlyMonitoringSystem')
+
+
+def test_optional_modules_are_not_imported_at_load():
+    """설정/실행 모드에 따라 쓰는 모듈은 메인 모듈을 불러올 때 import되지 않음 (_IMPORT_SECONDS가 항상 필요한 것만 측정)"""
+    import subprocess
+    import sys
+
+    deferred = ('mediapipe', 'monitoring_alerts', 'monitoring_session_log', 'monitoring_clips', 'monitoring_store',
+                'monitoring_residents', 'monitoring_live_view', 'monitoring_pipeline', 'monitoring_control',
+                'monitoring_shared_frames', 'smtplib', 'sqlite3')
+    code = ("import sys, elderly_monitoring_system; "
+            f"print(','.join(m for m in {deferred!r} if m in sys.modules))")
+    result = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert result.stdout.strip().splitlines()[-1:] in ([], [''])
@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+"""낙상 벤치마크 합성 장면 / 표식 자세 추정기 / 정답 맞추기 테스트"""
+
+import cv2
+import numpy as np
+
+from monitoring_fall_benchmark import (MARKERS, MarkerPoseEstimator, Scenario, build_scenarios, score,
+                                       skeleton)
+
+
+def test_marker_estimator_recovers_skeleton():
+    scenario = build_scenarios(1)[0]
+    estimator = MarkerPoseEstimator()
+    for index, (t, frame) in enumerate(scenario.frames()):
+        if index % 60:
+            continue
+        truth = skeleton(**scenario.pose_at(t))
+        landmarks = estimator.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)).pose_landmarks.landmark
+        for marker in MARKERS:
+            found = np.array([landmarks[marker].x * frame.shape[1], landmarks[marker].y * frame.shape[0]])
+            assert landmarks[marker].visibility > 0.5
+            assert np.abs(found - truth[marker]).max() < 6.0  # 프레임 폭의 1% 이내
+
+
+def test_estimator_works_on_crops_and_reports_no_person():
+    scenario = build_scenarios(1)[0]
+    _, frame = next(scenario.frames())
+    rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    estimator = MarkerPoseEstimator()
+    assert estimator.process(rgb[:, :40]).pose_landmarks is None  # 사람이 없는 영역
+    small = cv2.resize(rgb, None, fx=0.5, fy=0.5, interpolation=cv2.INTER_AREA)
+    assert estimator.process(small).pose_landmarks is not None
+    assert estimator.calls == 2
+
+
+def test_score_matches_falls_within_window():
+    scenario = Scenario('s', 10.0, None, [(2.0, 0.5), (6.0, 0.5)], seed=0)
+    hits, false_alarms = score(scenario, [1.0, 2.4, 9.6], window=3.0)
+    assert hits == [2.4, None]
+    assert false_alarms == 2
@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+"""LiveViewServer 테스트"""
+
+import socket
+import time
+import urllib.request
+
+import numpy as np
+
+from monitoring_live_view import LiveViewServer
+
+
+def test_busy_port_leaves_live_view_disabled():
+    """포트가 이미 쓰이고 있으면 예외 없이 None (두 번째 카메라 프로세스도 시작할 수 있어야 함)"""
+    with socket.socket() as busy:
+        busy.bind(('127.0.0.1', 0))
+        busy.listen()
+        port = busy.getsockname()[1]
+        assert LiveViewServer('127.0.0.1', port).start() is None
+
+
+def test_serves_report_and_encodes_published_frame():
+    server = LiveViewServer('127.0.0.1', 0, report_provider=lambda: {'ok': True}).start()
+    try:
+        with urllib.request.urlopen(f'http://127.0.0.1:{server.port}/report', timeout=5) as response:
+            assert b'"ok"' in response.read()
+        server.add_viewer()
+        server.publish(np.zeros((48, 64, 3), dtype=np.uint8))
+        deadline = time.time() + 5
+        while server.latest_jpeg is None and time.time() < deadline:
+            time.sleep(0.01)
+        server.remove_viewer()
+        assert server.latest_jpeg[:2] == b'\xff\xd8'
+    finally:
+        server.stop()
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""StageTimer / LatencyHistogram 테스트"""
+
+import threading
+
+from monitoring_metrics import LatencyHistogram, StageTimer
+
+
+def test_histogram_percentiles_in_ms():
+    histogram = LatencyHistogram(window=100)
+    for ms in range(1, 101):
+        histogram.record(ms / 1000.0)
+    summary = histogram.summary()
+    assert summary['count'] == 100
+    assert summary['max'] == 100.0
+    assert 49.0 <= summary['p50'] <= 52.0
+
+
+def test_histogram_keeps_only_recent_window():
+    histogram = LatencyHistogram(window=3)
+    for seconds in (1.0, 1.0, 1.0, 0.001, 0.001, 0.001):
+        histogram.record(seconds)
+    assert len(histogram) == 3
+    assert histogram.summary()['max'] == 1.0
+    assert histogram.summary()['count'] == 6
+
+
+def test_summary_orders_known_stages_first():
+    timer = StageTimer()
+    timer.record('custom', 0.001)
+    timer.record('pose', 0.002)
+    timer.record('capture', 0.003)
+    assert list(timer.summary())[:3] == ['capture', 'pose', 'custom']
+    assert timer.stage_summary('pose')['count'] == 1
+    assert timer.stage_summary('draw') is None
+
+
+def test_concurrent_record_and_summary():
+    """파이프라인 스레드들이 새 단계를 추가하는 동안 요약해도 예외가 나지 않아야 함"""
+    timer = StageTimer(window=10)
+    stop = threading.Event()
+    errors = []
+
+    def writer(index):
+        n = 0
+        while not stop.is_set():
+            timer.record(f'stage_{index}_{n % 200}', 0.001)
+            timer.end_frame()
+            n += 1
+
+    def reader():
+        try:
+            for _ in range(50):
+                timer.summary()
+        except Exception as e:  # dictionary changed size during iteration 등
+            errors.append(e)
+
+    writers = [threading.Thread(target=writer, args=(i,)) for i in range(3)]
+    for thread in writers:
+        thread.start()
+    reader()
+    stop.set()
+    for thread in writers:
+        thread.join()
+    assert errors == []
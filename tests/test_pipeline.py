@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""MonitoringPipeline 추론 단계 테스트 - 공유 메모리 프레임이 추론 전에 덮어써진 경우"""
+
+import numpy as np
+
+from monitoring_pipeline import FramePacket, MonitoringPipeline
+from monitoring_shared_frames import SharedFrameRing
+
+SHAPE = (4, 6, 3)
+
+
+class RecordingSystem:
+    """process_frame에 들어온 프레임만 기록하는 가짜 모니터링 시스템"""
+
+    def __init__(self):
+        self.frames = []
+
+    def process_frame(self, pose, frame):
+        self.frames.append(frame)
+        return frame, {'value': int(frame[0, 0, 0])}
+
+
+def run_inference(ring, ref):
+    system = RecordingSystem()
+    pipeline = MonitoringPipeline(system, pose=None, frame_ring=ring)
+    pipeline.frame_queue.put(FramePacket(seq=ref.seq, frame=ref.frame, capture_time=0.0, ref=ref))
+    pipeline.frame_queue.close()
+    pipeline.inference_loop()
+    return pipeline, system
+
+
+def test_valid_slot_is_copied_before_inference():
+    ring = SharedFrameRing(SHAPE, slots=2)
+    try:
+        ring.write(np.full(SHAPE, 7, np.uint8))
+        pipeline, system = run_inference(ring, ring.latest())
+        [frame] = system.frames
+        assert frame[0, 0, 0] == 7
+        assert not np.shares_memory(frame, ring._view(0, SHAPE))  # 추론은 공유 버퍼가 아닌 복사본으로
+        packet = pipeline.result_queue.get(timeout=1)
+        assert packet.ref is None and packet.analysis == {'value': 7}
+        assert pipeline.torn_frames == 0
+    finally:
+        ring.close()
+
+
+def test_overwritten_slot_is_not_analyzed():
+    """슬롯이 덮어써진 프레임은 분석 상태(낙상 판정)에 들어가지 않고 버려짐"""
+    ring = SharedFrameRing(SHAPE, slots=2)
+    try:
+        ring.write(np.full(SHAPE, 1, np.uint8))
+        stale = ring.latest()
+        ring.write(np.full(SHAPE, 2, np.uint8))
+        ring.write(np.full(SHAPE, 3, np.uint8))  # stale과 같은 슬롯을 덮어씀
+        pipeline, system = run_inference(ring, stale)
+        assert system.frames == []
+        assert pipeline.torn_frames == 1
+        assert pipeline.analyzed_frames == 0
+    finally:
+        ring.close()
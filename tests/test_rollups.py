@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+"""ActivityRollup 분/시간/일 집계 테스트 (NaN 움직임 회귀 포함)"""
+
+import json
+import math
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from monitoring_landmarks import NUM_LANDMARKS, VISIBILITY
+from monitoring_rollups import ABSENT_CLASS, ACTIVITY_CLASSES, ActivityRollup
+
+BASE = datetime(2026, 1, 5, 10, 0).timestamp()  # 로컬 시각 정각
+
+
+def feed(rollup, seconds, movement=0.02, activity='보통 활동', start=BASE, fps=10):
+    for i in range(int(seconds * fps)):
+        rollup.record(start + i / fps, movement, activity)
+
+
+def test_minute_buckets_close_on_boundary():
+    rollup = ActivityRollup()
+    feed(rollup, 150)  # 2분 30초
+    assert len(rollup.minutes) == 2
+    closed = rollup.minutes[-1]
+    assert closed['frames'] == 600
+    assert closed['movement_sum'] == pytest.approx(600 * 0.02)
+    assert closed['activity_sec'][ACTIVITY_CLASSES.index('보통 활동')] == pytest.approx(60.0, abs=0.2)
+    assert len(rollup.minutely(60)) == 3  # 진행 중인 분 포함
+
+
+def test_hour_and_day_rollup_totals_match_frames():
+    rollup = ActivityRollup()
+    feed(rollup, 2 * 3600 + 30, fps=1)
+    assert len(rollup.hours) == 2
+    today = rollup.today()
+    assert today.frames == 2 * 3600 + 30
+    assert today.movement_count == today.frames
+    assert [h['frames'] for h in rollup.hourly(24)] == [3600, 3600, 30]
+
+
+def test_day_rollover_at_midnight():
+    rollup = ActivityRollup()
+    start = datetime(2026, 1, 5, 23, 59).timestamp()
+    feed(rollup, 120, start=start, fps=1)
+    assert len(rollup.days) == 1
+    assert rollup.days[-1]['frames'] == 60
+    assert rollup.session().frames == 120
+
+
+def test_absent_frames_count_as_absent_time():
+    rollup = ActivityRollup()
+    feed(rollup, 10, movement=None)
+    today = rollup.today()
+    assert today.movement_count == 0
+    assert today.activity_sec[ABSENT_CLASS] == pytest.approx(9.9)
+
+
+def test_gap_is_capped_by_max_gap():
+    rollup = ActivityRollup(max_gap=1.0)
+    rollup.record(BASE, 0.0, '휴식 중')
+    rollup.record(BASE + 30, 0.0, '휴식 중')  # 카메라 끊김
+    assert rollup.today().inactive_sec == pytest.approx(1.0)
+
+
+def test_nan_movement_does_not_poison_report():
+    """관절이 가려져 움직임이 NaN인 프레임은 움직임 통계에서 빠지고 리포트는 JSON 표준을 지킴"""
+    rollup = ActivityRollup()
+    feed(rollup, 5, movement=0.02)
+    feed(rollup, 5, movement=math.nan, start=BASE + 5)
+    feed(rollup, 5, movement=math.inf, start=BASE + 10)
+    today = rollup.today()
+    assert today.frames == 150
+    assert today.movement_count == 50
+    assert math.isfinite(today.movement_sum) and math.isfinite(today.movement_max)
+    json.dumps({'today': today.to_dict(), 'minutes': rollup.minutely(5)}, allow_nan=False)
+
+
+def test_minute_listener_receives_closed_bucket():
+    rollup = ActivityRollup()
+    received = []
+    rollup.minute_listeners.append(received.append)
+    feed(rollup, 61)
+    rollup.flush()
+    assert [bucket.frames for bucket in received] == [600, 10]
+
+
+def _landmarks(x, visible=True):
+    arr = np.zeros((NUM_LANDMARKS, 4), dtype=np.float32)
+    arr[:, 0] = x
+    arr[:, 1] = 0.5
+    arr[:, VISIBILITY] = 1.0 if visible else 0.0
+    return arr
+
+
+def test_occluded_center_keeps_activity_history_clean():
+    """손목/발목이 모두 가려진 프레임은 활동 기록에 NaN을 남기지 않음"""
+    from elderly_monitoring_system import ElderlyMonitoringSystem
+    from monitoring_clock import SimulatedClock
+
+    system = ElderlyMonitoringSystem(headless=True, clock=SimulatedClock(start=BASE),
+                                     enable_alerts=False, enable_session_log=False, enable_clips=False,
+                                     enable_live_view=False, enable_store=False)
+    system.analyze_activity_level(_landmarks(0.40), now=BASE)
+    occluded = system.analyze_activity_level(_landmarks(0.40, visible=False), now=BASE + 0.1)
+    after = system.analyze_activity_level(_landmarks(0.45), now=BASE + 0.2)
+
+    assert occluded['movement_score'] == 0.0
+    assert len(system.activity_history) == 2
+    assert np.isfinite(system.activity_history.latest()['center_x']).all()
+    assert after['movement_score'] == pytest.approx(0.05, abs=1e-6)
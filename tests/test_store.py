@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+"""MonitoringStore 기록/업서트/조회 테스트 (NaN 버킷 회귀 포함)"""
+
+import math
+from datetime import datetime
+
+import pytest
+
+from monitoring_rollups import ACTIVITY_CLASSES, RollupBucket
+from monitoring_store import MonitoringQueries, MonitoringStore, day_start, prune_database
+
+DAY = datetime(2026, 1, 5).timestamp()
+
+
+def bucket(start, frames=600, movement_sum=1.2, movement_max=0.05, max_inactive=10.0):
+    b = RollupBucket(start)
+    b.frames = frames
+    b.movement_count = frames
+    b.movement_sum = movement_sum
+    b.movement_max = movement_max
+    b.inactive_sec = 30.0
+    b.max_inactive = max_inactive
+    b.activity_sec[ACTIVITY_CLASSES.index('휴식 중')] = 60.0
+    return b
+
+
+def fall(ts, camera_id=0):
+    return {'type': 'FALL', 'severity': 'HIGH', 'message': '낙상 감지', 'timestamp': ts,
+            'camera_id': camera_id, 'conditions': ['급격한 자세 변화']}
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return tmp_path / 'monitoring.db'
+
+
+def write(path, minutes=(), events=()):
+    store = MonitoringStore(path, flush_interval=60).start()
+    for camera, resident, b in minutes:
+        store.add_minute(camera, resident, b)
+    for alert, resident in events:
+        store.add_event(alert, resident=resident)
+    store.close()
+    return store
+
+
+def test_minutes_roll_into_one_day_row(db_path):
+    write(db_path, minutes=[(0, '101호', bucket(DAY + 60 * i, movement_max=0.01 * i)) for i in range(1, 4)])
+    queries = MonitoringQueries(db_path)
+    assert len(queries.minute_activity(DAY, DAY + 86400, '101호')) == 3
+    [day] = queries.daily_activity(DAY, DAY + 86400)
+    assert day['day'] == day_start(DAY + 60)
+    assert day['frames'] == 1800
+    assert day['movement_sum'] == pytest.approx(3.6)
+    assert day['movement_max'] == pytest.approx(0.03)
+    assert day['rest_sec'] == pytest.approx(180.0)
+    queries.close()
+
+
+def test_same_minute_upsert_sums_and_keeps_max(db_path):
+    """같은 분이 두 번 들어오면 (재시작 등) 합계는 더하고 최댓값은 큰 값 유지"""
+    write(db_path, minutes=[(0, '101호', bucket(DAY, frames=100, max_inactive=5.0))])
+    write(db_path, minutes=[(0, '101호', bucket(DAY, frames=200, max_inactive=3.0))])
+    queries = MonitoringQueries(db_path)
+    [minute] = queries.minute_activity(DAY, DAY + 60, '101호')
+    assert minute['frames'] == 300
+    assert minute['max_inactive'] == 5.0
+    [day] = queries.daily_activity(DAY, DAY + 86400)
+    assert day['frames'] == 300
+    queries.close()
+
+
+def test_nan_bucket_is_sanitized_and_fall_event_is_written(db_path):
+    """NaN 버킷 때문에 NOT NULL 오류로 같은 주기의 낙상 이벤트까지 버려지던 문제 회귀 테스트"""
+    store = write(db_path,
+                  minutes=[(0, '101호', bucket(DAY, movement_sum=math.nan, movement_max=math.inf))],
+                  events=[(fall(DAY + 30), '101호')])
+    assert store.summary()['events_written'] == 1
+    assert store.summary()['minutes_written'] == 1
+    assert store.summary()['rows_dropped'] == 0
+    queries = MonitoringQueries(db_path)
+    [minute] = queries.minute_activity(DAY, DAY + 60, '101호')
+    assert minute['movement_sum'] == 0.0 and minute['movement_max'] == 0.0
+    [event] = queries.events(DAY, DAY + 60, types=['FALL'])
+    assert event['details'] == {'conditions': ['급격한 자세 변화']}
+    queries.close()
+
+
+def test_bad_row_is_dropped_without_blocking_others(db_path):
+    """기록할 수 없는 행은 버리고 나머지 행과 이벤트는 기록 (무한 재시도 없음)"""
+    store = write(db_path,
+                  minutes=[(0, None, bucket(DAY)), (0, '101호', bucket(DAY + 60))],
+                  events=[(fall(DAY + 30), '101호')])
+    summary = store.summary()
+    assert summary['rows_dropped'] == 1
+    assert summary['minutes_written'] == 1
+    assert summary['events_written'] == 1
+    assert store._minutes == [] and store._events == []
+    queries = MonitoringQueries(db_path)
+    assert len(queries.minute_activity(DAY, DAY + 3600, '101호')) == 1
+    queries.close()
+
+
+def test_resident_summaries_and_prune(db_path):
+    write(db_path,
+          minutes=[(0, '101호', bucket(DAY)), (1, '102호', bucket(DAY + 86400))],
+          events=[(fall(DAY + 30), '101호'), ({**fall(DAY + 90), 'type': 'INACTIVITY'}, '101호')])
+    queries = MonitoringQueries(db_path)
+    summaries = queries.resident_summaries(DAY, DAY + 7 * 86400)
+    assert summaries['101호']['falls'] == 1 and summaries['101호']['alerts'] == 2
+    assert summaries['102호']['days'] == 1 and summaries['102호']['falls'] == 0
+    queries.close()
+
+    assert prune_database(db_path, minutes_before=DAY + 86400, events_before=DAY + 60) == (1, 1)
+    queries = MonitoringQueries(db_path)
+    assert len(queries.daily_activity(DAY, DAY + 7 * 86400)) == 2  # 일 집계는 유지
+    queries.close()